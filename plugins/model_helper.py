@@ -1,14 +1,40 @@
 import sys
+import time
+perf_clock = getattr(time, "perf_counter", time.time)
+_import_start = perf_clock()
+import json
+import os
+import re
+from collections import OrderedDict
+from functools import partial
 from maya import OpenMayaUI
 from PySide2 import QtCore
 from PySide2 import QtGui
 from PySide2 import QtWidgets
 from shiboken2 import getCppPointer
+from shiboken2 import isValid
 from shiboken2 import wrapInstance
 import maya.api.OpenMaya as om
 import maya.OpenMayaUI as omui
 import maya.cmds as cmds
 import maya.mel as mel
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+PLUGIN_NAME = os.path.splitext(os.path.basename(__file__))[0]
+MODULE_ALIAS = "rb_model_helper"
+LOAD_MODE_ENV_VAR = "RB_MODEL_HELPER_LOAD_MODE"
+LOAD_MODE_OPTION_VAR = "RBModelHelperLoadMode"
+LOAD_MODES = ("eager", "onDemand", "idle")
+
+# The workspace control's uiScript imports us by this fixed name, whatever name Maya loaded the plugin under.
+sys.modules[MODULE_ALIAS] = sys.modules[__name__]
 
 def maya_useNewAPI():
     """
@@ -29,13 +55,26 @@ def initializePlugin(plugin):
     vendor = "Robert Braddy"
     version = "1.0.0"
 
-    om.MFnPlugin(plugin, vendor, version)
-    
-    if not cmds.menu("RBToolsMenu", exists=True):
-        rbToolsMenu = cmds.menu("RBToolsMenu", label="RB Tools", parent="MayaWindow", tearOff=True)
+    start_time = perf_clock()
+    load_mode = get_load_mode()
+
+    with startup_profiler.phase("initializePlugin"):
+        plugin_fn = om.MFnPlugin(plugin, vendor, version)
+        plugin_fn.registerCommand(ApiEditCommand.COMMAND_NAME, ApiEditCommand.creator)
+
+        with startup_profiler.phase("menu"):
+            if not cmds.menu("RBToolsMenu", exists=True):
+                cmds.menu("RBToolsMenu", label="RB Tools", parent="MayaWindow", tearOff=True)
+
+            rbModelHelper = cmds.menuItem("RBModelHelper",label="Model Helper", parent="RBToolsMenu", command=modelHelperCallback)
 
-    rbModelHelper = cmds.menuItem("RBModelHelper",label="Model Helper", parent=rbToolsMenu, command=modelHelperCallback)
-    modelUI=modelHelperCallback()
+        if load_mode == "eager":
+            modelUI=modelHelperCallback()
+        elif load_mode == "idle":
+            cmds.evalDeferred(idleBuildCallback, lowestPriority=True)
+
+    om.MGlobal.displayInfo("Model Helper added {0:.1f} ms to Maya startup ({1} load mode)".format(
+        (perf_clock() - start_time) * 1000.0, load_mode))
     
 def uninitializePlugin(plugin):
     """
@@ -46,19 +85,12 @@ def uninitializePlugin(plugin):
 
     :param plugin: MObject used to de-register the plugin using an MFnPlugin function set
     """
-    try:
-        workspace_control_name = SampleUI.get_workspace_control_name()
+    SampleUI.delete_instance()
+    TopologyCache.shared().clear()
+    om.MFnPlugin(plugin).deregisterCommand(ApiEditCommand.COMMAND_NAME)
 
-        sample_ui.undock()
-        if cmds.window(workspace_control_name, exists=True):
-            cmds.deleteUI(workspace_control_name)  
-        try:
-            sample_ui.setParent(None)
-            sample_ui.deleteLater()
-        except:
-            pass  
-    except:
-        pass
+    if sys.modules.get(MODULE_ALIAS) is sys.modules.get(__name__):
+        del sys.modules[MODULE_ALIAS]
         
     cmds.deleteUI("RBToolsMenu|RBModelHelper", menuItem=True)
     menu_items = cmds.menu("RBToolsMenu", query=True, numberOfItems=True)
@@ -66,29 +98,151 @@ def uninitializePlugin(plugin):
         cmds.deleteUI("RBToolsMenu", menu=True)
 
 def modelHelperCallback(*args):
-    workspace_control_name = SampleUI.get_workspace_control_name()
-    win_ptr = OpenMayaUI.MQtUtil.mainWindow()
-    python_version = sys.version
-    if python_version[0]==2:
-        win = wrapInstance(long(win_ptr), QtWidgets.QMainWindow)
-    else:
-        win = wrapInstance(int(win_ptr), QtWidgets.QMainWindow)
-        
-    if cmds.window(workspace_control_name, exists=True):
-        cmds.deleteUI(workspace_control_name)  
-    try:
-        sample_ui.setParent(None)
-        sample_ui.deleteLater()
-    except:
-        pass  
-
- 
-    sample_ui = SampleUI()
-    sample_ui.set_camBasedSel()
-    filter2 = UIEventFilter()
-    win.installEventFilter(filter2)
+    with startup_profiler.phase("modelHelperCallback"):
+        sample_ui = SampleUI.display()
     return sample_ui
 
+def idleBuildCallback(*args):
+    """
+    Runs once Maya is idle after startup in the "idle" load mode. The sections
+    themselves are then built in time slices, see SampleUI.build_pending_sections.
+    """
+    if SampleUI.instance_exists():
+        return
+    with startup_profiler.phase("idleBuildCallback"):
+        SampleUI.display()
+
+def get_load_mode():
+    """
+    How much of the panel is built while the plugin loads:
+
+    eager     build and show the panel inside initializePlugin (default)
+    onDemand  only register the menu, the panel is built the first time it is opened
+    idle      only register the menu, then build the panel once Maya is idle, in time slices
+
+    Set with the RB_MODEL_HELPER_LOAD_MODE environment variable or the RBModelHelperLoadMode optionVar.
+    """
+    load_mode = os.environ.get(LOAD_MODE_ENV_VAR)
+    if not load_mode and cmds.optionVar(exists=LOAD_MODE_OPTION_VAR):
+        load_mode = cmds.optionVar(q=LOAD_MODE_OPTION_VAR)
+    if load_mode in LOAD_MODES:
+        return load_mode
+    return LOAD_MODES[0]
+
+
+class StartupPhase(object):
+
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.begin(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.end()
+        return False
+
+
+class StartupProfiler(object):
+    """
+    Opt-in timing of the plugin startup phases.
+
+    Enabled by the RB_MODEL_HELPER_PROFILE environment variable or the RBModelHelperProfile
+    optionVar. When the environment variable holds a path ending in .json the report is
+    written there, otherwise it goes to Maya's temp directory. Every time the outermost
+    phase finishes, the phases collected so far are printed and written out.
+    """
+
+    ENV_VAR = "RB_MODEL_HELPER_PROFILE"
+    OPTION_VAR = "RBModelHelperProfile"
+    REPORT_NAME = "rb_model_helper_startup.json"
+
+    def __init__(self):
+        self.enabled = None
+        self.phases = []
+        self._stack = []
+
+    def is_enabled(self):
+        if self.enabled is None:
+            env_value = os.environ.get(self.ENV_VAR, "")
+            if env_value and env_value != "0":
+                self.enabled = True
+            else:
+                self.enabled = bool(cmds.optionVar(exists=self.OPTION_VAR) and cmds.optionVar(q=self.OPTION_VAR))
+        return self.enabled
+
+    def phase(self, name):
+        return StartupPhase(self, name)
+
+    def begin(self, name):
+        if not self.is_enabled():
+            return
+        self._stack.append((name, perf_clock()))
+
+    def end(self):
+        if not self._stack:
+            return
+        name, start_time = self._stack.pop()
+        self.record(name, start_time, perf_clock())
+
+        if not self._stack:
+            self.report()
+
+    def record(self, name, start_time, end_time):
+        if not self.is_enabled():
+            return
+        path = "/".join([phase_name for phase_name, phase_start in self._stack] + [name])
+        self.phases.append({
+            "name": name,
+            "path": path,
+            "depth": len(self._stack),
+            "start": start_time,
+            "ms": (end_time - start_time) * 1000.0,
+        })
+
+    def report_path(self):
+        env_value = os.environ.get(self.ENV_VAR, "")
+        if env_value.lower().endswith(".json"):
+            return env_value
+        return os.path.join(cmds.internalVar(userTmpDir=True), self.REPORT_NAME)
+
+    def report(self):
+        """
+        Prints the collected phases to the Script Editor and writes them as JSON.
+        """
+        if not self.phases:
+            return
+        # Phases are recorded when they end, list them in the order they started.
+        phases = sorted(self.phases, key=lambda phase: (phase["start"], phase["depth"]))
+        self.phases = []
+
+        first_start = phases[0]["start"]
+        for phase in phases:
+            phase["start_ms"] = (phase.pop("start") - first_start) * 1000.0
+            om.MGlobal.displayInfo("Model Helper startup: {0}{1} {2:.2f} ms".format(
+                "  " * phase["depth"], phase["name"], phase["ms"]))
+
+        report = {
+            "python": sys.version.split()[0],
+            "total_ms": sum(phase["ms"] for phase in phases if phase["depth"] == 0),
+            "phases": phases,
+        }
+        path = self.report_path()
+        try:
+            with open(path, "w") as report_file:
+                json.dump(report, report_file, indent=2)
+        except (IOError, OSError) as error:
+            om.MGlobal.displayWarning("Model Helper: could not write {0}: {1}".format(path, error))
+        else:
+            om.MGlobal.displayInfo("Model Helper startup report: {0}".format(path))
+
+
+startup_profiler = StartupProfiler()
+
 
 class WorkspaceControl(object):
 
@@ -121,7 +275,8 @@ class WorkspaceControl(object):
                 workspace_control_ptr = long(omui.MQtUtil.findControl(self.name))
                 widget_ptr = long(getCppPointer(self.widget)[0])
 
-            omui.MQtUtil.addWidgetToMayaLayout(widget_ptr, workspace_control_ptr)
+            with startup_profiler.phase("addWidgetToMayaLayout"):
+                omui.MQtUtil.addWidgetToMayaLayout(widget_ptr, workspace_control_ptr)
 
     def exists(self):
         return cmds.workspaceControl(self.name, q=True, exists=True)
@@ -202,9 +357,92 @@ class ScrollableWidget(QtWidgets.QWidget):
         layout.setSpacing(2)
 
 
+class ResourceCache(object):
+    """
+    Process wide store for the icons, pixmaps and palette colours the panel uses.
+    Each resource path is loaded once and shared by every widget asking for it.
+    """
+
+    _icons = {}
+    _pixmaps = {}
+    _colors = {}
+    _preloaded = False
+
+    @classmethod
+    def icon(cls, path):
+        icon = cls._icons.get(path)
+        if icon is None:
+            icon = QtGui.QIcon(path)
+            cls._icons[path] = icon
+        return icon
+
+    @classmethod
+    def pixmap(cls, path):
+        pixmap = cls._pixmaps.get(path)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(path)
+            cls._pixmaps[path] = pixmap
+        return pixmap
+
+    @classmethod
+    def button_color(cls):
+        color = cls._colors.get("button")
+        if color is None:
+            color = QtWidgets.QApplication.palette("QPushButton").color(QtGui.QPalette.Button)
+            cls._colors["button"] = color
+        return color
+
+    @classmethod
+    def preload(cls, icon_paths=(), pixmap_paths=()):
+        """
+        Loads the given resources the first time it is called, later calls do nothing.
+        """
+        if cls._preloaded:
+            return
+        cls._preloaded = True
+
+        for path in icon_paths:
+            cls.icon(path)
+        for path in pixmap_paths:
+            cls.pixmap(path)
+        cls.button_color()
+
+    @classmethod
+    def clear(cls):
+        cls._icons.clear()
+        cls._pixmaps.clear()
+        cls._colors.clear()
+        cls._preloaded = False
+
+    @classmethod
+    def stats(cls):
+        """
+        :return: resource counts and an estimate of the pixel memory they hold, in bytes
+        """
+        memory = 0
+        for pixmap in cls._pixmaps.values():
+            memory += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        for icon in cls._icons.values():
+            for size in icon.availableSizes():
+                memory += size.width() * size.height() * 4
+
+        return {
+            "icons": len(cls._icons),
+            "pixmaps": len(cls._pixmaps),
+            "colors": len(cls._colors),
+            "memory": memory,
+        }
+
+    @classmethod
+    def report(cls):
+        stats = cls.stats()
+        om.MGlobal.displayInfo("Model Helper resources: {0} icons, {1} pixmaps, {2} colors, {3:.1f} KB".format(
+            stats["icons"], stats["pixmaps"], stats["colors"], stats["memory"] / 1024.0))
+
+
 class CollapsibleHeader(QtWidgets.QWidget):
-    COLLAPSED_PIXMAP = QtGui.QPixmap(":teRightArrow.png")
-    EXPANDED_PIXMAP = QtGui.QPixmap(":teDownArrow.png")
+    COLLAPSED_PIXMAP = ":teRightArrow.png"
+    EXPANDED_PIXMAP = ":teDownArrow.png"
     
     clicked = QtCore.Signal()
     
@@ -215,7 +453,7 @@ class CollapsibleHeader(QtWidgets.QWidget):
         self.set_background_color(None)
         
         self.icon_label = QtWidgets.QLabel()
-        self.icon_label.setFixedWidth(self.COLLAPSED_PIXMAP.width())
+        self.icon_label.setFixedWidth(ResourceCache.pixmap(self.COLLAPSED_PIXMAP).width())
         
         self.text_label = QtWidgets.QLabel()
         self.text_label.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
@@ -234,7 +472,7 @@ class CollapsibleHeader(QtWidgets.QWidget):
         
     def set_background_color(self, color):
         if not color:
-            color = QtWidgets.QPushButton().palette().color(QtGui.QPalette.Button)
+            color = ResourceCache.button_color()
         
         palette = self.palette()
         palette.setColor(QtGui.QPalette.Window, color)
@@ -247,9 +485,9 @@ class CollapsibleHeader(QtWidgets.QWidget):
         self._expanded = expanded
         
         if(self._expanded):
-            self.icon_label.setPixmap(self.EXPANDED_PIXMAP)
+            self.icon_label.setPixmap(ResourceCache.pixmap(self.EXPANDED_PIXMAP))
         else:
-            self.icon_label.setPixmap(self.COLLAPSED_PIXMAP)
+            self.icon_label.setPixmap(ResourceCache.pixmap(self.COLLAPSED_PIXMAP))
             
     def mouseReleaseEvent(self, event):
         self.clicked.emit()  # pylint: disable=E1101
@@ -282,7 +520,6 @@ class CollapsibleWidget(QtWidgets.QWidget):
     def set_Margins(self,valueA,valueB,valueC,valueD):
         self.header_wdg.setContentsMargins(valueA, valueB, valueC, valueD)
 
-        
     def add_widget(self, widget):
         self.body_layout.addWidget(widget)
         
@@ -303,22 +540,478 @@ class CollapsibleWidget(QtWidgets.QWidget):
         self.header_wdg.set_Margins(valueA, valueB, valueC, valueD)
        
 
+class LazyCollapsibleWidget(CollapsibleWidget):
+    """
+    CollapsibleWidget whose body is only built the first time it is needed,
+    either when the header is expanded or when the owner finds it in view.
+    """
+
+    PLACEHOLDER_HEIGHT = 30
+
+    def __init__(self, text, builder, parent=None):
+        self._builder = builder
+        self._built = False
+
+        super(LazyCollapsibleWidget, self).__init__(text, parent)
+
+        self.body_wdg.setMinimumHeight(self.PLACEHOLDER_HEIGHT)
+
+    def is_built(self):
+        return self._built
+
+    def build(self):
+        if self._built:
+            return
+        self._built = True
+
+        self.body_wdg.setMinimumHeight(0)
+        for layout in self._builder():
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.setSpacing(2)
+            self.add_layout(layout)
+
+    def on_header_clicked(self):
+        if not self._built:
+            self.build()
+        super(LazyCollapsibleWidget, self).on_header_clicked()
+
+
+class StateToggleButton(QtWidgets.QPushButton):
+    """
+    Checkable button bound to a getter/setter pair. The checked property shows
+    the current state; clicking calls the setter with the requested state.
+    """
+
+    STYLE_SHEET = "QPushButton:checked {background-color: #368BC1; color: #000000;}"
+
+    def __init__(self, text, getter, setter, parent=None):
+        super(StateToggleButton, self).__init__(text, parent)
+
+        self._getter = getter
+        self._setter = setter
+
+        self.setCheckable(True)
+        self.setStyleSheet(self.STYLE_SHEET)
+        self.clicked.connect(self.on_clicked)
+
+    def get_state(self):
+        return self._getter()
+
+    def set_state(self, enabled):
+        if self.isChecked() != enabled:
+            self.setChecked(enabled)
+
+    def on_clicked(self, checked):
+        self._setter(checked)
+        # The setter may be refused, show what Maya actually ended up with.
+        self.set_state(self.get_state())
+
+
+class ModelTool(object):
+    """
+    One entry of the Model Helper tool registry.
+
+    :param key: unique id, used to look the tool up in TOOL_REGISTRY
+    :param label: button text, empty for icon only buttons
+    :param name: readable name, defaults to the label
+    :param icon: Qt resource path of the button icon
+    :param command: MEL run when the tool is triggered
+    :param method: SampleUI method run instead of command, for tools that need Python
+    :param options: MEL run from the right-click Settings entry
+    :param icon_size: (width, height) of the button icon
+    :param aliases: extra search terms for the command palette
+    :param option_vars: optionVars the tool reads, saved with each macro step
+    """
+
+    __slots__ = ("key", "label", "name", "icon", "command", "method", "options", "icon_size", "aliases", "option_vars")
+
+    def __init__(self, key, label, name=None, icon=None, command=None, method=None, options=None, icon_size=(25, 20),
+                 aliases=(), option_vars=()):
+        self.key = key
+        self.label = label
+        self.name = name or label
+        self.icon = icon
+        self.command = command
+        self.method = method
+        self.options = options
+        self.icon_size = icon_size
+        self.aliases = aliases
+        self.option_vars = option_vars
+
+
+MODEL_TOOLS = (
+    ModelTool("deleteHistory", "History", icon=":deleteClip.png", method="delete_history", icon_size=(25, 15), aliases=("dh", "construction history")),
+    ModelTool("deleteNonDefHistory", "ND History", icon=":deleteClip.png", method="delete_nonDifHistory", icon_size=(25, 15), aliases=("non deformer history",)),
+    ModelTool("historyDryRun", "", name="History Dry Run", method="report_history", aliases=("history report",)),
+    ModelTool("historyDryRunTimed", "", name="History Dry Run (Re-evaluate)", method="report_history_timed", aliases=("history timing",)),
+    ModelTool("deleteSceneHistory", "", name="Delete All Scene History", method="delete_sceneHistory"),
+    ModelTool("centerPivot", "Center Piv", icon=":menuIconModify.png", method="perform_centerPivot", aliases=("pivot center",), option_vars=("RBModelHelperPivotMode",)),
+    ModelTool("centerPivotBounds", "", name="Center Pivot: Bounding Box", method="perform_centerPivotBounds"),
+    ModelTool("centerPivotCentroid", "", name="Center Pivot: Vertex Centroid", method="perform_centerPivotCentroid"),
+    ModelTool("centerPivotBottom", "", name="Center Pivot: Bottom Center", method="perform_centerPivotBottom", aliases=("ground pivot",)),
+    ModelTool("bakePivot", "Bake Piv", icon=":menuIconModify.png", method="perform_bakePivot"),
+    ModelTool("zeroPivot", "Zero Piv", icon=":menuIconModify.png", method="perform_zeroPivot"),
+    ModelTool("freezeTransform", "Freeze Transform", icon=":menuIconModify.png", method="perform_freezeTransform", options="FreezeTransformationsOptions;", aliases=("ft", "freeze"), option_vars=("freezeTranslate", "freezeRotate", "freezeScale")),
+    ModelTool("resetTransform", "Reset Transform", icon=":menuIconModify.png", method="perform_resetTransform", options="ResetTransformationsOptions;", aliases=("reset",), option_vars=("resetTranslate", "resetRotate", "resetScale")),
+    ModelTool("duplicate", "Duplicate", icon=":menuIconModify.png", command="duplicatePreset(1,1,1,0,0,0,0,0,0,0,0,0,0,0,1,1,1);"),
+    ModelTool("instance", "Instance", icon=":menuIconModify.png", command="duplicatePreset(1,0,1,0,0,0,0,0,0,0,0,0,0,0,1,1,1);"),
+    ModelTool("replace", "Replace", method="perform_replace", icon_size=(25, 25), aliases=("replace objects", "swap"), option_vars=("RBModelHelperReplaceInstance", "RBModelHelperReplaceKeepParent", "RBModelHelperReplaceKeepNames")),
+    ModelTool("pattern", "Pattern", name="Pattern Duplicate", method="open_pattern_duplicator", icon_size=(25, 25),
+              aliases=("array", "radial", "grid", "along curve")),
+    ModelTool("dedupe", "Dedupe", name="Dedupe to Instances", method="perform_dedupe", icon_size=(25, 25), aliases=("deduplicate", "instance duplicates")),
+    ModelTool("dedupeDryRun", "", name="Dedupe Dry Run", method="report_dedupe", aliases=("duplicate meshes report",)),
+    ModelTool("axisObject", "Object", method="set_axisObject"),
+    ModelTool("axisWorld", "World", method="set_axisWorld"),
+    ModelTool("axisComponent", "Component", command="manipMoveContext -e -mode 10 $currManipMovePropertiesCtx;"),
+    ModelTool("axisParent", "Parent", command="manipMoveContext -e -mode 1 $currManipMovePropertiesCtx;"),
+    ModelTool("sphere", "", name="Sphere", icon=":polySphere.png", command="CreatePolygonSphere;", options="CreatePolygonSphereOptions;", icon_size=(25, 25)),
+    ModelTool("cube", "", name="Cube", icon=":polyCube.png", command="CreatePolygonCube;", options="CreatePolygonCubeOptions;", icon_size=(25, 25)),
+    ModelTool("cylinder", "", name="Cylinder", icon=":polyCylinder.png", command="CreatePolygonCylinder;", options="CreatePolygonCylinderOptions;", icon_size=(25, 25)),
+    ModelTool("plane", "", name="Plane", icon=":polyMesh.png", command="CreatePolygonPlane;", options="CreatePolygonPlaneOptions;", icon_size=(25, 25)),
+    ModelTool("disc", "", name="Disc", icon=":polyDisc.png", command="polyDisc;", options="CreatePolygonDiscOptions;", icon_size=(25, 25)),
+    ModelTool("pyramid", "", name="Pyramid", icon=":polyPyramid.png", command="polyPyramid;", options="CreatePolygonPyramidOptions;", icon_size=(25, 25)),
+    ModelTool("prism", "", name="Prism", icon=":polyPrism.png", command="polyPrism;", options="CreatePolygonPrismOptions;", icon_size=(25, 25)),
+    ModelTool("pipe", "", name="Pipe", icon=":polyPipe.png", command="polyPipe;", options="CreatePolygonPipeOptions;", icon_size=(25, 25)),
+    ModelTool("helix", "", name="Helix", icon=":polyHelix.png", command="polyHelix;", options="CreatePolygonHelixOptions;", icon_size=(25, 25)),
+    ModelTool("gear", "", name="Gear", icon=":polyGear.png", command="polyGear;", options="CreatePolygonGearOptions;", icon_size=(25, 25)),
+    ModelTool("soccerBall", "", name="Soccer Ball", icon=":polySoccerBall.png", command="polyPrimitive;", options="CreatePolygonSoccerBallOptions;", icon_size=(25, 25)),
+    ModelTool("superEllipse", "", name="Super Ellipse", icon=":polySuperEllipse.png", command="polySuperShape;", options="CreatePolygonSuperEllipseOptions;", icon_size=(25, 25)),
+    ModelTool("torus", "", name="Torus", icon=":polyTorus.png", command="CreatePolygonTorus;", options="CreatePolygonTorusOptions;", icon_size=(25, 25)),
+    ModelTool("cone", "", name="Cone", icon=":polyCone.png", command="CreatePolygonCone;", options="CreatePolygonConeOptions;", icon_size=(25, 25)),
+    ModelTool("platonic", "", name="Platonic Solid", icon=":polyPlatonic.png", command="CreatePolygonPlatonic;", options="CreatePolygonPlatonicOptions;", icon_size=(25, 25)),
+    ModelTool("lift", "", name="Sculpt", icon=":Sculpt.png", command="SetMeshSculptTool;", icon_size=(25, 25), aliases=("sculpt tool",)),
+    ModelTool("sculptSmooth", "", name="Smooth", icon=":Smooth.png", command="SetMeshSmoothTool;", icon_size=(25, 25)),
+    ModelTool("sculptRelax", "", name="Relax", icon=":Relax.png", command="SetMeshRelaxTool;", icon_size=(25, 25)),
+    ModelTool("sculptGrab", "", name="Grab", icon=":Grab.png", command="SetMeshGrabTool;", icon_size=(25, 25)),
+    ModelTool("sculptPinch", "", name="Pinch", icon=":Pinch.png", command="SetMeshPinchTool;", icon_size=(25, 25)),
+    ModelTool("sculptFlatten", "", name="Flatten", icon=":Flatten.png", command="SetMeshFlattenTool;", icon_size=(25, 25)),
+    ModelTool("sculptFoamy", "", name="Foamy", icon=":Foamy.png", command="SetMeshFoamyTool;", icon_size=(25, 25)),
+    ModelTool("sculptSpray", "", name="Spray", icon=":Spray.png", command="SetMeshSprayTool;", icon_size=(25, 25)),
+    ModelTool("sculptRepeat", "", name="Repeat", icon=":Spray.png", command="SetMeshRepeatTool;", icon_size=(25, 25)),
+    ModelTool("sculptImprint", "", name="Imprint", icon=":Imprint.png", command="SetMeshImprintTool;", icon_size=(25, 25)),
+    ModelTool("sculptWax", "", name="Wax", icon=":Wax.png", command="SetMeshWaxTool;", icon_size=(25, 25)),
+    ModelTool("sculptScrape", "", name="Scrape", icon=":Scrape.png", command="SetMeshScrapeTool;", icon_size=(25, 25)),
+    ModelTool("sculptFill", "", name="Fill", icon=":Fill.png", command="SetMeshFillTool;", icon_size=(25, 25)),
+    ModelTool("sculptKnife", "", name="Knife", icon=":Knife.png", command="SetMeshKnifeTool;", icon_size=(25, 25)),
+    ModelTool("sculptSmear", "", name="Smear", icon=":Smear.png", command="SetMeshSmearTool;", icon_size=(25, 25)),
+    ModelTool("sculptBulge", "", name="Bulge", icon=":Bulge.png", command="SetMeshBulgeTool;", icon_size=(25, 25)),
+    ModelTool("sculptAmplify", "", name="Amplify", icon=":Amplify.png", command="SetMeshAmplifyTool;", icon_size=(25, 25)),
+    ModelTool("sculptFreeze", "", name="Freeze", icon=":Freeze.png", command="SetMeshFreezeTool;", icon_size=(25, 25)),
+    ModelTool("sculptFreezeSelect", "", name="Frozen Select", icon=":freezeSelected.png", command="SetMeshFrozenTool;", icon_size=(25, 25)),
+    ModelTool("sculptObjects", "", name="Sculpt Objects", icon=":Objects.png", command="OpenContentBrowser;", icon_size=(25, 25)),
+    ModelTool("divide", "Divide", icon=":polySubdFacet.png", command="SubdividePolygon;", options="SubdividePolygonOptions;"),
+    ModelTool("bevel", "Bevel", icon=":polyBevel.png", command="BevelPolygon;", options="BevelPolygonOptions"),
+    ModelTool("bridge", "bridge", icon=":polyBridge.png", method="perform_bridge", options="BridgeEdgeOptions;"),
+    ModelTool("ringAndSplit", "Ring Split", method="perform_ringAndSplit"),
+    ModelTool("ringAndDelete", "Ring Delete", method="perform_ringAndDelete"),
+    ModelTool("loopAndDelete", "Loop Delete", method="perform_loopAndDelete"),
+    ModelTool("loopAndDuplicate", "Loop Duplicate", method="perform_loopAndDuplicate"),
+    ModelTool("detach", "Detach", icon=":polySplitVertex.png", command="DetachComponent;"),
+    ModelTool("extrude", "extrude", icon=":polyExtrudeFacet.png", command="PolyExtrude;", options="PolyExtrudeOptions;"),
+    ModelTool("merge", "Merge", icon=":polyMerge.png", command="PolyMerge", options="PolyMergeOptions;", aliases=("weld",)),
+    ModelTool("mergeToCenter", "Merge2Center", icon=":polyMergeToCenter.png", command="MergeToCenter"),
+    ModelTool("transform", "transform", icon=":polyMoveVertex.png", command="MovePolygonComponent;", options="MovePolygonComponentOptions;"),
+    ModelTool("flip", "flip", icon=":polyFlip.png", method="perform_flip", option_vars=("RBModelHelperSymmetryTolerance",)),
+    ModelTool("flipMaya", "", name="Flip (Maya)", command="FlipMesh;"),
+    ModelTool("symmetrize", "symmetrize", icon=":symmetrize.png", method="perform_symmetrize", option_vars=("RBModelHelperSymmetryTolerance",)),
+    ModelTool("symmetrizeNegative", "", name="Symmetrize Negative Side", method="perform_symmetrizeNegative", option_vars=("RBModelHelperSymmetryTolerance",)),
+    ModelTool("symmetrizeMaya", "", name="Symmetrize (Maya)", command="Symmetrize"),
+    ModelTool("averageVert", "Average", name="Average Vertices", icon=":polyAverageVertex.png", method="perform_averageVert", aliases=("relax", "smooth vertices"),
+              option_vars=("RBModelHelperRelaxMethod", "RBModelHelperRelaxIterations", "RBModelHelperRelaxStrength", "RBModelHelperRelaxPinBorders")),
+    ModelTool("relaxOptions", "", name="Average Vertices Options", method="open_relax_options"),
+    ModelTool("topologyCacheStats", "", name="Topology Cache Stats", method="report_topology_cache"),
+    ModelTool("averageVertMaya", "", name="Average Vertices (Maya)", command="AverageVertex;"),
+    ModelTool("chamfer", "Chamfer", icon=":polyChamfer.png", command="ChamferVertex;", options="ChamferVertexOptions;"),
+    ModelTool("reorder", "Reorder", icon=":reorderIDs.png", command="ReorderVertex;"),
+    ModelTool("delEdge", "Delete Edge", icon=":polyDelEdgeVertex.png", command="DeletePolyElements;"),
+    ModelTool("edgeFlow", "Edge Flow", icon=":polyEditEdgeFlow.png", command="PolyEditEdgeFlow;", options="PolyEditEdgeFlowOptions;"),
+    ModelTool("flipEdge", "Flip Edge", icon=":polyFlipEdge.png", command="FlipTriangleEdge;"),
+    ModelTool("circularize", "Circularize", icon=":polyCircularize.png", method="perform_circularize", aliases=("circle",), option_vars=("RBModelHelperCircularizeRadius", "RBModelHelperCircularizeTwist")),
+    ModelTool("circularizeOptions", "", name="Circularize Options", method="open_circularize_options"),
+    ModelTool("circularizeMaya", "", name="Circularize (Maya)", command="PolyCircularize;"),
+    ModelTool("circularizeMayaOptions", "", name="Circularize (Maya) Options", command="PolyCircularizeOptions;"),
+    ModelTool("collapseEdge", "Collapse", icon=":polyCollapseEdge.png", command="performPolyCollapse 0;"),
+    ModelTool("spinEdgeBackward", "Collapse", name="Spin Edge Backward", icon=":polySpinEdgeBackward.png", command="PolySpinEdgeBackward;"),
+    ModelTool("spinEdgeForward", "Collapse", name="Spin Edge Forward", icon=":polySpinEdgeForward.png", command="PolySpinEdgeForward;"),
+    ModelTool("invisibleFace", "Invisible Face", icon=":polyAssignSubdivHole.png", command="PolyAssignSubdivHole;", options="PolyAssignSubdivHoleOptions;"),
+    ModelTool("duplicateFacet", "Duplicate", name="Duplicate Face", icon=":polyDuplicateFacet.png", command="performPolyChipOff 0 1;", options="DuplicateFaceOptions;"),
+    ModelTool("extract", "extract", icon=":polyChipOff.png", command="performPolyChipOff 0 0", options="ExtractFaceOptions;"),
+    ModelTool("poke", "poke", icon=":polyPoke.png", command="PokePolygon", options="PokePolygonOptions;"),
+    ModelTool("wedge", "Wedge", icon=":polyWedgeFace.png", command="WedgePolygon;", options="WedgePolygonOptions;"),
+    ModelTool("projectCurve", "Project Curve", icon=":projectCurve_Poly.png", command="ProjectCurveOnMesh;", options="ProjectCurveOnMeshOptions;"),
+    ModelTool("curveSplit", "curveSplit", icon=":projectCurveSplit_Poly.png", command="SplitMeshWithProjectedCurve", options="SplitMeshWithProjectedCurveOptions;"),
+    ModelTool("appendFacet", "Append", icon=":polyAppendFacet.png", command="setToolTo polyAppendFacetContext ; polyAppendFacetCtx -e -pc `optionVar -q polyKeepFacetsPlanar` polyAppendFacetContext;", options="setToolTo polyAppendFacetContext ; polyAppendFacetCtx -e -pc `optionVar -q polyKeepFacetsPlanar` polyAppendFacetContext; toolPropertyWindow;"),
+    ModelTool("connect", "connect", icon=":connect_NEX32.png", command="EnterConnectTool;", options="dR_connectTool; toolPropertyWindow;"),
+    ModelTool("crease", "crease", icon=":polyCrease.png", command="PolyCreaseTool;", options="PolyCreaseToolOptions;"),
+    ModelTool("createPoly", "createPoly", icon=":polyCreateFacet.png", command="setToolTo polyCreateFacetContext ; polyCreateFacetCtx -e -pc `optionVar -q polyKeepFacetsPlanar` polyCreateFacetContext;", options="setToolTo polyCreateFacetContext ; polyCreateFacetCtx -e -pc `optionVar -q polyKeepFacetsPlanar` polyCreateFacetContext; toolPropertyWindow;"),
+    ModelTool("insertEdge", "insertEdge", icon=":polySplitEdgeRing.png", command="SplitEdgeRingTool;", options="InsertEdgeLoopToolOptions;", aliases=("edge loop",)),
+    ModelTool("makeHole", "Make Hole", icon=":polyMergeFacet.png", command="MakeHoleTool;", options="MakeHoleToolOptions"),
+    ModelTool("multiCut", "multiCut", icon=":multiCut_NEX32.png", command="MultiCutTool;", options="dR_multiCutTool; toolPropertyWindow;"),
+    ModelTool("offsetEdge", "offsetEdge", icon=":polyDuplicateEdgeLoop.png", command="performPolyDuplicateEdge 0;", options="DuplicateEdgesOptions;"),
+    ModelTool("paintReduceWeights", "paintReduceWeights", icon=":polyPaintReduceWeights.png", command="PaintReduceWeightsTool;", options="PaintReduceWeightsToolOptions;"),
+    ModelTool("paintTransferWeights", "Transfer Weights", icon=":polyTransferAttributesWeights.png", command="PaintTransferAttributes;", options="PaintTransferAttributesOptions;"),
+    ModelTool("quadDraw", "Quad Draw", icon=":quadDraw_NEX32.png", command="displaySmoothness -divisionsU 0 -divisionsV 0 -pointsWire 4 -pointsShaded 1 -polygonObject 1; QuadDrawTool;", options="dR_quadDrawTool; toolPropertyWindow;", aliases=("retopology",)),
+    ModelTool("slideEdge", "Slide Edge", icon=":slideEdgeTool.png", command="SlideEdgeTool;", options="SlideEdgeToolOptions;"),
+    ModelTool("targetWeld", "targetWeld", icon=":weld_NEX32.png", command="MergeVertexTool;", options="MergeVertexToolOptions;", aliases=("merge vertex",)),
+    ModelTool("union", "Union", icon=":polyBooleansUnion.png", command="PolygonBooleanUnion;", options="PolygonBooleanUnionOptions;"),
+    ModelTool("difference", "difference", icon=":polyBooleansDifference.png", command="PolygonBooleanDifference;", options="PolygonBooleanDifferenceOptions;"),
+    ModelTool("intersection", "intersection", icon=":polyBooleansIntersection.png", command="PolygonBooleanIntersection;", options="PolygonBooleanIntersectionOptions;"),
+    ModelTool("combine", "combine", icon=":polyUnite.png", command="polyUnite;", options="PolyUniteOptions;", aliases=("unite", "merge objects")),
+    ModelTool("separate", "separate", icon=":polySeparate.png", command="polySeparate;", options="SeparatePolygonOptions;", aliases=("split objects",)),
+    ModelTool("fillHole", "Fill Hole", icon=":polyCloseBorder.png", command="polyCloseBorder;", options="FillHoleOptions;"),
+    ModelTool("reduce", "reduce", icon=":polyReduce.png", method="perform_reduce", options="performPolyReduce 1;", aliases=("decimate", "optimize")),
+    ModelTool("remesh", "remesh", icon=":polyRemesh.png", command="performPolyRemesh 0;", options="performPolyRemesh 1;"),
+    ModelTool("retopo", "retopo", icon=":polyRetopo.png", method="perform_retopo", options="performPolyRetopo 1;", aliases=("retopology",)),
+    ModelTool("smooth", "smooth", icon=":polySmooth.png", method="perform_smooth", options="performPolySmooth 1;"),
+    ModelTool("triangulate", "triangulate", icon=":polytri.png", method="perform_triangulate", aliases=("triangles", "tris")),
+    ModelTool("quadrangulate", "quad", name="Quadrangulate", icon=":polyQuad.png", method="perform_quadrangulate", options="performPolyQuadrangulate 1;", aliases=("quads",)),
+    ModelTool("mirror", "mirror", icon=":polyMirrorGeometry.png", command="MirrorPolygonGeometry;", options="performPolyMirror 1;"),
+    ModelTool("average", "Average", name="Average Normals", icon=":polyNormalAverage.png", command="AveragePolygonNormals;", options="AveragePolygonNormalsOptions;"),
+    ModelTool("setToFace", "setToFace", icon=":polyNormalSetToFace.png", command="polySetToFaceNormal ;", options="polySetToFaceNormal Options;"),
+    ModelTool("reverse", "Reverse", icon=":polyNormal.png", command="ReversePolygonNormals;", options="ReversePolygonNormalsOptions;"),
+    ModelTool("conform", "Conform", icon=":polyNormalsConform.png", command="ConformPolygonNormals;"),
+    ModelTool("lockNormals", "Lock Normals", icon=":polyNormalLock.png", command="LockNormals;"),
+    ModelTool("unlockNormals", "Unlock Normals", icon=":polyNormalUnlock.png", command="UnlockNormals;"),
+    ModelTool("toggleBackfaces", "Backface", method="set_backfaces", icon_size=(40, 30)),
+    ModelTool("toggleFaceTriangles", "Freeze", name="Template", method="set_faceTriangles", icon_size=(40, 30), aliases=("template", "freeze display")),
+    ModelTool("backfacesOn", "", name="Backface Culling On", method="set_backfacesOn"),
+    ModelTool("backfacesOff", "", name="Backface Culling Off", method="set_backfacesOff"),
+    ModelTool("templateOn", "", name="Template On", method="set_faceTrianglesOn", aliases=("freeze display",)),
+    ModelTool("templateOff", "", name="Template Off", method="set_faceTrianglesOff", aliases=("unfreeze display",)),
+    ModelTool("toggleFaceNormals", "Isolate", command="ToggleIsolateSelect;", icon_size=(40, 30)),
+    ModelTool("toggleFaceInvisible", "X-Ray", command="dR_DoCmd(\"objectXrayTGL\");", icon_size=(40, 30)),
+    ModelTool("marquee", "Marquee", command="selectPref -paintSelect false;", icon_size=(40, 30), aliases=("box select",)),
+    ModelTool("drag", "Drag", command="selectPref -paintSelect true;", icon_size=(40, 30), aliases=("paint select",)),
+    ModelTool("tweakMode", "Tweak", command="setTRSPreserveChildPosition(!`optionVar -q TRSPreserveChildPosition`)", icon_size=(40, 30), aliases=("preserve children",)),
+)
+
+TOOL_REGISTRY = dict((tool.key, tool) for tool in MODEL_TOOLS)
+
+
+class ToolSearchIndex(object):
+    """
+    Prefix and trigram index over the tool registry, used by CommandPalette.
+
+    Every word of a tool's name, key and aliases is indexed, and with a lower weight
+    the words of its MEL command and method. camelCase identifiers are indexed whole
+    and split into words. A query word matches a tool on a word prefix, or when enough
+    of its trigrams occur in the tool's words, which tolerates typos and missing letters.
+    """
+
+    WORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+")
+    MIN_TRIGRAM_SCORE = 0.6
+    TRIGRAM_WEIGHT = 0.8
+
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls(MODEL_TOOLS)
+        return cls._shared
+
+    def __init__(self, tools):
+        self.tools = list(tools)
+        self.prefixes = {}
+        self.trigrams = {}
+        for index, tool in enumerate(self.tools):
+            for word in self.split_words(" ".join(filter(None, [tool.command, tool.method]))):
+                self.add_word(word, index, 0.5)
+            for word in self.split_words(" ".join([tool.name, tool.key] + list(tool.aliases))):
+                self.add_word(word, index, 1.0)
+
+    @classmethod
+    def split_words(cls, text):
+        words = set()
+        for identifier in re.findall(r"[A-Za-z]+", text):
+            words.add(identifier.lower())
+            words.update(word.lower() for word in cls.WORD_PATTERN.findall(identifier))
+        return words
+
+    @staticmethod
+    def get_trigrams(word):
+        # The leading marker weights the start of a word, so "frez" still finds "freeze".
+        word = "^" + word
+        return set(word[i:i + 3] for i in range(len(word) - 2))
+
+    def add_word(self, word, index, weight):
+        for end in range(1, len(word) + 1):
+            postings = self.prefixes.setdefault(word[:end], {})
+            postings[index] = max(weight, postings.get(index, 0.0))
+        for trigram in self.get_trigrams(word):
+            self.trigrams.setdefault(trigram, set()).add(index)
+
+    def search(self, query, limit=15):
+        """
+        :return: up to limit tools matching every word of the query, best match first
+        """
+        scores = None
+        for word in re.findall(r"[a-z]+", query.lower()):
+            word_scores = dict(self.prefixes.get(word, {}))
+            trigrams = self.get_trigrams(word)
+            if trigrams:
+                hits = {}
+                for trigram in trigrams:
+                    for index in self.trigrams.get(trigram, ()):
+                        hits[index] = hits.get(index, 0) + 1
+                for index, count in hits.items():
+                    ratio = float(count) / len(trigrams)
+                    score = ratio * self.TRIGRAM_WEIGHT
+                    if ratio >= self.MIN_TRIGRAM_SCORE and score > word_scores.get(index, 0.0):
+                        word_scores[index] = score
+
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = dict((index, score + word_scores[index]) for index, score in scores.items() if index in word_scores)
+            if not scores:
+                return []
+
+        if not scores:
+            return []
+        ranked = sorted(scores, key=lambda index: (-scores[index], len(self.tools[index].name), index))
+        return [self.tools[index] for index in ranked[:limit]]
+
+
+class CommandPalette(QtWidgets.QDialog):
+    """
+    Popup search field over ToolSearchIndex. Enter or a double click runs the
+    selected tool through SampleUI.run_tool.
+    """
+
+    MAX_RESULTS = 15
+
+    def __init__(self, sample_ui):
+        super(CommandPalette, self).__init__(sample_ui, QtCore.Qt.Popup)
+
+        self.sample_ui = sample_ui
+        self.index = ToolSearchIndex.shared()
+        self.results = []
+
+        self.search_field = QtWidgets.QLineEdit()
+        self.search_field.setPlaceholderText("Search tools...")
+        self.result_list = QtWidgets.QListWidget()
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(2)
+        layout.addWidget(self.search_field)
+        layout.addWidget(self.result_list)
+
+        self.search_field.textChanged.connect(self.update_results)
+        self.search_field.returnPressed.connect(self.run_current)
+        self.result_list.itemActivated.connect(self.run_current)
+
+    def popup(self):
+        self.search_field.clear()
+        self.update_results("")
+        self.resize(max(self.sample_ui.width() - 10, 220), 280)
+        self.move(self.sample_ui.mapToGlobal(QtCore.QPoint(5, 5)))
+        self.show()
+        self.search_field.setFocus()
+
+    def get_tool_text(self, tool):
+        source = tool.method or (tool.command or "").split(";")[0].split()[0]
+        return "{0}    {1}".format(tool.name, source)
+
+    def update_results(self, text):
+        self.results = self.index.search(text, self.MAX_RESULTS)
+        self.result_list.clear()
+        for tool in self.results:
+            item = QtWidgets.QListWidgetItem(self.get_tool_text(tool))
+            if tool.icon:
+                item.setIcon(ResourceCache.icon(tool.icon))
+            self.result_list.addItem(item)
+        if self.results:
+            self.result_list.setCurrentRow(0)
+
+    def keyPressEvent(self, e):
+        if e.key() in (QtCore.Qt.Key_Up, QtCore.Qt.Key_Down) and self.results:
+            step = -1 if e.key() == QtCore.Qt.Key_Up else 1
+            self.result_list.setCurrentRow((self.result_list.currentRow() + step) % len(self.results))
+        else:
+            super(CommandPalette, self).keyPressEvent(e)
+
+    def run_current(self, *args):
+        row = self.result_list.currentRow()
+        if row < 0 or row >= len(self.results):
+            return
+        tool = self.results[row]
+        self.hide()
+        self.sample_ui.run_tool(tool.key)
 
 
 class SampleUI(QtWidgets.QWidget):
 
     WINDOW_TITLE = "Sample UI"
     UI_NAME = "SampleUI"
+    LAZY_SECTIONS_OPTION_VAR = "RBModelHelperLazySections"
+    BUILD_SLICE_SECONDS = 0.008
+    # Extra tools offered on a button's right-click menu.
+    TOOL_MENUS = {
+        "toggleBackfaces": ("backfacesOn", "backfacesOff"),
+        "toggleFaceTriangles": ("templateOn", "templateOff"),
+        "deleteHistory": ("historyDryRun", "historyDryRunTimed", "deleteSceneHistory"),
+        "deleteNonDefHistory": ("historyDryRun", "historyDryRunTimed"),
+        "dedupe": ("dedupeDryRun",),
+        "replace": (),
+        "symmetrize": ("symmetrizeNegative", "symmetrizeMaya"),
+        "flip": ("flipMaya",),
+        "circularize": ("circularizeOptions", "circularizeMaya", "circularizeMayaOptions"),
+        "averageVert": ("relaxOptions", "averageVertMaya"),
+        "centerPivot": ("centerPivotBounds", "centerPivotCentroid", "centerPivotBottom"),
+    }
 
     ui_instance = None
 
 
+    @classmethod
+    def instance_exists(cls):
+        if cls.ui_instance is None or not isValid(cls.ui_instance):
+            return False
+        return cls.ui_instance.workspace_control_instance.exists()
+
     @classmethod
     def display(cls):
-        if cls.ui_instance:
-            cls.ui_instance.show_workspace_control()
-        else:
+        """
+        Shows the panel, reusing the live instance when there is one.
+        """
+        if not cls.instance_exists():
+            cls.ui_instance = SampleUI()
+        cls.ui_instance.show_workspace_control()
+        return cls.ui_instance
+
+    @classmethod
+    def restore(cls):
+        """
+        Called by Maya through the workspace control's uiScript when it restores a saved layout.
+        """
+        if not cls.instance_exists():
             cls.ui_instance = SampleUI()
+        return cls.ui_instance
+
+    @classmethod
+    def get_ui_script(cls):
+        return ("import maya.cmds as cmds\n"
+                "if not cmds.pluginInfo('{0}', query=True, loaded=True):\n"
+                "    cmds.loadPlugin('{0}')\n"
+                "import {1}\n"
+                "{1}.SampleUI.restore()").format(PLUGIN_NAME, MODULE_ALIAS)
+
+    @classmethod
+    def delete_instance(cls):
+        if cls.ui_instance is not None and isValid(cls.ui_instance):
+            cls.ui_instance.state_sync.stop()
+            if cls.ui_instance.pattern_dialog is not None:
+                cls.ui_instance.pattern_dialog.clear_preview()
+            cls.ui_instance.setParent(None)
+            cls.ui_instance.deleteLater()
+        cls.ui_instance = None
+
+        workspace_control_name = cls.get_workspace_control_name()
+        if cmds.workspaceControl(workspace_control_name, q=True, exists=True):
+            cls.undock()
+            cmds.deleteUI(workspace_control_name)
 
     @classmethod
     def get_workspace_control_name(cls):
@@ -334,7 +1027,7 @@ class SampleUI(QtWidgets.QWidget):
         if self.workspace_control_instance.exists():
             self.workspace_control_instance.restore(self)
         else:
-            self.workspace_control_instance.create(self.WINDOW_TITLE, self, ui_script="from workspace_control import SampleUI\nSampleUI.display()")
+            self.workspace_control_instance.create(self.WINDOW_TITLE, self, ui_script=self.get_ui_script())
 
     def show_workspace_control(self):
         self.workspace_control_instance.set_visible(True)
@@ -342,797 +1035,187 @@ class SampleUI(QtWidgets.QWidget):
     def __init__(self):
         super(SampleUI, self).__init__()
 
-        self.setObjectName(self.__class__.UI_NAME)
-        self.setMinimumSize(150, 100)
-        self.widgets_history()
-        self.widgets_sphere()
-        self.widgets_cube()
-        self.widgets_cylinder()
-        self.widgets_plane()
-        self.widgets_torus()
-        self.widgets_cone()
-        self.widgets_disc()
-        self.widgets_gear()
-        self.widgets_helix()
-        self.widgets_pipe()
-        self.widgets_platonic()
-        self.widgets_prism()
-        self.widgets_pyramid()
-        self.widgets_soccerBall()
-        self.widgets_superEllipse()
-        self.widgets_sphericalHarm()
-        self.widgets_ultraShape()
-        self.widgets_collapsables()
-        self.widgets_sculpting()
-        self.widgets_divide()
-        self.widgets_bevel()
-        self.widgets_bridge()
-        self.widgets_detach()  
-        self.widgets_flip()  
-        self.widgets_merge()
-        self.widgets_mergeToCenter()
-        self.widgets_extrude()
-        self.widgets_edgeFlow()
-        self.widgets_symmetrize()
-        self.widgets_averageVert()
-        self.widgets_chamfer()
-        self.widgets_reorder()
-        self.widgets_delEdge()
-        self.widgets_flipEdge()
-        self.widgets_transform()
-        self.widgets_circularize()
-        self.widgets_collapseEdge()
-        self.widgets_curveSplit()
-        self.widgets_duplicateFacet()
-        self.widgets_extract()
-        self.widgets_invisibleFace()   
-        self.widgets_poke()
-        self.widgets_projectCurve()
-        self.widgets_wedge()
-        self.widgets_spinEdgeForward()
-        self.widgets_spinEdgeBackward()
-        self.widgets_appendFacet()
-        self.widgets_connect()
-        self.widgets_crease()
-        self.widgets_createPoly()
-        self.widgets_insertEdge()
-        self.widgets_makeHole()
-        self.widgets_multiCut()
-        self.widgets_offsetEdge()
-        self.widgets_paintReduceWeights()
-        self.widgets_paintTransferWeights()
-        self.widgets_quadDraw()
-        self.widgets_slideEdge()
-        self.widgets_targetWeld()
-        self.widgets_mirror()
-        self.widgets_quadrangulate()
-        self.widgets_triangulate()
-        self.widgets_smooth()
-        self.widgets_retopo()
-        self.widgets_remesh()
-        self.widgets_reduce()
-        self.widgets_fillHole()
-        self.widgets_conform()
-        self.widgets_separate()
-        self.widgets_combine()
-        self.widgets_intersection()
-        self.widgets_difference()
-        self.widgets_union()
-        self.widgets_centerPivot()
-        self.widgets_bakePivot()
-        self.widgets_zeroPivot()
-        self.widgets_freezeTransform()
-        self.widgets_resetTransform()
-        self.widgets_duplicate()
-        self.widgets_instance()
-        self.widgets_replace()
-        self.widgets_average()
-        self.widgets_unlockNormals()
-        self.widgets_reverse()
-        self.widgets_lockNormals()
-        self.widgets_setToFace()
-        self.widgets_average()
-        self.widgets_toggleReflectionSetModeOff()
-        self.widgets_toggleReflectionSetModeOn()
-        self.widgets_toggleCamBasedSelOff()
-        self.widgets_toggleCamBasedSelOn()
-        self.widgets_toggleBackfaces()
-        self.widgets_toggleFaceTriangles()
-        self.widgets_toggleFaceInvisible()
-        self.widgets_toggleFaceNormals()
-        self.widgets_marquee()
-        self.widgets_drag()
-        self.widgets_preserveUVsOff()
-        self.widgets_preserveUVsOn()
-        self.widgets_preserveChildrenOff()
-        self.widgets_preserveChildrenOn()
-        self.widgets_tweakMode()
-        self.widgets_edgeConstraintOff()
-        self.widgets_edgeConstraintOn()
-        self.widgets_surfaceConstraintOff()
-        self.widgets_surfaceConstraintOn()
-        self.widgets_axisObject()
-        self.widgets_axisWorld()
-        self.widgets_axisComponent()
-        self.widgets_axisParent()
-        self.widgets_ringAndSplit()
-        self.widgets_ringAndDelete()
-        self.widgets_loopAndDelete()
-        self.widgets_loopAndDuplicate()
-        self.create_layout()
-        self.create_connections()
-        self.create_workspace_control()
+        with startup_profiler.phase("SampleUI.__init__"):
+            self._open_start = perf_clock()
+            self.cold_open_time = None
+            self.section_times = {}
+            self.lazy_sections = self.use_lazy_sections()
+            self.sliced_build = get_load_mode() == "idle"
+            self.pending_sections = []
+            self.tool_buttons = {}
+            self.toggle_buttons = {}
+            self.settings_menu = None
+            self.settings_tool = None
+            self.command_palette = None
+            self.pattern_dialog = None
+            self.relax_dialog = None
+            self.circularize_dialog = None
+            self.macro_recorder = MacroRecorder(self.run_tool)
+            self.macro_record_button = None
+            self.macro_status_label = None
+
+            ResourceCache.preload(icon_paths=[tool.icon for tool in MODEL_TOOLS if tool.icon],
+                                  pixmap_paths=[CollapsibleHeader.COLLAPSED_PIXMAP, CollapsibleHeader.EXPANDED_PIXMAP])
+
+            self.setObjectName(self.__class__.UI_NAME)
+            self.setMinimumSize(150, 100)
+            with startup_profiler.phase("create_layout"):
+                self.create_layout()
+            with startup_profiler.phase("create_workspace_control"):
+                self.create_workspace_control()
+            with startup_profiler.phase("create_state_sync"):
+                self.create_state_sync()
+
+    @classmethod
+    def use_lazy_sections(cls):
+        """
+        Lazy mode is opt-in through the RBModelHelperLazySections optionVar.
+        """
+        if cmds.optionVar(exists=cls.LAZY_SECTIONS_OPTION_VAR):
+            return bool(cmds.optionVar(q=cls.LAZY_SECTIONS_OPTION_VAR))
+        return False
             
     def set_text(self, text):
         self.text_label.setText("<b>{0}</b>".format(text))
-    
-    def widgets_history(self):
-        
-        self.deleteHistory_button = QtWidgets.QPushButton("History")
-        self.deleteHistory_button.setIcon(QtGui.QIcon(":deleteClip.png"))
-        self.deleteHistory_button.setIconSize(QtCore.QSize(25, 15))
-        self.deleteHistory_button.clicked.connect(self.delete_history)
-        
-        self.deleteNonDefHistory_button = QtWidgets.QPushButton("ND History")
-        self.deleteNonDefHistory_button.setIcon(QtGui.QIcon(":deleteClip.png"))
-        self.deleteNonDefHistory_button.setIconSize(QtCore.QSize(25, 15))
-        self.deleteNonDefHistory_button.clicked.connect(self.delete_nonDifHistory)
-        
-    def perform_centerPivot(self):
-        mel.eval("CenterPivot;")
-        
-    def widgets_centerPivot(self):
-        self.centerPivot_button = QtWidgets.QPushButton("Center Piv")
-        self.centerPivot_button.setIcon(QtGui.QIcon(":menuIconModify.png"))
-        self.centerPivot_button.setIconSize(QtCore.QSize(25, 20))
-        self.centerPivot_button.clicked.connect(self.perform_centerPivot)
 
-        
-    def perform_bakePivot(self):
-        mel.eval("BakeCustomPivot;")
-        
-    def open_bakePivotOptions(self):
-        mel.eval("BakeCustomPivotOptions;")
-        
-    def popup_bakePivot(self, position):
-        bakePivot_popup = QtWidgets.QMenu()
-        bakePivot_action = QtWidgets.QAction('Settings', self)
-        bakePivot_action.triggered.connect(self.open_bakePivotOptions)
-        bakePivot_popup.addAction(bakePivot_action)
-        bakePivot_popup.exec_(self.bakePivot_button.mapToGlobal(position))
-
-    def widgets_bakePivot(self):
-        self.bakePivot_button = QtWidgets.QPushButton("Bake Piv")
-        self.bakePivot_button.setIcon(QtGui.QIcon(":menuIconModify.png"))
-        self.bakePivot_button.setIconSize(QtCore.QSize(25, 20))
-        self.bakePivot_button.clicked.connect(self.perform_bakePivot)
-        self.bakePivot_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.bakePivot_button.customContextMenuRequested.connect(self.popup_bakePivot) 
-        
     def perform_zeroPivot(self):
-        node_list = cmds.ls( sl=True )
+        node_list = cmds.ls( sl=True, long=True )
         if not node_list:
             cmds.error( 'Select one or more nodes to zero its transforms.' )
 
-        for node in node_list:
-            parent = None
-            try:
-                parent = cmds.listRelatives( node, p=True )[0]
-            except:
-                pass
-                
-            if parent:
-                node = cmds.parent( node, w=True )[0]
-                
-            cmds.xform(node,piv=[0, 0, 0],ws=True,)
-            cmds.makeIdentity(node,apply=True,t=True,r=True,s=True)
-
+        TransformEngine.zero_pivot(node_list)
         cmds.select( node_list, r=True )
 
-    def widgets_zeroPivot(self):
-        self.zeroPivot_button = QtWidgets.QPushButton("Zero Piv")
-        self.zeroPivot_button.setIcon(QtGui.QIcon(":menuIconModify.png"))
-        self.zeroPivot_button.setIconSize(QtCore.QSize(25, 20))
-        self.zeroPivot_button.clicked.connect(self.perform_zeroPivot)
-        
+    def get_dedupe_meshes(self):
+        """
+        The selected meshes, or every mesh in the scene when nothing is selected.
+        """
+        selection = cmds.ls(selection=True, long=True)
+        if selection:
+            return HistoryCleaner.get_meshes(selection)[0]
+        return HistoryCleaner.get_scene_meshes()
+
+    def open_pattern_duplicator(self):
+        if self.pattern_dialog is None:
+            self.pattern_dialog = PatternDuplicatorDialog(self)
+        self.pattern_dialog.show()
+        self.pattern_dialog.raise_()
+
+    def open_relax_options(self):
+        if self.relax_dialog is None:
+            self.relax_dialog = RelaxOptionsDialog(self)
+        self.relax_dialog.show()
+        self.relax_dialog.raise_()
+
+    def report_topology_cache(self):
+        TopologyCache.shared().report()
+
+    def perform_symmetrize(self):
+        SymmetryMap.apply_selected(SymmetryMap.SYMMETRIZE)
+
+    def perform_symmetrizeNegative(self):
+        SymmetryMap.apply_selected(SymmetryMap.SYMMETRIZE, direction=-1)
+
+    def perform_flip(self):
+        SymmetryMap.apply_selected(SymmetryMap.FLIP)
+
+    def open_circularize_options(self):
+        if self.circularize_dialog is None:
+            self.circularize_dialog = CircularizeOptionsDialog(self)
+        self.circularize_dialog.show()
+        self.circularize_dialog.raise_()
+
+    def perform_circularize(self):
+        CircularizeEngine.circularize_selected()
+
+    def perform_averageVert(self):
+        RelaxEngine.relax_selected()
+
+    def perform_replace(self):
+        ReplaceEngine.replace_selected()
+
+    def perform_dedupe(self):
+        MeshDeduplicator(self.get_dedupe_meshes()).apply()
+
+    def report_dedupe(self):
+        MeshDeduplicator(self.get_dedupe_meshes()).report()
+
+    def perform_centerPivot(self, mode=None):
+        """
+        The right-click modes also become the default mode of the Center Piv button.
+        """
+        node_list = cmds.ls(selection=True, long=True)
+        if not node_list:
+            return
+        if mode:
+            cmds.optionVar(stringValue=(TransformEngine.PIVOT_MODE_OPTION_VAR, mode))
+        TransformEngine.center_pivots(node_list, mode)
+        cmds.select(node_list, replace=True)
+
+    def perform_centerPivotBounds(self):
+        self.perform_centerPivot(TransformEngine.PIVOT_BOUNDS)
+
+    def perform_centerPivotCentroid(self):
+        self.perform_centerPivot(TransformEngine.PIVOT_CENTROID)
+
+    def perform_centerPivotBottom(self):
+        self.perform_centerPivot(TransformEngine.PIVOT_BOTTOM)
+
+    def perform_bakePivot(self):
+        node_list = cmds.ls(selection=True, long=True)
+        if node_list:
+            TransformEngine.bake_pivot(node_list)
+            cmds.select(node_list, replace=True)
+
     def perform_freezeTransform(self):
-        mel.eval("FreezeTransformations;")
-        
-    def open_freezeTransformOptions(self):
-        mel.eval("FreezeTransformationsOptions;")
-        
-    def popup_freezeTransform(self, position):
-        freezeTransform_popup = QtWidgets.QMenu()
-        freezeTransform_action = QtWidgets.QAction('Settings', self)
-        freezeTransform_action.triggered.connect(self.open_freezeTransformOptions)
-        freezeTransform_popup.addAction(freezeTransform_action)
-        freezeTransform_popup.exec_(self.freezeTransform_button.mapToGlobal(position))
-
-    def widgets_freezeTransform(self):
-        
-        self.freezeTransform_button = QtWidgets.QPushButton("Freeze Transform")
-        self.freezeTransform_button.setIcon(QtGui.QIcon(":menuIconModify.png"))
-        self.freezeTransform_button.setIconSize(QtCore.QSize(25, 20))
-        self.freezeTransform_button.clicked.connect(self.perform_freezeTransform)
-        self.freezeTransform_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.freezeTransform_button.customContextMenuRequested.connect(self.popup_freezeTransform) 
-        
+        if TransformEngine.options_limited(TransformEngine.FREEZE_OPTION_VARS):
+            mel.eval("FreezeTransformations;")
+        else:
+            TransformEngine.freeze(cmds.ls(selection=True, long=True))
+
     def perform_resetTransform(self):
-        mel.eval("ResetTransformations;")
-        
-    def open_resetTransformOptions(self):
-        mel.eval("ResetTransformationsOptions;")
-        
-    def popup_resetTransform(self, position):
-        resetTransform_popup = QtWidgets.QMenu()
-        resetTransform_action = QtWidgets.QAction('Settings', self)
-        resetTransform_action.triggered.connect(self.open_resetTransformOptions)
-        resetTransform_popup.addAction(resetTransform_action)
-        resetTransform_popup.exec_(self.resetTransform_button.mapToGlobal(position))
-
-    def widgets_resetTransform(self):
-        self.resetTransform_button = QtWidgets.QPushButton("Reset Transform")
-        self.resetTransform_button.setIcon(QtGui.QIcon(":menuIconModify.png"))
-        self.resetTransform_button.setIconSize(QtCore.QSize(25, 20))
-        self.resetTransform_button.clicked.connect(self.perform_resetTransform)
-        self.resetTransform_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.resetTransform_button.customContextMenuRequested.connect(self.popup_resetTransform) 
-
-    def perform_duplicate(self):
-        mel.eval("duplicatePreset(1,1,1,0,0,0,0,0,0,0,0,0,0,0,1,1,1);")
-        
-    def widgets_duplicate(self):
-        self.duplicate_button = QtWidgets.QPushButton("Duplicate")
-        #self.resetTransform_button.setIcon(QtGui.QIcon(":menuIconModify.png"))
-        self.duplicate_button.setIconSize(QtCore.QSize(25, 20))
-        self.duplicate_button.clicked.connect(self.perform_duplicate)
-        
-    def perform_instance(self):
-        mel.eval("duplicatePreset(1,0,1,0,0,0,0,0,0,0,0,0,0,0,1,1,1);")
-        
-    def widgets_instance(self):
-        self.instance_button = QtWidgets.QPushButton("Instance")
-        #self.resetTransform_button.setIcon(QtGui.QIcon(":menuIconModify.png"))
-        self.instance_button.setIconSize(QtCore.QSize(25, 20))
-        self.instance_button.clicked.connect(self.perform_instance)
-        
-    def perform_replace(self):
-        mel.eval("ReplaceObjects;")
-        
-    def open_replaceOptions(self):
-        self.replace_button.setHidden(True)
-        mel.eval("ReplaceObjectsOptions;")
-        self.replace_button.setHidden(False)
-        
-    def popup_replace(self, position):
-        replace_popup = QtWidgets.QMenu()
-        replace_action = QtWidgets.QAction('Settings', self)
-        replace_action.triggered.connect(self.open_replaceOptions)
-        replace_popup.addAction(replace_action)
-        replace_popup.exec_(self.replace_button.mapToGlobal(position))
-        
-    def widgets_replace(self):
-        self.replace_button = QtWidgets.QPushButton("Replace")
-        self.replace_button.setIconSize(QtCore.QSize(25, 25))
-        self.replace_button.clicked.connect(self.perform_replace)
-        self.replace_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.replace_button.customContextMenuRequested.connect(self.popup_replace)
-        
+        if TransformEngine.options_limited(TransformEngine.RESET_OPTION_VARS):
+            mel.eval("ResetTransformations;")
+        else:
+            TransformEngine.reset(cmds.ls(selection=True, long=True))
+
     def set_axisObject(self):
         cmds.manipMoveContext('Move', e=True, mode=0)
         mel.eval("manipRotateContext -e -mode 0 $currManipRotatePropertiesCtx;")
-        
-    def widgets_axisObject(self):
-        self.axisObject_button = QtWidgets.QPushButton("Object")
-        self.axisObject_button.setIconSize(QtCore.QSize(25, 20))
-        self.axisObject_button.clicked.connect(self.set_axisObject)
-            
+
     def set_axisWorld(self):
         cmds.manipMoveContext('Move', e=True, mode=2)
         mel.eval("manipRotateContext -e -mode 1 $currManipRotatePropertiesCtx;")
-        
-    def widgets_axisWorld(self):
-        self.axisWorld_button = QtWidgets.QPushButton("World")
-        self.axisWorld_button.setIconSize(QtCore.QSize(25, 20))
-        self.axisWorld_button.clicked.connect(self.set_axisWorld)
-        
-    def set_axisComponent(self):
-        mel.eval("manipMoveContext -e -mode 10 $currManipMovePropertiesCtx;")
 
-        
-    def widgets_axisComponent(self):
-        self.axisComponent_button = QtWidgets.QPushButton("Component")
-        self.axisComponent_button.setIconSize(QtCore.QSize(25, 20))
-        self.axisComponent_button.clicked.connect(self.set_axisComponent)
-        
-    def set_axisParent(self):
-        mel.eval("manipMoveContext -e -mode 1 $currManipMovePropertiesCtx;")
-        
-    def widgets_axisParent(self):
-        self.axisParent_button = QtWidgets.QPushButton("Parent")
-        self.axisParent_button.setIconSize(QtCore.QSize(25, 20))
-        self.axisParent_button.clicked.connect(self.set_axisParent)
-        
-    def set_axisParent(self):
-        mel.eval("manipMoveContext -e -mode 1 $currManipMovePropertiesCtx;")
-        
-    def widgets_sculptWireframe(self):
-        self.axisParent_button = QtWidgets.QPushButton("WireFrame")
-        self.axisParent_button.setIconSize(QtCore.QSize(25, 20))
-        self.axisParent_button.clicked.connect(self.set_axisParent)
-        
+    def run_on_edge_walk(self, mode, command, fallback):
+        """
+        Grows the selected edges into loops or rings with EdgeLoopWalker and runs command
+        on each mesh's result. Other selections go through the PolyConvertTo* fallback.
+        """
+        groups = EdgeLoopWalker.expand_selection(mode) if np is not None else None
+        if groups is None:
+            mel.eval(fallback)
+            return
+        for shape_name, edges in groups:
+            cmds.select(EdgeLoopWalker.get_component_names(shape_name, edges), replace=True)
+            command()
 
-    def create_sphere(self):
-        mel.eval("CreatePolygonSphere;")
-        
-    def open_sphereOptions(self):
-        self.sphere_button.setHidden(True)
-        mel.eval("CreatePolygonSphereOptions;")
-        self.sphere_button.setHidden(False)
-        
-    def popup_sphere(self, position):
-        sphere_popup = QtWidgets.QMenu()
-        sphere_action = QtWidgets.QAction('Settings', self)
-        sphere_action.triggered.connect(self.open_sphereOptions)
-        sphere_popup.addAction(sphere_action)
-        sphere_popup.exec_(self.sphere_button.mapToGlobal(position))
-        
-    def widgets_sphere(self):
-        self.sphere_button = QtWidgets.QPushButton("")
-        self.sphere_button.setIcon(QtGui.QIcon(":polySphere.png"))
-        self.sphere_button.setIconSize(QtCore.QSize(25, 25))
-        self.sphere_button.clicked.connect(self.create_sphere)
-        self.sphere_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.sphere_button.customContextMenuRequested.connect(self.popup_sphere)
+    def perform_ringAndSplit(self):
+        self.run_on_edge_walk(EdgeLoopWalker.RING, partial(
+            cmds.polySplitRing, constructionHistory=True, splitType=1, weight=0.5, smoothingAngle=30, fixQuads=True),
+            "PolyConvertToRingAndSplit;")
 
-        
-                                
-    def create_cube(self):
-        mel.eval("CreatePolygonCube;")
-        
-    def open_cubeOptions(self):
-        mel.eval("CreatePolygonCubeOptions;")
-        
-    def popup_cube(self, position):
-        cube_popup = QtWidgets.QMenu()
-        cube_action = QtWidgets.QAction('Settings', self)
-        cube_action.triggered.connect(self.open_cubeOptions)
-        cube_popup.addAction(cube_action)
-        cube_popup.exec_(self.cube_button.mapToGlobal(position))
-        
-    def widgets_cube(self):
-        self.cube_button = QtWidgets.QPushButton("")
-        self.cube_button.setIcon(QtGui.QIcon(":polyCube.png"))
-        self.cube_button.setIconSize(QtCore.QSize(25, 25))
-        self.cube_button.clicked.connect(self.create_cube)
-        self.cube_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.cube_button.customContextMenuRequested.connect(self.popup_cube)
-        
-    def create_cylinder(self):
-        mel.eval("CreatePolygonCylinder;")
-        
-    def open_cylinderOptions(self):
-        mel.eval("CreatePolygonCylinderOptions;")
-        
-    def popup_cylinder(self, position):
-        cylinder_popup = QtWidgets.QMenu()
-        cylinder_action = QtWidgets.QAction('Settings', self)
-        cylinder_action.triggered.connect(self.open_cylinderOptions)
-        cylinder_popup.addAction(cylinder_action)
-        cylinder_popup.exec_(self.cylinder_button.mapToGlobal(position))
-        
-    def widgets_cylinder(self):
-        self.cylinder_button = QtWidgets.QPushButton("")
-        self.cylinder_button.setIcon(QtGui.QIcon(":polyCylinder.png"))
-        self.cylinder_button.setIconSize(QtCore.QSize(25, 25))
-        self.cylinder_button.clicked.connect(self.create_cylinder)
-        self.cylinder_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.cylinder_button.customContextMenuRequested.connect(self.popup_cylinder)
-        
-    def create_plane(self):
-        mel.eval("CreatePolygonPlane;")
-        
-    def open_planeOptions(self):
-        mel.eval("CreatePolygonPlaneOptions;")
-        
-    def popup_plane(self, position):
-        plane_popup = QtWidgets.QMenu()
-        plane_action = QtWidgets.QAction('Settings', self)
-        plane_action.triggered.connect(self.open_planeOptions)
-        plane_popup.addAction(plane_action)
-        plane_popup.exec_(self.plane_button.mapToGlobal(position))
-        
-    def widgets_plane(self):
-        self.plane_button = QtWidgets.QPushButton("")
-        self.plane_button.setIcon(QtGui.QIcon(":polyMesh.png"))
-        self.plane_button.setIconSize(QtCore.QSize(25, 25))
-        self.plane_button.clicked.connect(self.create_plane)
-        self.plane_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.plane_button.customContextMenuRequested.connect(self.popup_plane)    
-        
-    def create_disc(self):
-        mel.eval("CreatePolygonDisc;")
-        
-    def open_discOptions(self):
-        mel.eval("CreatePolygonDiscOptions;")
-        
-    def popup_disc(self, position):
-        disc_popup = QtWidgets.QMenu()
-        disc_action = QtWidgets.QAction('Settings', self)
-        disc_action.triggered.connect(self.open_discOptions)
-        disc_popup.addAction(disc_action)
-        disc_popup.exec_(self.disc_button.mapToGlobal(position))
-        
-    def widgets_disc(self):
-        self.disc_button = QtWidgets.QPushButton("")
-        self.disc_button.setIcon(QtGui.QIcon(":polyDisc.png"))
-        self.disc_button.setIconSize(QtCore.QSize(25, 25))
-        self.disc_button.clicked.connect(self.create_disc)
-        self.disc_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.disc_button.customContextMenuRequested.connect(self.popup_disc)  
-        
-    def create_pyramid(self):
-        mel.eval("CreatePolyPyramid;")
-        
-    def open_pyramidOptions(self):
-        mel.eval("CreatePolygonPyramidOptions;")
-        
-    def popup_pyramid(self, position):
-        pyramid_popup = QtWidgets.QMenu()
-        pyramid_action = QtWidgets.QAction('Settings', self)
-        pyramid_action.triggered.connect(self.open_pyramidOptions)
-        pyramid_popup.addAction(pyramid_action)
-        pyramid_popup.exec_(self.pyramid_button.mapToGlobal(position))
-        
-    def widgets_pyramid(self):
-        self.pyramid_button = QtWidgets.QPushButton("")
-        self.pyramid_button.setIcon(QtGui.QIcon(":polyPyramid.png"))
-        self.pyramid_button.setIconSize(QtCore.QSize(25, 25))
-        self.pyramid_button.clicked.connect(self.create_pyramid)
-        self.pyramid_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.pyramid_button.customContextMenuRequested.connect(self.popup_pyramid) 
-        
-    def create_pyramid(self):
-        mel.eval("CreatePolyPyramid;")
-        
-    def open_pyramidOptions(self):
-        mel.eval("CreatePolygonPyramidOptions;")
-        
-    def popup_pyramid(self, position):
-        pyramid_popup = QtWidgets.QMenu()
-        pyramid_action = QtWidgets.QAction('Settings', self)
-        pyramid_action.triggered.connect(self.open_pyramidOptions)
-        pyramid_popup.addAction(pyramid_action)
-        pyramid_popup.exec_(self.pyramid_button.mapToGlobal(position))
-        
-    def widgets_pyramid(self):
-        self.pyramid_button = QtWidgets.QPushButton("")
-        self.pyramid_button.setIcon(QtGui.QIcon(":polyPyramid.png"))
-        self.pyramid_button.setIconSize(QtCore.QSize(25, 25))
-        self.pyramid_button.clicked.connect(self.create_pyramid)
-        self.pyramid_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.pyramid_button.customContextMenuRequested.connect(self.popup_pyramid) 
-        
-    def create_prism(self):
-        mel.eval("CreatePolyPrism;")
-        
-    def open_prismOptions(self):
-        mel.eval("CreatePolygonPrismOptions;")
-        
-    def popup_prism(self, position):
-        prism_popup = QtWidgets.QMenu()
-        prism_action = QtWidgets.QAction('Settings', self)
-        prism_action.triggered.connect(self.open_prismOptions)
-        prism_popup.addAction(prism_action)
-        prism_popup.exec_(self.prism_button.mapToGlobal(position))
-        
-    def widgets_prism(self):
-        self.prism_button = QtWidgets.QPushButton("")
-        self.prism_button.setIcon(QtGui.QIcon(":polyPrism.png"))
-        self.prism_button.setIconSize(QtCore.QSize(25, 25))
-        self.prism_button.clicked.connect(self.create_prism)
-        self.prism_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.prism_button.customContextMenuRequested.connect(self.popup_prism) 
-        
-    def create_pipe(self):
-        mel.eval("CreatePolyPipe;")
-        
-    def open_pipeOptions(self):
-        mel.eval("CreatePolygonPipeOptions;")
-        
-    def popup_pipe(self, position):
-        pipe_popup = QtWidgets.QMenu()
-        pipe_action = QtWidgets.QAction('Settings', self)
-        pipe_action.triggered.connect(self.open_pipeOptions)
-        pipe_popup.addAction(pipe_action)
-        pipe_popup.exec_(self.pipe_button.mapToGlobal(position))
-        
-    def widgets_pipe(self):
-        self.pipe_button = QtWidgets.QPushButton("")
-        self.pipe_button.setIcon(QtGui.QIcon(":polyPipe.png"))
-        self.pipe_button.setIconSize(QtCore.QSize(25, 25))
-        self.pipe_button.clicked.connect(self.create_pipe)
-        self.pipe_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.pipe_button.customContextMenuRequested.connect(self.popup_pipe) 
-        
-    def create_helix(self):
-        mel.eval("CreatePolyHelix;")
-        
-    def open_helixOptions(self):
-        mel.eval("CreatePolygonHelixOptions;")
-        
-    def popup_helix(self, position):
-        helix_popup = QtWidgets.QMenu()
-        helix_action = QtWidgets.QAction('Settings', self)
-        helix_action.triggered.connect(self.open_helixOptions)
-        helix_popup.addAction(helix_action)
-        helix_popup.exec_(self.helix_button.mapToGlobal(position))
-        
-    def widgets_helix(self):
-        self.helix_button = QtWidgets.QPushButton("")
-        self.helix_button.setIcon(QtGui.QIcon(":polyHelix.png"))
-        self.helix_button.setIconSize(QtCore.QSize(25, 25))
-        self.helix_button.clicked.connect(self.create_helix)
-        self.helix_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.helix_button.customContextMenuRequested.connect(self.popup_helix) 
-        
-    def create_gear(self):
-        mel.eval("CreatePolyGear;")
-        
-    def open_gearOptions(self):
-        mel.eval("CreatePolygonGearOptions;")
-        
-    def popup_gear(self, position):
-        gear_popup = QtWidgets.QMenu()
-        gear_action = QtWidgets.QAction('Settings', self)
-        gear_action.triggered.connect(self.open_gearOptions)
-        gear_popup.addAction(gear_action)
-        gear_popup.exec_(self.gear_button.mapToGlobal(position))
-        
-    def widgets_gear(self):
-        self.gear_button = QtWidgets.QPushButton("")
-        self.gear_button.setIcon(QtGui.QIcon(":polyGear.png"))
-        self.gear_button.setIconSize(QtCore.QSize(25, 25))
-        self.gear_button.clicked.connect(self.create_gear)
-        self.gear_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.gear_button.customContextMenuRequested.connect(self.popup_gear)
-        
-    def create_soccerBall(self):
-        mel.eval("CreatePolySoccerBall;")
-        
-    def open_soccerBallOptions(self):
-        mel.eval("CreatePolygonSoccerBallOptions;")
-        
-    def popup_soccerBall(self, position):
-        soccerBall_popup = QtWidgets.QMenu()
-        soccerBall_action = QtWidgets.QAction('Settings', self)
-        soccerBall_action.triggered.connect(self.open_soccerBallOptions)
-        soccerBall_popup.addAction(soccerBall_action)
-        soccerBall_popup.exec_(self.soccerBall_button.mapToGlobal(position))
-        
-    def widgets_soccerBall(self):
-        self.soccerBall_button = QtWidgets.QPushButton("")
-        self.soccerBall_button.setIcon(QtGui.QIcon(":polySoccerBall.png"))
-        self.soccerBall_button.setIconSize(QtCore.QSize(25, 25))
-        self.soccerBall_button.clicked.connect(self.create_soccerBall)
-        self.soccerBall_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.soccerBall_button.customContextMenuRequested.connect(self.popup_soccerBall)
-        
-    def create_superEllipse(self):
-        mel.eval("CreatePolygonSuperEllipse;")
-        
-    def open_superEllipseOptions(self):
-        mel.eval("CreatePolygonSuperEllipseOptions;")
-        
-    def popup_superEllipse(self, position):
-        superEllipse_popup = QtWidgets.QMenu()
-        superEllipse_action = QtWidgets.QAction('Settings', self)
-        superEllipse_action.triggered.connect(self.open_superEllipseOptions)
-        superEllipse_popup.addAction(superEllipse_action)
-        superEllipse_popup.exec_(self.superEllipse_button.mapToGlobal(position))
-        
-    def widgets_superEllipse(self):
-        self.superEllipse_button = QtWidgets.QPushButton("")
-        self.superEllipse_button.setIcon(QtGui.QIcon(":polySuperEllipse.png"))
-        self.superEllipse_button.setIconSize(QtCore.QSize(25, 25))
-        self.superEllipse_button.clicked.connect(self.create_superEllipse)
-        self.superEllipse_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.superEllipse_button.customContextMenuRequested.connect(self.popup_superEllipse)
-
-    def create_torus(self):
-        mel.eval("CreatePolygonTorus;")
-        
-    def open_torusOptions(self):
-        mel.eval("CreatePolygonTorusOptions;")
-        
-    def popup_torus(self, position):
-        torus_popup = QtWidgets.QMenu()
-        torus_action = QtWidgets.QAction('Settings', self)
-        torus_action.triggered.connect(self.open_torusOptions)
-        torus_popup.addAction(torus_action)
-        torus_popup.exec_(self.torus_button.mapToGlobal(position))
-        
-    def widgets_torus(self):
-        self.torus_button = QtWidgets.QPushButton("")
-        self.torus_button.setIcon(QtGui.QIcon(":polyTorus.png"))
-        self.torus_button.setIconSize(QtCore.QSize(25, 25))
-        self.torus_button.clicked.connect(self.create_torus)
-        self.torus_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.torus_button.customContextMenuRequested.connect(self.popup_torus) 
-        
-    def create_cone(self):
-        mel.eval("CreatePolygonCone;")
-        
-    def open_coneOptions(self):
-        mel.eval("CreatePolygonConeOptions;")
-        
-    def popup_cone(self, position):
-        cone_popup = QtWidgets.QMenu()
-        cone_action = QtWidgets.QAction('Settings', self)
-        cone_action.triggered.connect(self.open_coneOptions)
-        cone_popup.addAction(cone_action)
-        cone_popup.exec_(self.cone_button.mapToGlobal(position))
-        
-    def widgets_cone(self):
-        self.cone_button = QtWidgets.QPushButton("")
-        self.cone_button.setIcon(QtGui.QIcon(":polyCone.png"))
-        self.cone_button.setIconSize(QtCore.QSize(25, 25))
-        self.cone_button.clicked.connect(self.create_cone)
-        self.cone_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.cone_button.customContextMenuRequested.connect(self.popup_cone) 
-        
-    def create_gear(self):
-        mel.eval("CreatePolygonGear;")
-        
-    def open_gearOptions(self):
-        mel.eval("CreatePolygonGearOptions;")
-        
-    def popup_gear(self, position):
-        gear_popup = QtWidgets.QMenu()
-        gear_action = QtWidgets.QAction('Settings', self)
-        gear_action.triggered.connect(self.open_coneOptions)
-        gear_popup.addAction(gear_action)
-        gear_popup.exec_(self.gear_button.mapToGlobal(position))
-        
-    def widgets_gear(self):
-        self.gear_button = QtWidgets.QPushButton("")
-        self.gear_button.setIcon(QtGui.QIcon(":polyGear.png"))
-        self.gear_button.setIconSize(QtCore.QSize(25, 25))
-        self.gear_button.clicked.connect(self.create_gear)
-        self.gear_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.gear_button.customContextMenuRequested.connect(self.popup_gear) 
-
-    def create_platonic(self):
-        mel.eval("CreatePolygonPlatonic;")
-        
-    def open_platonicOptions(self):
-        mel.eval("CreatePolygonPlatonicOptions;")
-        
-    def popup_platonic(self, position):
-        platonic_popup = QtWidgets.QMenu()
-        platonic_action = QtWidgets.QAction('Settings', self)
-        platonic_action.triggered.connect(self.open_platonicOptions)
-        platonic_popup.addAction(platonic_action)
-        platonic_popup.exec_(self.platonic_button.mapToGlobal(position))
-        
-    def widgets_platonic(self):
-        self.platonic_button = QtWidgets.QPushButton("")
-        self.platonic_button.setIcon(QtGui.QIcon(":polyPlatonic.png"))
-        self.platonic_button.setIconSize(QtCore.QSize(25, 25))
-        self.platonic_button.clicked.connect(self.create_platonic)
-        self.platonic_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.platonic_button.customContextMenuRequested.connect(self.popup_platonic) 
-        
-        
-    def create_disc(self):
-        cmds.polyDisc()
-        
-    def create_platonicSolid(self):
-        cmds.polyPlatonicSolid()
-        
-    def create_pyramid(self):
-        cmds.polyPyramid()
-        
-    def create_pyramid(self):
-        cmds.polyPyramid()
-        
-    def create_prism(self):
-        cmds.polyPrism()
- 
-    def create_pipe(self):
-        cmds.polyPipe()       
-        
-    def create_helix(self):
-        cmds.polyHelix()  
-        
-    def create_gear(self):
-        cmds.polyGear()        
-        
-    def create_soccerBall(self):
-        cmds.polyPrimitive()   
-        
-    def create_superEllipse(self):
-        cmds.polySuperShape()
-        
-    def widgets_sphericalHarm(self):
-        self.sphericalHarm_button = QtWidgets.QPushButton("")
-        self.sphericalHarm_button.setIcon(QtGui.QIcon(":polySphericalHarmonics.png"))
-        self.sphericalHarm_button.setIconSize(QtCore.QSize(25, 25))
-        
-    def widgets_ultraShape(self):
-        self.ultraShape_button = QtWidgets.QPushButton("")
-        self.ultraShape_button.setIcon(QtGui.QIcon(":polyUltraShape.png"))
-        self.ultraShape_button.setIconSize(QtCore.QSize(25, 25))
-
-    def create_connections_primatives(self):
-        self.deleteHistory_button.clicked.connect(self.delete_history)
-        self.deleteNonDefHistory_button.clicked.connect(self.delete_nonDifHistory)
+    def perform_ringAndDelete(self):
+        self.run_on_edge_walk(EdgeLoopWalker.RING, cmds.polyCollapseEdge, "PolyConvertToRingAndCollapse;")
 
+    def perform_loopAndDelete(self):
+        self.run_on_edge_walk(EdgeLoopWalker.LOOP, partial(cmds.polyDelEdge, cleanVertices=True),
+                              "PolyConvertToLoopAndDelete;")
 
+    def perform_loopAndDuplicate(self):
+        self.run_on_edge_walk(EdgeLoopWalker.LOOP, partial(mel.eval, "performPolyDuplicateEdge 0;"),
+                              "PolyConvertToLoopAndDuplicate;")
 
-    def perform_divide(self):
-        mel.eval("SubdividePolygon;")
-        
-    def open_divideOptions(self):
-        mel.eval("SubdividePolygonOptions;")
-        
-    def popup_divide(self, position):
-        divide_popup = QtWidgets.QMenu()
-        divide_action = QtWidgets.QAction('Settings', self)
-        divide_action.triggered.connect(self.open_divideOptions)
-        divide_popup.addAction(divide_action)
-        divide_popup.exec_(self.divide_button.mapToGlobal(position))
- 
-    def widgets_divide(self):
-        self.divide_button = QtWidgets.QPushButton("Divide")
-        self.divide_button.setIcon(QtGui.QIcon(":polySubdFacet.png"))
-        self.divide_button.setIconSize(QtCore.QSize(25, 20))
-        self.divide_button.clicked.connect(self.perform_divide)
-        self.divide_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.divide_button.customContextMenuRequested.connect(self.popup_divide) 
-        
-    def perform_bevel(self):
-        mel.eval("BevelPolygon;")
-        
-    def open_bevelOptions(self):
-        mel.eval("BevelPolygonOptions")
-        
-    def popup_bevel(self, position):
-        bevel_popup = QtWidgets.QMenu()
-        bevel_action = QtWidgets.QAction('Settings', self)
-        bevel_action.triggered.connect(self.open_bevelOptions)
-        bevel_popup.addAction(bevel_action)
-        bevel_popup.exec_(self.bevel_button.mapToGlobal(position))
- 
-    def widgets_bevel(self):
-        self.bevel_button = QtWidgets.QPushButton("Bevel")
-        self.bevel_button.setIcon(QtGui.QIcon(":polyBevel.png"))
-        self.bevel_button.setIconSize(QtCore.QSize(25, 20))
-        self.bevel_button.clicked.connect(self.perform_bevel)
-        self.bevel_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.bevel_button.customContextMenuRequested.connect(self.popup_bevel) 
-        
-    def perform_bevel(self):
-        mel.eval("BevelPolygon;")
-        
-    def open_bevelOptions(self):
-        mel.eval("BevelPolygonOptions")
-        
-    def popup_bevel(self, position):
-        bevel_popup = QtWidgets.QMenu()
-        bevel_action = QtWidgets.QAction('Settings', self)
-        bevel_action.triggered.connect(self.open_bevelOptions)
-        bevel_popup.addAction(bevel_action)
-        bevel_popup.exec_(self.bevel_button.mapToGlobal(position))
- 
-    def widgets_bevel(self):
-        self.bevel_button = QtWidgets.QPushButton("Bevel")
-        self.bevel_button.setIcon(QtGui.QIcon(":polyBevel.png"))
-        self.bevel_button.setIconSize(QtCore.QSize(25, 20))
-        self.bevel_button.clicked.connect(self.perform_bevel)
-        self.bevel_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.bevel_button.customContextMenuRequested.connect(self.popup_bevel) 
-        
     def perform_bridge(self):
         try:
             mel.eval("BridgeEdge;")
@@ -1143,2105 +1226,3608 @@ class SampleUI(QtWidgets.QWidget):
         except:
             pass
 
-        
-    def open_bridgeOptions(self):
-        mel.eval("BridgeEdgeOptions;")
-        
-    def popup_bridge(self, position):
-        bridge_popup = QtWidgets.QMenu()
-        bridge_action = QtWidgets.QAction('Settings', self)
-        bridge_action.triggered.connect(self.open_bridgeOptions)
-        bridge_popup.addAction(bridge_action)
-        bridge_popup.exec_(self.bridge_button.mapToGlobal(position))
- 
-    def widgets_bridge(self):
-        self.bridge_button = QtWidgets.QPushButton("bridge")
-        self.bridge_button.setIcon(QtGui.QIcon(":polyBridge.png"))
-        self.bridge_button.setIconSize(QtCore.QSize(25, 20))
-        self.bridge_button.clicked.connect(self.perform_bridge)
-        self.bridge_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.bridge_button.customContextMenuRequested.connect(self.popup_bridge) 
-        
-    def perform_ringAndSplit(self):
-        mel.eval("PolyConvertToRingAndSplit;")
+    def get_symmetry(self):
+        return bool(cmds.symmetricModelling(query=True, symmetry=True))
 
-    def widgets_ringAndSplit(self):
-        self.ringAndSplit_button = QtWidgets.QPushButton("Ring Split")
-        self.ringAndSplit_button.setIconSize(QtCore.QSize(25, 20))
-        self.ringAndSplit_button.clicked.connect(self.perform_ringAndSplit)
-        
-    def perform_ringAndDelete(self):
-        mel.eval("PolyConvertToRingAndCollapse;")
+    def set_symmetry(self, enabled):
+        if enabled:
+            cmds.symmetricModelling(symmetry=True)
+            cmds.symmetricModelling(about='world')
+            cmds.symmetricModelling(axis='x')
+            cmds.evalDeferred(SymmetryMap.warm_selected, lowestPriority=True)
+        else:
+            cmds.symmetricModelling(symmetry=False)
+        self.state_sync.request_sync()
 
-    def widgets_ringAndDelete(self):
-        self.ringAndDelete_button = QtWidgets.QPushButton("Ring Delete")
-        self.ringAndDelete_button.setIconSize(QtCore.QSize(25, 20))
-        self.ringAndDelete_button.clicked.connect(self.perform_ringAndDelete)
-        
-    def perform_loopAndDelete(self):
-        mel.eval("PolyConvertToLoopAndDelete;;")
+    def get_camBasedSel(self):
+        return bool(cmds.selectPref(query=True, useDepth=True))
 
-    def widgets_loopAndDelete(self):
-        self.loopAndDelete_button = QtWidgets.QPushButton("Loop Delete")
-        self.loopAndDelete_button.setIconSize(QtCore.QSize(25, 20))
-        self.loopAndDelete_button.clicked.connect(self.perform_loopAndDelete)
-        
-    def perform_loopAndDuplicate(self):
-        mel.eval("PolyConvertToLoopAndDuplicate;")
+    def set_camBasedSel(self, enabled):
+        cmds.selectPref(useDepth=enabled)
+        self.state_sync.request_sync()
 
-    def widgets_loopAndDuplicate(self):
-        self.loopAndDuplicate_button = QtWidgets.QPushButton("Loop Duplicate")
-        self.loopAndDuplicate_button.setIconSize(QtCore.QSize(25, 20))
-        self.loopAndDuplicate_button.clicked.connect(self.perform_loopAndDuplicate)
-        
-        
-    def perform_detach(self):
-        mel.eval("DetachComponent;")
-
-    def widgets_detach(self):
-        self.detach_button = QtWidgets.QPushButton("Detach")
-        self.detach_button.setIcon(QtGui.QIcon(":polySplitVertex.png"))
-        self.detach_button.setIconSize(QtCore.QSize(25, 20))
-        self.detach_button.clicked.connect(self.perform_detach)
-        
-    def perform_extrude(self):
-        mel.eval("PolyExtrude;")
-        
-    def open_extrudeOptions(self):
-        mel.eval("PolyExtrudeOptions;")
-        
-    def popup_extrude(self, position):
-        extrude_popup = QtWidgets.QMenu()
-        extrude_action = QtWidgets.QAction('Settings', self)
-        extrude_action.triggered.connect(self.open_extrudeOptions)
-        extrude_popup.addAction(extrude_action)
-        extrude_popup.exec_(self.extrude_button.mapToGlobal(position))
-
-    def widgets_extrude(self):
-        self.extrude_button = QtWidgets.QPushButton("extrude")
-        self.extrude_button.setIcon(QtGui.QIcon(":polyExtrudeFacet.png"))
-        self.extrude_button.setIconSize(QtCore.QSize(25, 20))
-        self.extrude_button.clicked.connect(self.perform_extrude)
-        self.extrude_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.extrude_button.customContextMenuRequested.connect(self.popup_extrude) 
-        
-    def perform_merge(self):
-        mel.eval("PolyMerge")
-        
-    def open_mergeOptions(self):
-        mel.eval("PolyMergeOptions;")
-        
-    def popup_merge(self, position):
-        merge_popup = QtWidgets.QMenu()
-        merge_action = QtWidgets.QAction('Settings', self)
-        merge_action.triggered.connect(self.open_mergeOptions)
-        merge_popup.addAction(merge_action)
-        merge_popup.exec_(self.merge_button.mapToGlobal(position))
-
-    def widgets_merge(self):
-        self.merge_button = QtWidgets.QPushButton("Merge")
-        self.merge_button.setIcon(QtGui.QIcon(":polyMerge.png"))
-        self.merge_button.setIconSize(QtCore.QSize(25, 20))
-        self.merge_button.clicked.connect(self.perform_merge)
-        self.merge_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.merge_button.customContextMenuRequested.connect(self.popup_merge) 
-        
-    def perform_mergeToCenter(self):
-        mel.eval("MergeToCenter")
+    def set_backfaces(self, mode=None):
+        AttributeToggle.apply(cmds.ls(selection=True, long=True), "backfaceCulling", mode or AttributeToggle.INVERT)
 
-    def widgets_mergeToCenter(self):
-        self.mergeToCenter_button = QtWidgets.QPushButton("Merge2Center")
-        self.mergeToCenter_button.setIcon(QtGui.QIcon(":polyMergeToCenter.png"))
-        self.mergeToCenter_button.setIconSize(QtCore.QSize(25, 20))
-        self.mergeToCenter_button.clicked.connect(self.perform_mergeToCenter)
+    def set_backfacesOn(self):
+        self.set_backfaces(AttributeToggle.ON)
 
-    def perform_transform(self):
-        mel.eval("MovePolygonComponent;")
-        
-    def open_transformOptions(self):
-        mel.eval("MovePolygonComponentOptions;")
-        
-    def popup_transform(self, position):
-        transform_popup = QtWidgets.QMenu()
-        transform_action = QtWidgets.QAction('Settings', self)
-        transform_action.triggered.connect(self.open_transformOptions)
-        transform_popup.addAction(transform_action)
-        transform_popup.exec_(self.transform_button.mapToGlobal(position))
-
-    def widgets_transform(self):
-        self.transform_button = QtWidgets.QPushButton("transform")
-        self.transform_button.setIcon(QtGui.QIcon(":polyMoveVertex.png"))
-        self.transform_button.setIconSize(QtCore.QSize(25, 20))
-        self.transform_button.clicked.connect(self.perform_transform)
-        self.transform_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.transform_button.customContextMenuRequested.connect(self.popup_transform) 
-        
-    def perform_flip(self):
-        mel.eval("FlipMesh;")
+    def set_backfacesOff(self):
+        self.set_backfaces(AttributeToggle.OFF)
 
-    def widgets_flip(self):
-        self.flip_button = QtWidgets.QPushButton("flip")
-        self.flip_button.setIcon(QtGui.QIcon(":polyFlip.png"))
-        self.flip_button.setIconSize(QtCore.QSize(25, 20))
-        self.flip_button.clicked.connect(self.perform_flip)
-        
-    def perform_symmetrize(self):
-        mel.eval("Symmetrize")
+    def set_faceTriangles(self, mode=None):
+        AttributeToggle.apply(cmds.ls(selection=True, long=True), "template", mode or AttributeToggle.INVERT)
 
-    def widgets_symmetrize(self):
-        self.symmetrize_button = QtWidgets.QPushButton("symmetrize")
-        self.symmetrize_button.setIcon(QtGui.QIcon(":symmetrize.png"))
-        self.symmetrize_button.setIconSize(QtCore.QSize(25, 20))
-        self.symmetrize_button.clicked.connect(self.perform_symmetrize)
-        
-    def perform_averageVert(self):
-        mel.eval("AverageVertex;")
-        
-    def open_averageVertOptions(self):
-        mel.eval("AverageVertexOptions;")
-        
-    def popup_averageVert(self, position):
-        averageVert_popup = QtWidgets.QMenu()
-        averageVert_action = QtWidgets.QAction('Settings', self)
-        averageVert_action.triggered.connect(self.open_averageVertOptions)
-        averageVert_popup.addAction(averageVert_action)
-        averageVert_popup.exec_(self.averageVert_button.mapToGlobal(position))
-
-    def widgets_averageVert(self):
-        self.averageVert_button = QtWidgets.QPushButton("Average")
-        self.averageVert_button.setIcon(QtGui.QIcon(":polyAverageVertex.png"))
-        self.averageVert_button.setIconSize(QtCore.QSize(25, 20))
-        self.averageVert_button.clicked.connect(self.perform_averageVert)
-        self.averageVert_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.averageVert_button.customContextMenuRequested.connect(self.popup_averageVert) 
-        
-    def perform_chamfer(self):
-        mel.eval("ChamferVertex;")
-        
-    def open_chamferOptions(self):
-        mel.eval("ChamferVertexOptions;")
-        
-    def popup_chamfer(self, position):
-        chamfer_popup = QtWidgets.QMenu()
-        chamfer_action = QtWidgets.QAction('Settings', self)
-        chamfer_action.triggered.connect(self.open_chamferOptions)
-        chamfer_popup.addAction(chamfer_action)
-        chamfer_popup.exec_(self.chamfer_button.mapToGlobal(position))
-
-    def widgets_chamfer(self):
-        self.chamfer_button = QtWidgets.QPushButton("Chamfer")
-        self.chamfer_button.setIcon(QtGui.QIcon(":polyChamfer.png"))
-        self.chamfer_button.setIconSize(QtCore.QSize(25, 20))
-        self.chamfer_button.clicked.connect(self.perform_chamfer)
-        self.chamfer_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.chamfer_button.customContextMenuRequested.connect(self.popup_chamfer) 
-        
-    def perform_reorder(self):
-        mel.eval("ReorderVertex;")
-
-    def widgets_reorder(self):
-        self.reorder_button = QtWidgets.QPushButton("Reorder")
-        self.reorder_button.setIcon(QtGui.QIcon(":reorderIDs.png"))
-        self.reorder_button.setIconSize(QtCore.QSize(25, 20))
-        self.reorder_button.clicked.connect(self.perform_reorder)
-        
-    def perform_delEdge(self):
-        mel.eval("DeletePolyElements;")
-
-    def widgets_delEdge(self):
-        self.delEdge_button = QtWidgets.QPushButton("Delete Edge")
-        self.delEdge_button.setIcon(QtGui.QIcon(":polyDelEdgeVertex.png"))
-        self.delEdge_button.setIconSize(QtCore.QSize(25, 20))
-        self.delEdge_button.clicked.connect(self.perform_delEdge)
-        
-    def perform_edgeFlow(self):
-        mel.eval("PolyEditEdgeFlow;")
-        
-    def open_edgeFlowOptions(self):
-        mel.eval("PolyEditEdgeFlowOptions;")
-        
-    def popup_edgeFlow(self, position):
-        edgeFlow_popup = QtWidgets.QMenu()
-        edgeFlow_action = QtWidgets.QAction('Settings', self)
-        edgeFlow_action.triggered.connect(self.open_edgeFlowOptions)
-        edgeFlow_popup.addAction(edgeFlow_action)
-        edgeFlow_popup.exec_(self.edgeFlow_button.mapToGlobal(position))
-
-    def widgets_edgeFlow(self):
-        self.edgeFlow_button = QtWidgets.QPushButton("Edge Flow")
-        self.edgeFlow_button.setIcon(QtGui.QIcon(":polyEditEdgeFlow.png"))
-        self.edgeFlow_button.setIconSize(QtCore.QSize(25, 20))
-        self.edgeFlow_button.clicked.connect(self.perform_edgeFlow)
-        self.edgeFlow_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.edgeFlow_button.customContextMenuRequested.connect(self.popup_edgeFlow) 
-        
-    def perform_flipEdge(self):
-        mel.eval("FlipTriangleEdge;")
-        
-    def widgets_flipEdge(self):
-        self.flipEdge_button = QtWidgets.QPushButton("Flip Edge")
-        self.flipEdge_button.setIcon(QtGui.QIcon(":polyFlipEdge.png"))
-        self.flipEdge_button.setIconSize(QtCore.QSize(25, 20))
-        self.flipEdge_button.clicked.connect(self.perform_flipEdge)
-        
-    def perform_circularize(self):
-        mel.eval("PolyCircularize;")
-        
-    def open_circularizeOptions(self):
-        mel.eval("PolyCircularizeOptions;")
-        
-    def popup_circularize(self, position):
-        circularize_popup = QtWidgets.QMenu()
-        circularize_action = QtWidgets.QAction('Settings', self)
-        circularize_action.triggered.connect(self.open_circularizeOptions)
-        circularize_popup.addAction(circularize_action)
-        circularize_popup.exec_(self.circularize_button.mapToGlobal(position))
-
-    def widgets_circularize(self):
-        self.circularize_button = QtWidgets.QPushButton("Circularize")
-        self.circularize_button.setIcon(QtGui.QIcon(":polyCircularize.png"))
-        self.circularize_button.setIconSize(QtCore.QSize(25, 20))
-        self.circularize_button.clicked.connect(self.perform_circularize)
-        self.circularize_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.circularize_button.customContextMenuRequested.connect(self.popup_circularize) 
-        
-    def perform_collapseEdge(self):
-        mel.eval("performPolyCollapse 0;")
-
-    def widgets_collapseEdge(self):
-        self.collapseEdge_button = QtWidgets.QPushButton("Collapse")
-        self.collapseEdge_button.setIcon(QtGui.QIcon(":polyCollapseEdge.png"))
-        self.collapseEdge_button.setIconSize(QtCore.QSize(25, 20))
-        self.collapseEdge_button.clicked.connect(self.perform_collapseEdge)
-
-    def perform_spinEdgeBackward(self):
-        mel.eval("PolySpinEdgeBackward;")
-
-    def widgets_spinEdgeBackward(self):
-        self.spinEdgeBackward_button = QtWidgets.QPushButton("Collapse")
-        self.spinEdgeBackward_button.setIcon(QtGui.QIcon(":polySpinEdgeBackward.png"))
-        self.spinEdgeBackward_button.setIconSize(QtCore.QSize(25, 20))
-        self.spinEdgeBackward_button.clicked.connect(self.perform_spinEdgeBackward)
-        
-    def perform_spinEdgeForward(self):
-        mel.eval("PolySpinEdgeForward;")
-
-    def widgets_spinEdgeForward(self):
-        self.spinEdgeForward_button = QtWidgets.QPushButton("Collapse")
-        self.spinEdgeForward_button.setIcon(QtGui.QIcon(":polySpinEdgeForward.png"))
-        self.spinEdgeForward_button.setIconSize(QtCore.QSize(25, 20))
-        self.spinEdgeForward_button.clicked.connect(self.perform_spinEdgeForward)
-        
-    def perform_invisibleFace(self):
-        mel.eval("PolyAssignSubdivHole;")
-        
-    def open_invisibleFaceOptions(self):
-        mel.eval("PolyAssignSubdivHoleOptions;")
-        
-    def popup_invisibleFace(self, position):
-        invisibleFace_popup = QtWidgets.QMenu()
-        invisibleFace_action = QtWidgets.QAction('Settings', self)
-        invisibleFace_action.triggered.connect(self.open_invisibleFaceOptions)
-        invisibleFace_popup.addAction(invisibleFace_action)
-        invisibleFace_popup.exec_(self.invisibleFace_button.mapToGlobal(position))
-
-    def widgets_invisibleFace(self):
-        self.invisibleFace_button = QtWidgets.QPushButton("Invisible Face")
-        self.invisibleFace_button.setIcon(QtGui.QIcon(":polyAssignSubdivHole.png"))
-        self.invisibleFace_button.setIconSize(QtCore.QSize(25, 20))
-        self.invisibleFace_button.clicked.connect(self.perform_invisibleFace)
-        self.invisibleFace_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.invisibleFace_button.customContextMenuRequested.connect(self.popup_invisibleFace) 
-
-    def perform_duplicateFacet(self):
-        mel.eval("performPolyChipOff 0 1;")
-        
-    def open_duplicateFacetOptions(self):
-        mel.eval("DuplicateFaceOptions;")
-        
-    def popup_duplicateFacet(self, position):
-        duplicateFacet_popup = QtWidgets.QMenu()
-        duplicateFacet_action = QtWidgets.QAction('Settings', self)
-        duplicateFacet_action.triggered.connect(self.open_duplicateFacetOptions)
-        duplicateFacet_popup.addAction(duplicateFacet_action)
-        duplicateFacet_popup.exec_(self.duplicateFacet_button.mapToGlobal(position))
-
-    def widgets_duplicateFacet(self):
-        self.duplicateFacet_button = QtWidgets.QPushButton("Duplicate")
-        self.duplicateFacet_button.setIcon(QtGui.QIcon(":polyDuplicateFacet.png"))
-        self.duplicateFacet_button.setIconSize(QtCore.QSize(25, 20))
-        self.duplicateFacet_button.clicked.connect(self.perform_duplicateFacet)
-        self.duplicateFacet_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.duplicateFacet_button.customContextMenuRequested.connect(self.popup_duplicateFacet) 
-        
-    def perform_extract(self):
-        mel.eval("performPolyChipOff 0 0")
-        
-    def open_extractOptions(self):
-        mel.eval("ExtractFaceOptions;")
-        
-    def popup_extract(self, position):
-        extract_popup = QtWidgets.QMenu()
-        extract_action = QtWidgets.QAction('Settings', self)
-        extract_action.triggered.connect(self.open_extractOptions)
-        extract_popup.addAction(extract_action)
-        extract_popup.exec_(self.extract_button.mapToGlobal(position))
-
-    def widgets_extract(self):
-        self.extract_button = QtWidgets.QPushButton("extract")
-        self.extract_button.setIcon(QtGui.QIcon(":polyChipOff.png"))
-        self.extract_button.setIconSize(QtCore.QSize(25, 20))
-        self.extract_button.clicked.connect(self.perform_extract)
-        self.extract_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.extract_button.customContextMenuRequested.connect(self.popup_extract) 
-        
-    def perform_poke(self):
-        mel.eval("PokePolygon")
-        
-    def open_pokeOptions(self):
-        mel.eval("PokePolygonOptions;")
-        
-    def popup_poke(self, position):
-        poke_popup = QtWidgets.QMenu()
-        poke_action = QtWidgets.QAction('Settings', self)
-        poke_action.triggered.connect(self.open_pokeOptions)
-        poke_popup.addAction(poke_action)
-        poke_popup.exec_(self.poke_button.mapToGlobal(position))
-
-    def widgets_poke(self):
-        self.poke_button = QtWidgets.QPushButton("poke")
-        self.poke_button.setIcon(QtGui.QIcon(":polyPoke.png"))
-        self.poke_button.setIconSize(QtCore.QSize(25, 20))
-        self.poke_button.clicked.connect(self.perform_poke)
-        self.poke_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.poke_button.customContextMenuRequested.connect(self.popup_poke) 
-        
-    def perform_wedge(self):
-        mel.eval("WedgePolygon;")
-        
-    def open_wedgeOptions(self):
-        mel.eval("WedgePolygonOptions;")
-        
-    def popup_wedge(self, position):
-        wedge_popup = QtWidgets.QMenu()
-        wedge_action = QtWidgets.QAction('Settings', self)
-        wedge_action.triggered.connect(self.open_wedgeOptions)
-        wedge_popup.addAction(wedge_action)
-        wedge_popup.exec_(self.wedge_button.mapToGlobal(position))
-
-    def widgets_wedge(self):
-        self.wedge_button = QtWidgets.QPushButton("Wedge")
-        self.wedge_button.setIcon(QtGui.QIcon(":polyWedgeFace.png"))
-        self.wedge_button.setIconSize(QtCore.QSize(25, 20))
-        self.wedge_button.clicked.connect(self.perform_wedge)
-        self.wedge_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.wedge_button.customContextMenuRequested.connect(self.popup_wedge) 
-        
-    def perform_projectCurve(self):
-        mel.eval("ProjectCurveOnMesh;")
-        
-    def open_projectCurveOptions(self):
-        mel.eval("ProjectCurveOnMeshOptions;")
-        
-    def popup_projectCurve(self, position):
-        projectCurve_popup = QtWidgets.QMenu()
-        projectCurve_action = QtWidgets.QAction('Settings', self)
-        projectCurve_action.triggered.connect(self.open_projectCurveOptions)
-        projectCurve_popup.addAction(projectCurve_action)
-        projectCurve_popup.exec_(self.projectCurve_button.mapToGlobal(position))
-
-    def widgets_projectCurve(self):
-        self.projectCurve_button = QtWidgets.QPushButton("Project Curve")
-        self.projectCurve_button.setIcon(QtGui.QIcon(":projectCurve_Poly.png"))
-        self.projectCurve_button.setIconSize(QtCore.QSize(25, 20))
-        self.projectCurve_button.clicked.connect(self.perform_projectCurve)
-        self.projectCurve_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.projectCurve_button.customContextMenuRequested.connect(self.popup_projectCurve) 
-        
-    def perform_curveSplit(self):
-        mel.eval("SplitMeshWithProjectedCurve")
-        
-    def open_curveSplitOptions(self):
-        mel.eval("SplitMeshWithProjectedCurveOptions;")
-        
-    def popup_curveSplit(self, position):
-        curveSplit_popup = QtWidgets.QMenu()
-        curveSplit_action = QtWidgets.QAction('Settings', self)
-        curveSplit_action.triggered.connect(self.open_curveSplitOptions)
-        curveSplit_popup.addAction(curveSplit_action)
-        curveSplit_popup.exec_(self.curveSplit_button.mapToGlobal(position))
-
-    def widgets_curveSplit(self):
-        self.curveSplit_button = QtWidgets.QPushButton("curveSplit")
-        self.curveSplit_button.setIcon(QtGui.QIcon(":projectCurveSplit_Poly.png"))
-        self.curveSplit_button.setIconSize(QtCore.QSize(25, 20))
-        self.curveSplit_button.clicked.connect(self.perform_curveSplit)
-        self.curveSplit_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.curveSplit_button.customContextMenuRequested.connect(self.popup_curveSplit) 
-        
-    def perform_appendFacet(self):
-        mel.eval("setToolTo polyAppendFacetContext ; polyAppendFacetCtx -e -pc `optionVar -q polyKeepFacetsPlanar` polyAppendFacetContext;")
-        
-    def open_appendFacetOptions(self):
-        mel.eval("setToolTo polyAppendFacetContext ; polyAppendFacetCtx -e -pc `optionVar -q polyKeepFacetsPlanar` polyAppendFacetContext; toolPropertyWindow;")
-        
-    def popup_appendFacet(self, position):
-        appendFacet_popup = QtWidgets.QMenu()
-        appendFacet_action = QtWidgets.QAction('Settings', self)
-        appendFacet_action.triggered.connect(self.open_appendFacetOptions)
-        appendFacet_popup.addAction(appendFacet_action)
-        appendFacet_popup.exec_(self.appendFacet_button.mapToGlobal(position))
-
-    def widgets_appendFacet(self):
-        self.appendFacet_button = QtWidgets.QPushButton("Append")
-        self.appendFacet_button.setIcon(QtGui.QIcon(":polyAppendFacet.png"))
-        self.appendFacet_button.setIconSize(QtCore.QSize(25, 20))
-        self.appendFacet_button.clicked.connect(self.perform_appendFacet)
-        self.appendFacet_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.appendFacet_button.customContextMenuRequested.connect(self.popup_appendFacet) 
-        
-    def perform_connect(self):
-        mel.eval("EnterConnectTool;")
-        
-    def open_connectOptions(self):
-        mel.eval("dR_connectTool; toolPropertyWindow;")
-        
-    def popup_connect(self, position):
-        connect_popup = QtWidgets.QMenu()
-        connect_action = QtWidgets.QAction('Settings', self)
-        connect_action.triggered.connect(self.open_connectOptions)
-        connect_popup.addAction(connect_action)
-        connect_popup.exec_(self.connect_button.mapToGlobal(position))
-
-    def widgets_connect(self):
-        self.connect_button = QtWidgets.QPushButton("connect")
-        self.connect_button.setIcon(QtGui.QIcon(":connect_NEX32.png"))
-        self.connect_button.setIconSize(QtCore.QSize(25, 20))
-        self.connect_button.clicked.connect(self.perform_connect)
-        self.connect_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.connect_button.customContextMenuRequested.connect(self.popup_connect) 
-        
-    def perform_crease(self):
-        mel.eval("PolyCreaseTool;")
-        
-    def open_creaseOptions(self):
-        mel.eval("PolyCreaseToolOptions;")
-        
-    def popup_crease(self, position):
-        crease_popup = QtWidgets.QMenu()
-        crease_action = QtWidgets.QAction('Settings', self)
-        crease_action.triggered.connect(self.open_creaseOptions)
-        crease_popup.addAction(crease_action)
-        crease_popup.exec_(self.crease_button.mapToGlobal(position))
-
-    def widgets_crease(self):
-        self.crease_button = QtWidgets.QPushButton("crease")
-        self.crease_button.setIcon(QtGui.QIcon(":polyCrease.png"))
-        self.crease_button.setIconSize(QtCore.QSize(25, 20))
-        self.crease_button.clicked.connect(self.perform_crease)
-        self.crease_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.crease_button.customContextMenuRequested.connect(self.popup_crease) 
-        
-    def perform_createPoly(self):
-        mel.eval("setToolTo polyCreateFacetContext ; polyCreateFacetCtx -e -pc `optionVar -q polyKeepFacetsPlanar` polyCreateFacetContext;")
-        
-    def open_createPolyOptions(self):
-        mel.eval("setToolTo polyCreateFacetContext ; polyCreateFacetCtx -e -pc `optionVar -q polyKeepFacetsPlanar` polyCreateFacetContext; toolPropertyWindow;")
-        
-    def popup_createPoly(self, position):
-        createPoly_popup = QtWidgets.QMenu()
-        createPoly_action = QtWidgets.QAction('Settings', self)
-        createPoly_action.triggered.connect(self.open_createPolyOptions)
-        createPoly_popup.addAction(createPoly_action)
-        createPoly_popup.exec_(self.createPoly_button.mapToGlobal(position))
-
-    def widgets_createPoly(self):
-        self.createPoly_button = QtWidgets.QPushButton("createPoly")
-        self.createPoly_button.setIcon(QtGui.QIcon(":polyCreateFacet.png"))
-        self.createPoly_button.setIconSize(QtCore.QSize(25, 20))
-        self.createPoly_button.clicked.connect(self.perform_createPoly)
-        self.createPoly_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.createPoly_button.customContextMenuRequested.connect(self.popup_createPoly) 
-        
-    def perform_insertEdge(self):
-        mel.eval("SplitEdgeRingTool;")
-        
-    def open_insertEdgeOptions(self):
-        mel.eval("InsertEdgeLoopToolOptions;")
-        
-    def popup_insertEdge(self, position):
-        insertEdge_popup = QtWidgets.QMenu()
-        insertEdge_action = QtWidgets.QAction('Settings', self)
-        insertEdge_action.triggered.connect(self.open_insertEdgeOptions)
-        insertEdge_popup.addAction(insertEdge_action)
-        insertEdge_popup.exec_(self.insertEdge_button.mapToGlobal(position))
-
-    def widgets_insertEdge(self):
-        self.insertEdge_button = QtWidgets.QPushButton("insertEdge")
-        self.insertEdge_button.setIcon(QtGui.QIcon(":polySplitEdgeRing.png"))
-        self.insertEdge_button.setIconSize(QtCore.QSize(25, 20))
-        self.insertEdge_button.clicked.connect(self.perform_insertEdge)
-        self.insertEdge_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.insertEdge_button.customContextMenuRequested.connect(self.popup_insertEdge) 
-        
-    def perform_makeHole(self):
-        mel.eval("MakeHoleTool;")
-        
-    def open_makeHoleOptions(self):
-        mel.eval("MakeHoleToolOptions")
-        
-    def popup_makeHole(self, position):
-        makeHole_popup = QtWidgets.QMenu()
-        makeHole_action = QtWidgets.QAction('Settings', self)
-        makeHole_action.triggered.connect(self.open_makeHoleOptions)
-        makeHole_popup.addAction(makeHole_action)
-        makeHole_popup.exec_(self.makeHole_button.mapToGlobal(position))
-
-    def widgets_makeHole(self):
-        self.makeHole_button = QtWidgets.QPushButton("Make Hole")
-        self.makeHole_button.setIcon(QtGui.QIcon(":polyMergeFacet.png"))
-        self.makeHole_button.setIconSize(QtCore.QSize(25, 20))
-        self.makeHole_button.clicked.connect(self.perform_makeHole)
-        self.makeHole_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.makeHole_button.customContextMenuRequested.connect(self.popup_makeHole) 
-        
-    def perform_multiCut(self):
-        mel.eval("MultiCutTool;")
-        
-    def open_multiCutOptions(self):
-        mel.eval("dR_multiCutTool; toolPropertyWindow;")
-        
-    def popup_multiCut(self, position):
-        multiCut_popup = QtWidgets.QMenu()
-        multiCut_action = QtWidgets.QAction('Settings', self)
-        multiCut_action.triggered.connect(self.open_multiCutOptions)
-        multiCut_popup.addAction(multiCut_action)
-        multiCut_popup.exec_(self.multiCut_button.mapToGlobal(position))
-
-    def widgets_multiCut(self):
-        self.multiCut_button = QtWidgets.QPushButton("multiCut")
-        self.multiCut_button.setIcon(QtGui.QIcon(":multiCut_NEX32.png"))
-        self.multiCut_button.setIconSize(QtCore.QSize(25, 20))
-        self.multiCut_button.clicked.connect(self.perform_multiCut)
-        self.multiCut_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.multiCut_button.customContextMenuRequested.connect(self.popup_multiCut) 
-        
-    def perform_offsetEdge(self):
-        mel.eval("performPolyDuplicateEdge 0;")
-        
-    def open_offsetEdgeOptions(self):
-        mel.eval("DuplicateEdgesOptions;")
-        
-    def popup_offsetEdge(self, position):
-        offsetEdge_popup = QtWidgets.QMenu()
-        offsetEdge_action = QtWidgets.QAction('Settings', self)
-        offsetEdge_action.triggered.connect(self.open_offsetEdgeOptions)
-        offsetEdge_popup.addAction(offsetEdge_action)
-        offsetEdge_popup.exec_(self.offsetEdge_button.mapToGlobal(position))
-
-    def widgets_offsetEdge(self):
-        self.offsetEdge_button = QtWidgets.QPushButton("offsetEdge")
-        self.offsetEdge_button.setIcon(QtGui.QIcon(":polyDuplicateEdgeLoop.png"))
-        self.offsetEdge_button.setIconSize(QtCore.QSize(25, 20))
-        self.offsetEdge_button.clicked.connect(self.perform_offsetEdge)
-        self.offsetEdge_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.offsetEdge_button.customContextMenuRequested.connect(self.popup_offsetEdge) 
-        
-    def perform_paintReduceWeights(self):
-        mel.eval("PaintReduceWeightsTool;")
-        
-    def open_paintReduceWeightsOptions(self):
-        mel.eval("PaintReduceWeightsToolOptions;")
-        
-    def popup_paintReduceWeights(self, position):
-        paintReduceWeights_popup = QtWidgets.QMenu()
-        paintReduceWeights_action = QtWidgets.QAction('Settings', self)
-        paintReduceWeights_action.triggered.connect(self.open_paintReduceWeightsOptions)
-        paintReduceWeights_popup.addAction(paintReduceWeights_action)
-        paintReduceWeights_popup.exec_(self.paintReduceWeights_button.mapToGlobal(position))
-
-    def widgets_paintReduceWeights(self):
-        self.paintReduceWeights_button = QtWidgets.QPushButton("paintReduceWeights")
-        self.paintReduceWeights_button.setIcon(QtGui.QIcon(":polyPaintReduceWeights.png"))
-        self.paintReduceWeights_button.setIconSize(QtCore.QSize(25, 20))
-        self.paintReduceWeights_button.clicked.connect(self.perform_paintReduceWeights)
-        self.paintReduceWeights_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.paintReduceWeights_button.customContextMenuRequested.connect(self.popup_paintReduceWeights) 
-        
-    def perform_paintTransferWeights(self):
-        mel.eval("PaintTransferAttributes;")
-        
-    def open_paintTransferWeightsOptions(self):
-        mel.eval("PaintTransferAttributesOptions;")
-        
-    def popup_paintTransferWeights(self, position):
-        paintTransferWeights_popup = QtWidgets.QMenu()
-        paintTransferWeights_action = QtWidgets.QAction('Settings', self)
-        paintTransferWeights_action.triggered.connect(self.open_paintTransferWeightsOptions)
-        paintTransferWeights_popup.addAction(paintTransferWeights_action)
-        paintTransferWeights_popup.exec_(self.paintTransferWeights_button.mapToGlobal(position))
-
-    def widgets_paintTransferWeights(self):
-        self.paintTransferWeights_button = QtWidgets.QPushButton("Transfer Weights")
-        self.paintTransferWeights_button.setIcon(QtGui.QIcon(":polyTransferAttributesWeights.png"))
-        self.paintTransferWeights_button.setIconSize(QtCore.QSize(25, 20))
-        self.paintTransferWeights_button.clicked.connect(self.perform_paintTransferWeights)
-        self.paintTransferWeights_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.paintTransferWeights_button.customContextMenuRequested.connect(self.popup_paintTransferWeights) 
-        
-    def perform_quadDraw(self):
-        mel.eval('displaySmoothness -divisionsU 0 -divisionsV 0 -pointsWire 4 -pointsShaded 1 -polygonObject 1;')
-        mel.eval("QuadDrawTool;")
-        
-    def open_quadDrawOptions(self):
-        mel.eval("dR_quadDrawTool; toolPropertyWindow;")
-        
-    def popup_quadDraw(self, position):
-        quadDraw_popup = QtWidgets.QMenu()
-        quadDraw_action = QtWidgets.QAction('Settings', self)
-        quadDraw_action.triggered.connect(self.open_quadDrawOptions)
-        quadDraw_popup.addAction(quadDraw_action)
-        quadDraw_popup.exec_(self.quadDraw_button.mapToGlobal(position))
-
-    def widgets_quadDraw(self):
-        self.quadDraw_button = QtWidgets.QPushButton("Quad Draw")
-        self.quadDraw_button.setIcon(QtGui.QIcon(":quadDraw_NEX32.png"))
-        self.quadDraw_button.setIconSize(QtCore.QSize(25, 20))
-        self.quadDraw_button.clicked.connect(self.perform_quadDraw)
-        self.quadDraw_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.quadDraw_button.customContextMenuRequested.connect(self.popup_quadDraw) 
-        
-    def perform_slideEdge(self):
-        mel.eval("SlideEdgeTool;")
-        
-    def open_slideEdgeOptions(self):
-        mel.eval("SlideEdgeToolOptions;")
-        
-    def popup_slideEdge(self, position):
-        slideEdge_popup = QtWidgets.QMenu()
-        slideEdge_action = QtWidgets.QAction('Settings', self)
-        slideEdge_action.triggered.connect(self.open_slideEdgeOptions)
-        slideEdge_popup.addAction(slideEdge_action)
-        slideEdge_popup.exec_(self.slideEdge_button.mapToGlobal(position))
-
-    def widgets_slideEdge(self):
-        self.slideEdge_button = QtWidgets.QPushButton("Slide Edge")
-        self.slideEdge_button.setIcon(QtGui.QIcon(":slideEdgeTool.png"))
-        self.slideEdge_button.setIconSize(QtCore.QSize(25, 20))
-        self.slideEdge_button.clicked.connect(self.perform_slideEdge)
-        self.slideEdge_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.slideEdge_button.customContextMenuRequested.connect(self.popup_slideEdge) 
-        
-    def perform_targetWeld(self):
-        mel.eval("MergeVertexTool;")
-        
-    def open_targetWeldOptions(self):
-        mel.eval("MergeVertexToolOptions;")
-        
-    def popup_targetWeld(self, position):
-        targetWeld_popup = QtWidgets.QMenu()
-        targetWeld_action = QtWidgets.QAction('Settings', self)
-        targetWeld_action.triggered.connect(self.open_targetWeldOptions)
-        targetWeld_popup.addAction(targetWeld_action)
-        targetWeld_popup.exec_(self.targetWeld_button.mapToGlobal(position))
-
-    def widgets_targetWeld(self):
-        self.targetWeld_button = QtWidgets.QPushButton("targetWeld")
-        self.targetWeld_button.setIcon(QtGui.QIcon(":weld_NEX32.png"))
-        self.targetWeld_button.setIconSize(QtCore.QSize(25, 20))
-        self.targetWeld_button.clicked.connect(self.perform_targetWeld)
-        self.targetWeld_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.targetWeld_button.customContextMenuRequested.connect(self.popup_targetWeld) 
-        
-    def perform_union(self):
-        mel.eval("PolygonBooleanUnion;")
-        
-    def open_unionOptions(self):
-        mel.eval("PolygonBooleanUnionOptions;")
-        
-    def popup_union(self, position):
-        union_popup = QtWidgets.QMenu()
-        union_action = QtWidgets.QAction('Settings', self)
-        union_action.triggered.connect(self.open_unionOptions)
-        union_popup.addAction(union_action)
-        union_popup.exec_(self.union_button.mapToGlobal(position))
-
-    def widgets_union(self):
-        self.union_button = QtWidgets.QPushButton("Union")
-        self.union_button.setIcon(QtGui.QIcon(":polyBooleansUnion.png"))
-        self.union_button.setIconSize(QtCore.QSize(25, 20))
-        self.union_button.clicked.connect(self.perform_union)
-        self.union_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.union_button.customContextMenuRequested.connect(self.popup_union) 
-        
-    def perform_difference(self):
-        mel.eval("PolygonBooleanDifference;")
-        
-    def open_differenceOptions(self):
-        mel.eval("PolygonBooleanDifferenceOptions;")
-        
-    def popup_difference(self, position):
-        difference_popup = QtWidgets.QMenu()
-        difference_action = QtWidgets.QAction('Settings', self)
-        difference_action.triggered.connect(self.open_differenceOptions)
-        difference_popup.addAction(difference_action)
-        difference_popup.exec_(self.difference_button.mapToGlobal(position))
-
-    def widgets_difference(self):
-        self.difference_button = QtWidgets.QPushButton("difference")
-        self.difference_button.setIcon(QtGui.QIcon(":polyBooleansDifference.png"))
-        self.difference_button.setIconSize(QtCore.QSize(25, 20))
-        self.difference_button.clicked.connect(self.perform_difference)
-        self.difference_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.difference_button.customContextMenuRequested.connect(self.popup_difference)
-        
-    def perform_difference(self):
-        mel.eval("PolygonBooleanIntersection;")
-        
-    def open_differenceOptions(self):
-        mel.eval("PolygonBooleanIntersectionOptions;")
-        
-    def popup_difference(self, position):
-        difference_popup = QtWidgets.QMenu()
-        difference_action = QtWidgets.QAction('Settings', self)
-        difference_action.triggered.connect(self.open_differenceOptions)
-        difference_popup.addAction(difference_action)
-        difference_popup.exec_(self.difference_button.mapToGlobal(position))
-
-    def widgets_difference(self):
-        self.difference_button = QtWidgets.QPushButton("difference")
-        self.difference_button.setIcon(QtGui.QIcon(":polyBooleansIntersection.png"))
-        self.difference_button.setIconSize(QtCore.QSize(25, 20))
-        self.difference_button.clicked.connect(self.perform_difference)
-        self.difference_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.difference_button.customContextMenuRequested.connect(self.popup_difference) 
-        
-    def perform_intersection(self):
-        mel.eval("PolygonBooleanIntersection;")
-        
-    def open_intersectionOptions(self):
-        mel.eval("PolygonBooleanIntersectionOptions;")
-        
-    def popup_intersection(self, position):
-        intersection_popup = QtWidgets.QMenu()
-        intersection_action = QtWidgets.QAction('Settings', self)
-        intersection_action.triggered.connect(self.open_intersectionOptions)
-        intersection_popup.addAction(intersection_action)
-        intersection_popup.exec_(self.intersection_button.mapToGlobal(position))
-
-    def widgets_intersection(self):
-        self.intersection_button = QtWidgets.QPushButton("intersection")
-        self.intersection_button.setIcon(QtGui.QIcon(":polyBooleansIntersection.png"))
-        self.intersection_button.setIconSize(QtCore.QSize(25, 20))
-        self.intersection_button.clicked.connect(self.perform_intersection)
-        self.intersection_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.intersection_button.customContextMenuRequested.connect(self.popup_intersection) 
-        
-    def perform_combine(self):
-        mel.eval("polyPerformAction polyUnite o 0;")
-        
-    def open_combineOptions(self):
-        mel.eval("PolyUniteOptions;")
-        
-    def popup_combine(self, position):
-        combine_popup = QtWidgets.QMenu()
-        combine_action = QtWidgets.QAction('Settings', self)
-        combine_action.triggered.connect(self.open_combineOptions)
-        combine_popup.addAction(combine_action)
-        combine_popup.exec_(self.combine_button.mapToGlobal(position))
-
-    def widgets_combine(self):
-        self.combine_button = QtWidgets.QPushButton("combine")
-        self.combine_button.setIcon(QtGui.QIcon(":polyUnite.png"))
-        self.combine_button.setIconSize(QtCore.QSize(25, 20))
-        self.combine_button.clicked.connect(self.perform_combine)
-        self.combine_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.combine_button.customContextMenuRequested.connect(self.popup_combine) 
-        
-    def perform_separate(self):
-        mel.eval("SeparatePolygon;")
-        
-    def open_separateOptions(self):
-        mel.eval("SeparatePolygonOptions;")
-        
-    def popup_separate(self, position):
-        separate_popup = QtWidgets.QMenu()
-        separate_action = QtWidgets.QAction('Settings', self)
-        separate_action.triggered.connect(self.open_separateOptions)
-        separate_popup.addAction(separate_action)
-        separate_popup.exec_(self.separate_button.mapToGlobal(position))
-
-    def widgets_separate(self):
-        self.separate_button = QtWidgets.QPushButton("separate")
-        self.separate_button.setIcon(QtGui.QIcon(":polySeparate.png"))
-        self.separate_button.setIconSize(QtCore.QSize(25, 20))
-        self.separate_button.clicked.connect(self.perform_separate)
-        self.separate_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.separate_button.customContextMenuRequested.connect(self.popup_separate) 
-        
-    def perform_fillHole(self):
-        mel.eval("FillHole")
-        
-    def open_fillHoleOptions(self):
-        mel.eval("FillHoleOptions;")
-        
-    def popup_fillHole(self, position):
-        fillHole_popup = QtWidgets.QMenu()
-        fillHole_action = QtWidgets.QAction('Settings', self)
-        fillHole_action.triggered.connect(self.open_fillHoleOptions)
-        fillHole_popup.addAction(fillHole_action)
-        fillHole_popup.exec_(self.fillHole_button.mapToGlobal(position))
-
-    def widgets_fillHole(self):
-        self.fillHole_button = QtWidgets.QPushButton("Fill Hole")
-        self.fillHole_button.setIcon(QtGui.QIcon(":polyCloseBorder.png"))
-        self.fillHole_button.setIconSize(QtCore.QSize(25, 20))
-        self.fillHole_button.clicked.connect(self.perform_fillHole)
-        self.fillHole_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.fillHole_button.customContextMenuRequested.connect(self.popup_fillHole) 
-        
-    def perform_reduce(self):
-        mel.eval('performPolyReduce;')
-        
-    def open_reduceOptions(self):
-        mel.eval("performPolyReduce 1;")
-        
-    def popup_reduce(self, position):
-        reduce_popup = QtWidgets.QMenu()
-        reduce_action = QtWidgets.QAction('Settings', self)
-        reduce_action.triggered.connect(self.open_reduceOptions)
-        reduce_popup.addAction(reduce_action)
-        reduce_popup.exec_(self.reduce_button.mapToGlobal(position))
-
-    def widgets_reduce(self):
-        self.reduce_button = QtWidgets.QPushButton("reduce")
-        self.reduce_button.setIcon(QtGui.QIcon(":polyReduce.png"))
-        self.reduce_button.setIconSize(QtCore.QSize(25, 20))
-        self.reduce_button.clicked.connect(self.perform_reduce)
-        self.reduce_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.reduce_button.customContextMenuRequested.connect(self.popup_reduce) 
-        
-    def perform_remesh(self):
-        mel.eval("performPolyRemesh 0;")
+    def set_faceTrianglesOn(self):
+        self.set_faceTriangles(AttributeToggle.ON)
 
-    def open_remeshOptions(self):
-        mel.eval("performPolyRemesh 1;")
-        
-    def popup_remesh(self, position):
-        remesh_popup = QtWidgets.QMenu()
-        remesh_action = QtWidgets.QAction('Settings', self)
-        remesh_action.triggered.connect(self.open_remeshOptions)
-        remesh_popup.addAction(remesh_action)
-        remesh_popup.exec_(self.remesh_button.mapToGlobal(position))
-
-    def widgets_remesh(self):
-        self.remesh_button = QtWidgets.QPushButton("remesh")
-        self.remesh_button.setIcon(QtGui.QIcon(":polyRemesh.png"))
-        self.remesh_button.setIconSize(QtCore.QSize(25, 20))
-        self.remesh_button.clicked.connect(self.perform_remesh)
-        self.remesh_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.remesh_button.customContextMenuRequested.connect(self.popup_remesh) 
-        
-    def perform_retopo(self):
-        mel.eval("performPolyRetopo 0;")
-        
-    def open_retopoOptions(self):
-        mel.eval("performPolyRetopo 1;")
-        
-    def popup_retopo(self, position):
-        retopo_popup = QtWidgets.QMenu()
-        retopo_action = QtWidgets.QAction('Settings', self)
-        retopo_action.triggered.connect(self.open_retopoOptions)
-        retopo_popup.addAction(retopo_action)
-        retopo_popup.exec_(self.retopo_button.mapToGlobal(position))
-
-    def widgets_retopo(self):
-        self.retopo_button = QtWidgets.QPushButton("retopo")
-        self.retopo_button.setIcon(QtGui.QIcon(":polyRetopo.png"))
-        self.retopo_button.setIconSize(QtCore.QSize(25, 20))
-        self.retopo_button.clicked.connect(self.perform_retopo)
-        self.retopo_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.retopo_button.customContextMenuRequested.connect(self.popup_retopo) 
+    def set_faceTrianglesOff(self):
+        self.set_faceTriangles(AttributeToggle.OFF)
+
+    def get_preserveUVs(self):
+        return cmds.optionVar(q="trsManipsPreserveUvs") != 0
+
+    def set_preserveUVs(self, enabled):
+        mel.eval("setTRSPreserveUVs({0})".format(int(enabled)))
+        # optionVars have no change notification, so sync explicitly.
+        self.state_sync.request_sync()
+
+    def get_preserveChildren(self):
+        return cmds.optionVar(q="trsManipsPreserveChildPosition") != 0
+
+    def set_preserveChildren(self, enabled):
+        mel.eval("setTRSPreserveChildPosition({0})".format(int(enabled)))
+        self.state_sync.request_sync()
+
+    def get_edgeConstraint(self):
+        return cmds.optionVar(q="trsManipsXformConstraint") == "edge"
+
+    def set_edgeConstraint(self, enabled):
+        if enabled:
+            cmds.dR_slideEdge()
+        else:
+            cmds.dR_slideOff()
+        self.state_sync.request_sync()
+
+    def get_surfaceConstraint(self):
+        return cmds.optionVar(q="trsManipsXformConstraint") == "surface"
+
+    def set_surfaceConstraint(self, enabled):
+        if enabled:
+            cmds.dR_slideSurface()
+        else:
+            cmds.dR_slideOff()
+        self.state_sync.request_sync()
+
+    def create_toggle_button(self, key, text):
+        """
+        Builds a StateToggleButton for the get_<key>/set_<key> pair and keeps it synced.
+        """
+        button = StateToggleButton(text, getattr(self, "get_" + key), getattr(self, "set_" + key))
+        self.toggle_buttons[key] = button
+        return button
+
+    def create_state_sync(self):
+        self.state_sync = ToggleStateSync(self)
+        for key, button in self.toggle_buttons.items():
+            self.state_sync.bind(key, button.get_state, button.set_state)
+        self.state_sync.start(parent=self.get_workspace_control_name())
+
+    def register_section(self, title, builder, lazy=True):
+        """
+        :param title: header text used when the section is lazy
+        :param builder: callable creating the section widgets, returns its row layouts
+        :param lazy: False for sections that must exist as soon as the panel does
+        """
+        self.sections.append((title, builder, lazy))
+
+    def create_sections(self):
+        self.sections = []
+        self.register_section("Toggles", self.section_toggles, lazy=False)
+        self.register_section("Macro", self.section_macro)
+        self.register_section("Display", self.section_display)
+        self.register_section("Delete History", self.section_history)
+        self.register_section("Axis", self.section_axis)
+        self.register_section("Modify", self.section_modify)
+        self.register_section("Duplicate", self.section_duplicate)
+        self.register_section("Polygon Primitives", self.section_primitives)
+        self.register_section("Sculpting", self.section_sculpting)
+        self.register_section("Remesh", self.section_remesh)
+        self.register_section("Combine", self.section_combine)
+        self.register_section("Mesh Tools", self.section_meshTools)
+        self.register_section("Edit Mesh Tools", self.section_editMesh)
+        self.register_section("Symmetry", self.section_symmetry)
+        self.register_section("Boolean", self.section_boolean)
+        self.register_section("Normals", self.section_normals)
+
+    def create_row(self, *widgets):
+        layout = QtWidgets.QHBoxLayout()
+        for widget in widgets:
+            layout.addWidget(widget)
+        layout.setAlignment(QtCore.Qt.AlignTop)
+        return layout
+
+    def create_tool_button(self, key):
+        tool = TOOL_REGISTRY[key]
+
+        button = QtWidgets.QPushButton(tool.label)
+        if tool.icon:
+            button.setIcon(ResourceCache.icon(tool.icon))
+        button.setIconSize(QtCore.QSize(*tool.icon_size))
+        if not tool.label:
+            button.setToolTip(tool.name)
+        button.clicked.connect(partial(self.run_tool, key))
+        if key in self.TOOL_MENUS:
+            button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+            button.customContextMenuRequested.connect(partial(self.popup_tool_menu, key, button))
+        elif tool.options:
+            button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+            button.customContextMenuRequested.connect(partial(self.popup_tool_settings, key, button))
+
+        self.tool_buttons[key] = button
+        return button
+
+    def create_tool_row(self, *keys):
+        return self.create_row(*[self.create_tool_button(key) for key in keys])
+
+    def run_tool(self, key, *args):
+        """
+        Runs a registered tool. Buttons and anything else driving the panel go through here,
+        so a tool chaining several commands is one undo step and one redraw.
+        """
+        tool = TOOL_REGISTRY[key]
+        with ModelHelperTransaction("rbModelHelper" + key[0].upper() + key[1:]):
+            if tool.method:
+                getattr(self, tool.method)()
+            else:
+                mel.eval(tool.command)
+
+        if self.macro_recorder.recording:
+            self.macro_recorder.record(key)
+            self.update_macro_widgets()
+
+    def popup_tool_settings(self, key, button, position):
+        """
+        All tools share one Settings menu, created on the first right-click.
+        """
+        if self.settings_menu is None:
+            self.settings_menu = QtWidgets.QMenu(self)
+            settings_action = self.settings_menu.addAction("Settings")
+            settings_action.triggered.connect(self.open_tool_settings)
+
+        self.settings_tool = key
+        self.settings_menu.exec_(button.mapToGlobal(position))
+
+    def get_tool_options(self, key):
+        """
+        :return: (label, optionVar, default) switches listed on a tool's right-click menu
+        """
+        if key == "replace":
+            return ReplaceEngine.OPTIONS
+        return ()
+
+    def popup_tool_menu(self, key, button, position):
+        menu = QtWidgets.QMenu(self)
+        for menu_key in self.TOOL_MENUS[key]:
+            action = menu.addAction(TOOL_REGISTRY[menu_key].name)
+            action.triggered.connect(partial(self.run_tool, menu_key))
+        for label, option_var, default in self.get_tool_options(key):
+            action = menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(ReplaceEngine.get_option(option_var, default))
+            action.toggled.connect(partial(self.set_tool_option, option_var))
+        menu.exec_(button.mapToGlobal(position))
+        menu.deleteLater()
+
+    def set_tool_option(self, option_var, enabled):
+        cmds.optionVar(intValue=(option_var, int(enabled)))
+
+    def open_tool_settings(self, *args):
+        self.macro_recorder.watch_options(self.settings_tool)
+        mel.eval(TOOL_REGISTRY[self.settings_tool].options)
+
+    def open_command_palette(self, *args):
+        if self.command_palette is None:
+            self.command_palette = CommandPalette(self)
+        self.command_palette.popup()
+
+    def create_separator(self):
+        line = QtWidgets.QFrame()
+        line.setFrameShape(QtWidgets.QFrame.HLine)
+        line.setFrameShadow(QtWidgets.QFrame.Sunken)
+        line_layout = QtWidgets.QHBoxLayout()
+        line_layout.addWidget(line)
+        return line_layout
+
+    def section_toggles(self):
+        return [
+            self.create_row(self.create_toggle_button("symmetry", "Symmetry"),
+                            self.create_toggle_button("camBasedSel", "Cam Base Selection")),
+            self.create_row(self.create_toggle_button("preserveUVs", "Preserve UVs"),
+                            self.create_toggle_button("preserveChildren", "Preserve Children")),
+            self.create_row(self.create_toggle_button("edgeConstraint", "Edge Constraint"),
+                            self.create_toggle_button("surfaceConstraint", "Surface Constraint")),
+        ]
+
+    def section_macro(self):
+        self.macro_record_button = QtWidgets.QPushButton("Record")
+        self.macro_record_button.setCheckable(True)
+        self.macro_record_button.setStyleSheet(StateToggleButton.STYLE_SHEET)
+        self.macro_record_button.clicked.connect(self.toggle_macro_recording)
+        play_button = QtWidgets.QPushButton("Play on Selection")
+        play_button.clicked.connect(self.play_macro)
+        clear_button = QtWidgets.QPushButton("Clear")
+        clear_button.clicked.connect(self.clear_macro)
+        self.macro_status_label = QtWidgets.QLabel()
+        self.update_macro_widgets()
+        return [
+            self.create_row(self.macro_record_button, play_button, clear_button),
+            self.create_row(self.macro_status_label),
+        ]
+
+    def toggle_macro_recording(self, *args):
+        if self.macro_recorder.recording:
+            self.macro_recorder.stop()
+        else:
+            self.macro_recorder.start()
+        self.update_macro_widgets()
+
+    def play_macro(self, *args):
+        if self.macro_recorder.recording:
+            self.macro_recorder.stop()
+            self.update_macro_widgets()
+        self.macro_recorder.play()
+
+    def clear_macro(self, *args):
+        self.macro_recorder.clear()
+        self.update_macro_widgets()
+
+    def update_macro_widgets(self):
+        if self.macro_record_button is None:
+            return
+        self.macro_record_button.setChecked(self.macro_recorder.recording)
+        self.macro_record_button.setText("Stop" if self.macro_recorder.recording else "Record")
+        names = [TOOL_REGISTRY[step["key"]].name for step in self.macro_recorder.steps]
+        self.macro_status_label.setText(" > ".join(names) if names else "No steps recorded")
+        self.macro_status_label.setWordWrap(True)
+
+    def section_display(self):
+        return [self.create_tool_row("toggleFaceNormals", "toggleFaceTriangles", "toggleBackfaces", "toggleFaceInvisible")]
+
+    def section_history(self):
+        return [self.create_tool_row("deleteHistory", "deleteNonDefHistory")]
+
+    def section_axis(self):
+        return [self.create_tool_row("axisObject", "axisWorld", "axisComponent", "axisParent")]
+
+    def section_modify(self):
+        return [
+            self.create_tool_row("centerPivot", "zeroPivot"),
+            self.create_tool_row("bakePivot", "freezeTransform", "resetTransform"),
+        ]
+
+    def section_duplicate(self):
+        return [self.create_tool_row("duplicate", "instance", "replace", "pattern", "dedupe")]
+
+    def section_primitives(self):
+        return [
+            self.create_tool_row("sphere", "cube", "cylinder", "cone", "torus", "plane", "disc", "platonic"),
+            self.create_tool_row("pyramid", "prism", "pipe", "helix", "gear", "soccerBall", "superEllipse", "sculptObjects"),
+        ]
+
+    def section_sculpting(self):
+        return [
+            self.create_tool_row("lift", "sculptRelax", "sculptGrab", "sculptPinch", "sculptFlatten",
+                                 "sculptFoamy", "sculptSpray", "sculptRepeat", "sculptImprint"),
+            self.create_tool_row("sculptWax", "sculptScrape", "sculptFill", "sculptKnife", "sculptSmear",
+                                 "sculptBulge", "sculptAmplify", "sculptFreeze", "sculptFreezeSelect"),
+        ]
+
+    def section_remesh(self):
+        return [
+            self.create_tool_row("reduce", "remesh", "retopo"),
+            self.create_tool_row("averageVert", "divide", "smooth"),
+        ]
+
+    def section_combine(self):
+        return [
+            self.create_tool_row("combine", "separate"),
+            self.create_tool_row("detach", "extract", "duplicateFacet"),
+        ]
+
+    def section_meshTools(self):
+        return [
+            self.create_tool_row("multiCut", "quadDraw"),
+            self.create_tool_row("connect", "bridge"),
+            self.create_tool_row("ringAndSplit", "ringAndDelete", "loopAndDelete", "loopAndDuplicate"),
+        ]
+
+    def section_editMesh(self):
+        return [
+            self.create_tool_row("bevel", "extrude"),
+            self.create_tool_row("merge", "targetWeld"),
+        ]
+
+    def section_symmetry(self):
+        return [
+            self.create_tool_row("symmetrize", "mirror"),
+            self.create_tool_row("crease", "edgeFlow"),
+        ]
+
+    def section_boolean(self):
+        return [self.create_tool_row("union", "difference", "intersection")]
+
+    def section_normals(self):
+        return [
+            self.create_tool_row("average", "reverse", "setToFace"),
+            self.create_tool_row("conform", "lockNormals", "unlockNormals"),
+        ]
+
+    def build_section(self, title, builder):
+        start_time = perf_clock()
+        with startup_profiler.phase("section:" + title):
+            layouts = builder()
+        self.section_times[title] = perf_clock() - start_time
+        return layouts
+
+    def create_layout(self):
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.setSpacing(0)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+
+        search_button = QtWidgets.QPushButton("Search Tools (Ctrl+F)")
+        search_button.clicked.connect(self.open_command_palette)
+        main_layout.addWidget(search_button)
+        search_shortcut = QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+F"), self)
+        search_shortcut.setContext(QtCore.Qt.WidgetWithChildrenShortcut)
+        search_shortcut.activated.connect(self.open_command_palette)
+
+        self.scrollable_widget = ScrollableWidget()
+        main_layout.addWidget(self.scrollable_widget)
+
+        self.lazy_section_widgets = []
+        self.create_sections()
+        for title, builder, lazy in self.sections:
+            if self.lazy_sections and lazy:
+                section = LazyCollapsibleWidget(title, partial(self.build_section, title, builder))
+                section.set_expanded(True)
+                self.scrollable_widget.add_widget(section)
+                self.lazy_section_widgets.append(section)
+            elif self.sliced_build and lazy:
+                section_layout = QtWidgets.QVBoxLayout()
+                section_layout.setContentsMargins(0, 0, 0, 0)
+                section_layout.setSpacing(self.scrollable_widget.vbox.spacing())
+                self.scrollable_widget.vbox.addLayout(section_layout)
+                self.pending_sections.append((section_layout, title, builder))
+            else:
+                self.scrollable_widget.add_layout(self.create_separator())
+                for layout in self.build_section(title, builder):
+                    self.scrollable_widget.add_layout(layout)
+        self.scrollable_widget.vbox.addStretch()
+
+        if self.pending_sections:
+            QtCore.QTimer.singleShot(0, self.build_pending_sections)
+
+        main_layout.setAlignment(QtCore.Qt.AlignTop)
+
+        if self.lazy_section_widgets:
+            self._visible_sections_timer = QtCore.QTimer(self)
+            self._visible_sections_timer.setSingleShot(True)
+            self._visible_sections_timer.setInterval(0)
+            self._visible_sections_timer.timeout.connect(self.build_visible_sections)
+            scroll_bar = self.scrollable_widget.scroll_area.verticalScrollBar()
+            scroll_bar.valueChanged.connect(self.schedule_visible_sections)
+
+    def build_pending_sections(self):
+        """
+        Builds queued sections until the time slice is used up (at least one per call),
+        then yields back to Maya's event loop until the queue is empty.
+        """
+        deadline = perf_clock() + self.BUILD_SLICE_SECONDS
+        while self.pending_sections:
+            section_layout, title, builder = self.pending_sections.pop(0)
+            for layout in [self.create_separator()] + self.build_section(title, builder):
+                layout.setContentsMargins(0, 0, 0, 0)
+                layout.setSpacing(2)
+                section_layout.addLayout(layout)
+            if perf_clock() >= deadline:
+                break
+
+        if self.pending_sections:
+            QtCore.QTimer.singleShot(0, self.build_pending_sections)
+        else:
+            self.report_cold_open()
+
+    def schedule_visible_sections(self, *args):
+        if self.lazy_section_widgets and not self._visible_sections_timer.isActive():
+            self._visible_sections_timer.start()
+
+    def build_visible_sections(self):
+        """
+        Builds the expanded lazy sections that intersect the scroll viewport.
+        """
+        viewport = self.scrollable_widget.scroll_area.viewport()
+        visible_rect = viewport.rect()
+        for section in self.lazy_section_widgets:
+            if section.is_built() or not section.header_wdg.is_expanded():
+                continue
+            section_rect = QtCore.QRect(section.mapTo(viewport, QtCore.QPoint(0, 0)), section.size())
+            if visible_rect.intersects(section_rect):
+                section.build()
+
+        self.lazy_section_widgets = [section for section in self.lazy_section_widgets if not section.is_built()]
+        self.report_cold_open()
+
+    def report_cold_open(self):
+        """
+        Logs the time from construction until the first visible sections were built.
+        """
+        if self.cold_open_time is not None:
+            return
+
+        self.cold_open_time = perf_clock() - self._open_start
+        om.MGlobal.displayInfo("Model Helper cold open: {0:.1f} ms ({1} mode, {2}/{3} sections built)".format(
+            self.cold_open_time * 1000.0,
+            "lazy" if self.lazy_sections else "sliced" if self.sliced_build else "eager",
+            len(self.section_times),
+            len(self.sections)))
+        ResourceCache.report()
+   
+    def delete_history(self):    
+        HistoryCleaner.delete_selected(cmds.ls(selection=True, long=True))
         
+    def delete_nonDifHistory(self):   
+        HistoryCleaner.delete_selected(cmds.ls(selection=True, long=True), keep_deformers=True)
+
+    def delete_sceneHistory(self):
+        HistoryCleaner(HistoryCleaner.get_scene_meshes()).delete()
+
+    def report_history(self, timed=False):
+        """
+        Dry run for the selection, or for every mesh in the scene when nothing is selected.
+
+        :param timed: also dirty and re-evaluate the history to time it
+        """
+        selection = cmds.ls(selection=True, long=True)
+        if selection:
+            meshes, others = HistoryCleaner.get_meshes(selection)
+        else:
+            meshes = HistoryCleaner.get_scene_meshes()
+        HistoryCleaner(meshes).report(timed)
+
+    def report_history_timed(self):
+        self.report_history(timed=True)
+
     def perform_smooth(self):
-        mel.eval('performPolySmooth 0;')
-        
-    def open_smoothOptions(self):
-        mel.eval("performPolySmooth 1;")
-        
-    def popup_smooth(self, position):
-        smooth_popup = QtWidgets.QMenu()
-        smooth_action = QtWidgets.QAction('Settings', self)
-        smooth_action.triggered.connect(self.open_smoothOptions)
-        smooth_popup.addAction(smooth_action)
-        smooth_popup.exec_(self.smooth_button.mapToGlobal(position))
-
-    def widgets_smooth(self):
-        self.smooth_button = QtWidgets.QPushButton("smooth")
-        self.smooth_button.setIcon(QtGui.QIcon(":polySmooth.png"))
-        self.smooth_button.setIconSize(QtCore.QSize(25, 20))
-        self.smooth_button.clicked.connect(self.perform_smooth)
-        self.smooth_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.smooth_button.customContextMenuRequested.connect(self.popup_smooth) 
-        
+        BatchMeshExecutor("Smooth", partial(mel.eval, "polySmooth;")).run()
+
     def perform_triangulate(self):
-        mel.eval("polyPerformAction polytri f 0;")
+        BatchMeshExecutor("Triangulate", partial(mel.eval, "polyTriangulate;")).run()
 
-    def widgets_triangulate(self):
-        self.triangulate_button = QtWidgets.QPushButton("triangulate")
-        self.triangulate_button.setIcon(QtGui.QIcon(":polytri.png"))
-        self.triangulate_button.setIconSize(QtCore.QSize(25, 20))
-        self.triangulate_button.clicked.connect(self.perform_triangulate)
-        
     def perform_quadrangulate(self):
-        mel.eval('polyPerformAction "polyQuad  -a 30 -kgb 1 -ktb 1 -khe 1 -ws 1" f 0;')
-        
-    def open_quadrangulateOptions(self):
-        mel.eval("performPolyQuadrangulate 1;")
-        
-    def popup_quadrangulate(self, position):
-        quadrangulate_popup = QtWidgets.QMenu()
-        quadrangulate_action = QtWidgets.QAction('Settings', self)
-        quadrangulate_action.triggered.connect(self.open_quadrangulateOptions)
-        quadrangulate_popup.addAction(quadrangulate_action)
-        quadrangulate_popup.exec_(self.quadrangulate_button.mapToGlobal(position))
-
-    def widgets_quadrangulate(self):
-        self.quadrangulate_button = QtWidgets.QPushButton("quad")
-        self.quadrangulate_button.setIcon(QtGui.QIcon(":polyQuad.png"))
-        self.quadrangulate_button.setIconSize(QtCore.QSize(25, 20))
-        self.quadrangulate_button.clicked.connect(self.perform_quadrangulate)
-        self.quadrangulate_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.quadrangulate_button.customContextMenuRequested.connect(self.popup_quadrangulate) 
+        BatchMeshExecutor("Quadrangulate", partial(mel.eval, "polyQuad;")).run()
+
+    def perform_reduce(self):
+        BatchMeshExecutor("Reduce", self.reduce_selection).run()
+
+    def reduce_selection(self):
+        cmds.polyReduce(ver=1,trm=0,shp=0, keepBorder=1, keepMapBorder=1,keepColorBorder=1,keepHardEdge=1, keepCreaseEdge=1, keepBorderWeight= 0.5,keepMapBorderWeight=0.5,keepColorBorderWeight=0.5,keepFaceGroupBorderWeight=0.5,keepHardEdgeWeight=0.5,keepCreaseEdgeWeight=0.5,useVirtualSymmetry=0,symmetryTolerance=0.01,sx=0,sy=1,sz=0,sw=0,preserveTopology=1,keepQuadsWeight=1,cachingReduce=1,ch=1,p=50,vct=0,tct=0,replaceOriginal=1)
+ 
+    def perform_retopo(self):
+        cmds.polyRetopo(constructionHistory=1,replaceOriginal=1, preserveHardEdges=1, topologyRegularity=0.5, faceUniformity=0,anisotropy=1,targetFaceCount=1000,targetFaceCountTolerance=10)
+
+    def showEvent(self, e):
+        if self.workspace_control_instance.is_floating():
+            self.workspace_control_instance.set_label("Floating Window")
+        else:
+            self.workspace_control_instance.set_label("Modeling Helper")
+
+        if self.lazy_section_widgets:
+            self.schedule_visible_sections()
+        elif not self.pending_sections:
+            QtCore.QTimer.singleShot(0, self.report_cold_open)
+
+    def resizeEvent(self, e):
+        super(SampleUI, self).resizeEvent(e)
+        self.schedule_visible_sections()
             
-    def perform_mirror(self):
-        mel.eval('MirrorPolygonGeometry;')
-        
-    def open_mirrorOptions(self):
-        mel.eval("performPolyMirror 1;")
-        
-    def popup_mirror(self, position):
-        mirror_popup = QtWidgets.QMenu()
-        mirror_action = QtWidgets.QAction('Settings', self)
-        mirror_action.triggered.connect(self.open_mirrorOptions)
-        mirror_popup.addAction(mirror_action)
-        mirror_popup.exec_(self.mirror_button.mapToGlobal(position))
-
-    def widgets_mirror(self):
-        self.mirror_button = QtWidgets.QPushButton("mirror")
-        self.mirror_button.setIcon(QtGui.QIcon(":polyMirrorGeometry.png"))
-        self.mirror_button.setIconSize(QtCore.QSize(25, 20))
-        self.mirror_button.clicked.connect(self.perform_mirror)
-        self.mirror_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.mirror_button.customContextMenuRequested.connect(self.popup_mirror) 
-        
-    def perform_average(self):
-        mel.eval("AveragePolygonNormals;")
-        
-    def open_averageOptions(self):
-        mel.eval("AveragePolygonNormalsOptions;")
-        
-    def popup_average(self, position):
-        average_popup = QtWidgets.QMenu()
-        average_action = QtWidgets.QAction('Settings', self)
-        average_action.triggered.connect(self.open_averageOptions)
-        average_popup.addAction(average_action)
-        average_popup.exec_(self.average_button.mapToGlobal(position))
-
-    def widgets_average(self):
-        self.average_button = QtWidgets.QPushButton("Average")
-        self.average_button.setIcon(QtGui.QIcon(":polyNormalAverage.png"))
-        self.average_button.setIconSize(QtCore.QSize(25, 20))
-        self.average_button.clicked.connect(self.perform_average)
-        self.average_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.average_button.customContextMenuRequested.connect(self.popup_average) 
-        
-    def perform_setToFace(self):
-        mel.eval("polySetToFaceNormal ;")
-        
-    def open_setToFaceOptions(self):
-        mel.eval("polySetToFaceNormal Options;")
-        
-    def popup_setToFace(self, position):
-        setToFace_popup = QtWidgets.QMenu()
-        setToFace_action = QtWidgets.QAction('Settings', self)
-        setToFace_action.triggered.connect(self.open_setToFaceOptions)
-        setToFace_popup.addAction(setToFace_action)
-        setToFace_popup.exec_(self.setToFace_button.mapToGlobal(position))
-
-    def widgets_setToFace(self):
-        self.setToFace_button = QtWidgets.QPushButton("setToFace")
-        self.setToFace_button.setIcon(QtGui.QIcon(":polyNormalSetToFace.png"))
-        self.setToFace_button.setIconSize(QtCore.QSize(25, 20))
-        self.setToFace_button.clicked.connect(self.perform_setToFace)
-        self.setToFace_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.setToFace_button.customContextMenuRequested.connect(self.popup_setToFace) 
-        
-    def perform_reverse(self):
-        mel.eval("ReversePolygonNormals;")
-        
-    def open_reverseOptions(self):
-        mel.eval("ReversePolygonNormalsOptions;")
-        
-    def popup_reverse(self, position):
-        reverse_popup = QtWidgets.QMenu()
-        reverse_action = QtWidgets.QAction('Settings', self)
-        reverse_action.triggered.connect(self.open_reverseOptions)
-        reverse_popup.addAction(reverse_action)
-        reverse_popup.exec_(self.reverse_button.mapToGlobal(position))
-
-    def widgets_reverse(self):
-        self.reverse_button = QtWidgets.QPushButton("Reverse")
-        self.reverse_button.setIcon(QtGui.QIcon(":polyNormal.png"))
-        self.reverse_button.setIconSize(QtCore.QSize(25, 20))
-        self.reverse_button.clicked.connect(self.perform_reverse)
-        self.reverse_button.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.reverse_button.customContextMenuRequested.connect(self.popup_reverse) 
-        
-    def perform_conform(self):
-        mel.eval("ConformPolygonNormals;")
-        
-    def widgets_conform(self):
-        self.conform_button = QtWidgets.QPushButton("Conform")
-        self.conform_button.setIcon(QtGui.QIcon(":polyNormalsConform.png"))
-        self.conform_button.setIconSize(QtCore.QSize(25, 20))
-        self.conform_button.clicked.connect(self.perform_conform)
+class ToggleStateSync(QtCore.QObject):
+    """
+    Keeps the SampleUI toggle buttons in step with Maya's preferences.
+
+    Values are only re-read when Maya reports a relevant change (or when one of
+    our own buttons changes a preference) and widgets are only touched when the
+    cached value differs. Bursts of notifications are merged into one update on
+    the next event loop tick.
+    """
+
+    SCRIPT_JOB_EVENTS = (
+        "SelectPreferenceChanged",
+        "symmetricModellingOptionsChanged",
+        "xformConstraintOptionsChanged",
+        "ToolChanged",
+        "ToolSettingsChanged",
+        "SceneOpened",
+        "NewSceneOpened",
+    )
+
+    def __init__(self, parent=None):
+        super(ToggleStateSync, self).__init__(parent)
+
+        self._bindings = []
+        self._values = {}
+        self._script_jobs = []
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.sync)
+
+    def bind(self, key, reader, applier):
+        """
+        :param key: name the cached value is stored under
+        :param reader: callable returning the current Maya value
+        :param applier: callable updating the widgets for a new value
+        """
+        self._bindings.append((key, reader, applier))
+
+    def start(self, parent=None):
+        """
+        Subscribes to Maya's change notifications and pushes the current state.
+
+        :param parent: optional UI name; Maya kills the script jobs with it
+        """
+        self.stop()
+
+        for event in self.SCRIPT_JOB_EVENTS:
+            kwargs = {"event": [event, self.request_sync]}
+            if parent and cmds.control(parent, exists=True):
+                kwargs["parent"] = parent
+            try:
+                self._script_jobs.append(cmds.scriptJob(**kwargs))
+            except RuntimeError:
+                # Event names vary between Maya versions.
+                pass
+
+        self.sync(force=True)
+
+    def stop(self):
+        for job in self._script_jobs:
+            if cmds.scriptJob(exists=job):
+                cmds.scriptJob(kill=job, force=True)
+        self._script_jobs = []
+        self._timer.stop()
+
+    def request_sync(self, *args):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def sync(self, force=False):
+        for key, reader, applier in self._bindings:
+            value = reader()
+            if force or self._values.get(key) != value:
+                self._values[key] = value
+                applier(value)
+
+
+class ModelHelperTransaction(object):
+    """
+    Groups a bulk operation into one undo step and one viewport redraw.
+
+        with ModelHelperTransaction("rbModelHelperDedupe"):
+            cmds.delete(shapes)
+            cmds.parent(...)
+
+    The viewport refresh is suspended and an undo chunk is open for the duration,
+    both are restored when the block exits, including on errors. Transactions nest,
+    only the outermost one touches Maya's state, so an engine called from a tool
+    button or a macro step shares the caller's undo chunk and redraw.
+
+    Undo can be turned off for batches larger than the RBModelHelperUndoLimit
+    optionVar (0, the default, never turns it off), see undo_enabled_for.
+    """
+
+    UNDO_LIMIT_OPTION_VAR = "RBModelHelperUndoLimit"
+    depth = 0
+
+    def __init__(self, name, undo=True, suspend_refresh=True):
+        self.name = name
+        self.undo = undo
+        self.suspend_refresh = suspend_refresh
+        self.outermost = False
+        self.undo_disabled = False
+        self.start_time = None
+        self.elapsed = 0.0
+
+    @classmethod
+    def undo_enabled_for(cls, count):
+        """
+        :return: False when count items exceed the undo limit set by the user
+        """
+        if not cmds.optionVar(exists=cls.UNDO_LIMIT_OPTION_VAR):
+            return True
+        limit = cmds.optionVar(q=cls.UNDO_LIMIT_OPTION_VAR)
+        return limit <= 0 or count <= limit
+
+    def __enter__(self):
+        self.start_time = perf_clock()
+        self.outermost = ModelHelperTransaction.depth == 0
+        ModelHelperTransaction.depth += 1
+        if not self.outermost:
+            return self
+
+        try:
+            if not self.undo and cmds.undoInfo(q=True, state=True):
+                om.MGlobal.displayWarning("Model Helper {0}: large batch, undo is off for this operation.".format(self.name))
+                cmds.undoInfo(stateWithoutFlush=False)
+                self.undo_disabled = True
+            else:
+                cmds.undoInfo(openChunk=True, chunkName=self.name)
+            if self.suspend_refresh:
+                cmds.refresh(suspend=True)
+        except Exception:
+            self.restore()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.restore()
+        self.elapsed = perf_clock() - self.start_time
+        return False
+
+    def restore(self):
+        ModelHelperTransaction.depth -= 1
+        if not self.outermost:
+            return
+        if self.suspend_refresh:
+            cmds.refresh(suspend=False)
+            cmds.refresh()
+        if self.undo_disabled:
+            cmds.undoInfo(stateWithoutFlush=True)
+            self.undo_disabled = False
+        else:
+            cmds.undoInfo(closeChunk=True)
+
+
+class MacroRecorder(object):
+    """
+    Records the tools run from the panel and replays them over many objects.
+
+    Each step is a dict holding the TOOL_REGISTRY key and the values of the optionVars
+    the tool reads when it was recorded: the ModelTool option_vars, plus any optionVar
+    changed from the tool's right-click Settings box while recording. Replay sets those
+    values before the step and puts the user's values back after it, so changing an
+    option box later does not change the macro. Option box settings left untouched
+    while recording are not known and use the values current at replay. The recorded
+    steps are kept in the RBModelHelperMacro optionVar between sessions.
+
+    Replay selects one object at a time and runs every step on it, inside a single
+    undo chunk, with viewport refresh suspended and Maya's main progress bar shown
+    so the run can be cancelled with Esc. An error on one object is reported and the
+    replay moves on to the next.
+    """
+
+    OPTION_VAR = "RBModelHelperMacro"
+    UNDO_CHUNK_NAME = "rbModelHelperMacro"
+
+    def __init__(self, run_tool):
+        self.run_tool = run_tool
+        self.recording = False
+        self.playing = False
+        self.option_snapshot = None
+        self.watched_option_vars = {}
+        self.steps = self.load()
+
+    def load(self):
+        if not cmds.optionVar(exists=self.OPTION_VAR):
+            return []
+        try:
+            saved_steps = json.loads(cmds.optionVar(q=self.OPTION_VAR))
+        except (TypeError, ValueError):
+            return []
+        steps = []
+        for step in saved_steps:
+            if not isinstance(step, dict):
+                # macros saved before steps kept their options
+                step = {"key": step, "options": {}}
+            if step.get("key") in TOOL_REGISTRY:
+                steps.append(step)
+        return steps
+
+    def save(self):
+        cmds.optionVar(stringValue=(self.OPTION_VAR, json.dumps(self.steps)))
+
+    def start(self):
+        self.steps = []
+        self.option_snapshot = None
+        self.watched_option_vars = {}
+        self.recording = True
+
+    def stop(self):
+        self.recording = False
+        self.option_snapshot = None
+        self.save()
+
+    def clear(self):
+        self.steps = []
+        self.save()
+
+    @staticmethod
+    def get_option_values(option_vars):
+        values = {}
+        for option_var in option_vars:
+            if cmds.optionVar(exists=option_var):
+                values[option_var] = cmds.optionVar(q=option_var)
+        return values
+
+    @staticmethod
+    def set_option_value(option_var, value):
+        if isinstance(value, list):
+            cmds.optionVar(clearArray=option_var)
+            for item in value:
+                if isinstance(item, float):
+                    cmds.optionVar(floatValueAppend=(option_var, item))
+                elif isinstance(item, int):
+                    cmds.optionVar(intValueAppend=(option_var, item))
+                else:
+                    cmds.optionVar(stringValueAppend=(option_var, item))
+        elif isinstance(value, float):
+            cmds.optionVar(floatValue=(option_var, value))
+        elif isinstance(value, int):
+            cmds.optionVar(intValue=(option_var, value))
+        else:
+            cmds.optionVar(stringValue=(option_var, value))
+
+    def watch_options(self, key):
+        """
+        Snapshots every optionVar before a tool's option box opens while recording,
+        the ones that differ when the tool is next recorded are saved with its steps.
+        """
+        if self.recording and not self.playing:
+            self.option_snapshot = (key, self.get_option_values(cmds.optionVar(list=True) or []))
+
+    def get_step_options(self, key):
+        option_vars = set(TOOL_REGISTRY[key].option_vars)
+        if self.option_snapshot and self.option_snapshot[0] == key:
+            before = self.option_snapshot[1]
+            after = self.get_option_values(cmds.optionVar(list=True) or [])
+            changed = [option_var for option_var, value in after.items() if before.get(option_var) != value]
+            self.watched_option_vars.setdefault(key, set()).update(changed)
+            self.option_snapshot = None
+        option_vars.update(self.watched_option_vars.get(key, ()))
+        option_vars.discard(self.OPTION_VAR)
+        return self.get_option_values(option_vars)
+
+    def record(self, key):
+        if self.recording and not self.playing:
+            self.steps.append({"key": key, "options": self.get_step_options(key)})
+
+    def run_step(self, step):
+        options = step["options"]
+        previous = self.get_option_values(options)
+        for option_var, value in options.items():
+            self.set_option_value(option_var, value)
+        try:
+            self.run_tool(step["key"])
+        finally:
+            for option_var in options:
+                if option_var in previous:
+                    self.set_option_value(option_var, previous[option_var])
+                else:
+                    cmds.optionVar(remove=option_var)
+
+    def play(self, nodes=None):
+        """
+        Runs the recorded steps on every node, the current selection by default.
+
+        :return: the number of nodes processed
+        """
+        if nodes is None:
+            nodes = cmds.ls(selection=True, long=True) or []
+        if not self.steps or not nodes:
+            om.MGlobal.displayWarning("Model Helper macro: record some steps and select the objects to run them on.")
+            return 0
+
+        selection = cmds.ls(selection=True, long=True) or []
+        progress_bar = mel.eval("$tmp = $gMainProgressBar")
+        failures = []
+        processed = 0
+        start_time = perf_clock()
+
+        self.playing = True
+        cmds.progressBar(progress_bar, edit=True, beginProgress=True, isInterruptable=True,
+                         status="Model Helper macro...", maxValue=len(nodes))
+        try:
+            with ModelHelperTransaction(self.UNDO_CHUNK_NAME, undo=ModelHelperTransaction.undo_enabled_for(len(nodes))):
+                for node in nodes:
+                    if cmds.progressBar(progress_bar, query=True, isCancelled=True):
+                        break
+                    if cmds.objExists(node):
+                        cmds.select(node, replace=True)
+                        try:
+                            for step in self.steps:
+                                self.run_step(step)
+                        except Exception as exception:
+                            failures.append((node, str(exception).strip() or type(exception).__name__))
+                    processed += 1
+                    cmds.progressBar(progress_bar, edit=True, step=1)
+
+                selection = [node for node in selection if cmds.objExists(node)]
+                if selection:
+                    cmds.select(selection, replace=True)
+                else:
+                    cmds.select(clear=True)
+        finally:
+            cmds.progressBar(progress_bar, edit=True, endProgress=True)
+            self.playing = False
+
+        for node, error in failures:
+            om.MGlobal.displayWarning("Model Helper macro: {0}: {1}".format(node, error))
+        om.MGlobal.displayInfo("Model Helper macro: {0} steps on {1}/{2} objects in {3:.2f} s, {4} failed".format(
+            len(self.steps), processed, len(nodes), perf_clock() - start_time, len(failures)))
+        return processed
+
+
+class BatchMeshExecutor(object):
+    """
+    Runs a selection based mesh command once per mesh instead of once on the whole
+    selection, so one failing mesh does not stop the others.
+
+    The selection is grouped by mesh transform: selected objects and groups expand to
+    the meshes below them, selected components stay with their mesh. The command runs
+    with only that group selected, inside one ModelHelperTransaction, while Maya's main
+    progress bar shows the progress and an estimate of the time left. Esc cancels the
+    remaining meshes. Any error from one mesh is recorded and the batch goes on. A
+    per-mesh table of times and face counts is written to the Script Editor at the end.
+
+    When the main progress bar is already busy, as during a macro replay, the executor
+    only checks it for Esc and reports just the failed meshes.
+    """
+
+    def __init__(self, name, command):
+        """
+        :param name: label used in the progress bar and the summary
+        :param command: callable working on the current selection
+        """
+        self.name = name
+        self.command = command
+        self.results = []
+
+    @staticmethod
+    def get_mesh_groups(items):
+        """
+        :return: [(mesh transform, selection items for that mesh)] in selection order
+        """
+        groups = []
+        group_items = {}
+        for item in items:
+            if "." in item:
+                members = [(item.split(".")[0], item)]
+            else:
+                shapes = cmds.ls([item] + (cmds.listRelatives(item, allDescendents=True, fullPath=True) or []),
+                                 type="mesh", noIntermediate=True, long=True) or []
+                members = []
+                for shape in shapes:
+                    transform = cmds.listRelatives(shape, parent=True, fullPath=True)[0]
+                    members.append((transform, transform))
+
+            for transform, member in members:
+                if transform not in group_items:
+                    group_items[transform] = []
+                    groups.append((transform, group_items[transform]))
+                if member not in group_items[transform]:
+                    group_items[transform].append(member)
+        return groups
+
+    @staticmethod
+    def count_faces(transform):
+        try:
+            return cmds.polyEvaluate(transform, face=True)
+        except (RuntimeError, ValueError):
+            return 0
+
+    def run(self, items=None):
+        """
+        :return: [(mesh, faces before, faces after, seconds, error or None)] for the meshes processed
+        """
+        selection = cmds.ls(selection=True, long=True) or []
+        groups = self.get_mesh_groups(selection if items is None else items)
+        if not groups:
+            om.MGlobal.displayWarning("Model Helper {0}: select one or more meshes.".format(self.name))
+            return []
+
+        progress_bar = mel.eval("$tmp = $gMainProgressBar")
+        # Inside a macro replay the bar belongs to the replay: leave it and its Esc alone.
+        owns_progress = not cmds.progressBar(progress_bar, query=True, isMainProgressBarBusy=True)
+        start_time = perf_clock()
+        self.results = []
+        if owns_progress:
+            cmds.progressBar(progress_bar, edit=True, beginProgress=True, isInterruptable=True,
+                             status="Model Helper {0}...".format(self.name), maxValue=len(groups))
+        try:
+            with ModelHelperTransaction("rbModelHelper" + self.name.replace(" ", ""),
+                                        undo=ModelHelperTransaction.undo_enabled_for(len(groups))):
+                for index, (transform, members) in enumerate(groups):
+                    if cmds.progressBar(progress_bar, query=True, isCancelled=True):
+                        break
+                    if index and owns_progress:
+                        remaining = (perf_clock() - start_time) / index * (len(groups) - index)
+                        cmds.progressBar(progress_bar, edit=True, status="Model Helper {0}: {1}/{2}, {3:.0f} s left".format(
+                            self.name, index + 1, len(groups), remaining))
+
+                    faces = self.count_faces(transform)
+                    mesh_start = perf_clock()
+                    error = None
+                    try:
+                        cmds.select(members, replace=True)
+                        self.command()
+                    except Exception as exception:
+                        error = str(exception).strip() or type(exception).__name__
+                    self.results.append((transform, faces, self.count_faces(transform), perf_clock() - mesh_start, error))
+                    if owns_progress:
+                        cmds.progressBar(progress_bar, edit=True, step=1)
+
+                try:
+                    cmds.select(selection, replace=True)
+                except (RuntimeError, ValueError):
+                    cmds.select([transform for transform, members in groups if cmds.objExists(transform)], replace=True)
+        finally:
+            if owns_progress:
+                cmds.progressBar(progress_bar, edit=True, endProgress=True)
+
+        self.report(len(groups), perf_clock() - start_time, table=owns_progress)
+        return self.results
+
+    def report(self, total, seconds, table=True):
+        """
+        :param table: False inside a macro replay, where only failures are reported
+        """
+        if not table:
+            for transform, faces_before, faces_after, mesh_seconds, error in self.results:
+                if error:
+                    om.MGlobal.displayWarning("Model Helper {0}: {1} failed: {2}".format(self.name, transform, error))
+            return
+
+        lines = ["{0:<40} {1:>10} {2:>10} {3:>10}".format("mesh", "faces", "result", "ms")]
+        for transform, faces_before, faces_after, mesh_seconds, error in self.results:
+            lines.append("{0:<40} {1:>10} {2:>10} {3:>10.1f}{4}".format(
+                transform.split("|")[-1], faces_before, faces_after, mesh_seconds * 1000.0,
+                "  failed: " + error if error else ""))
+        for line in lines:
+            om.MGlobal.displayInfo(line)
+
+        failed = len([result for result in self.results if result[4]])
+        cancelled = total - len(self.results)
+        om.MGlobal.displayInfo("Model Helper {0}: {1}/{2} meshes, {3} -> {4} faces in {5:.2f} s, {6} failed{7}".format(
+            self.name, len(self.results) - failed, total,
+            sum(result[1] for result in self.results), sum(result[2] for result in self.results), seconds, failed,
+            ", {0} cancelled".format(cancelled) if cancelled else ""))
+        if failed:
+            om.MGlobal.displayWarning("Model Helper {0}: {1} meshes failed, see the Script Editor.".format(self.name, failed))
+
+
+class ApiEdit(object):
+    """
+    A batch of Maya API changes that undo and redo as one step.
+
+    Changes are queued with the set_* methods, which remember the previous values,
+    and applied by commit(). commit() runs them through the rbModelHelperEdit
+    command so the whole batch lands on Maya's undo queue as a single entry.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.actions = []
+
+    def __len__(self):
+        return len(self.actions)
+
+    def add(self, redo, undo):
+        self.actions.append((redo, undo))
+
+    def set_mesh_points(self, dag_path, points, old_points=None):
+        """
+        :param old_points: the object space points already read from the mesh, kept for undo
+        """
+        if old_points is None:
+            old_points = om.MFnMesh(dag_path).getPoints(om.MSpace.kObject)
+        self.add(partial(self._set_mesh_points, om.MDagPath(dag_path), points),
+                 partial(self._set_mesh_points, om.MDagPath(dag_path), old_points))
+
+    def set_curve_points(self, dag_path, points):
+        old_points = om.MFnNurbsCurve(dag_path).cvPositions(om.MSpace.kObject)
+        self.add(partial(self._set_curve_points, om.MDagPath(dag_path), points),
+                 partial(self._set_curve_points, om.MDagPath(dag_path), old_points))
+
+    def set_transformation(self, dag_path, matrix):
+        """
+        :param matrix: MTransformationMatrix holding the new local transform, pivots included
+        """
+        old_matrix = om.MFnTransform(dag_path).transformation()
+        self.add(partial(self._set_transformation, om.MDagPath(dag_path), matrix),
+                 partial(self._set_transformation, om.MDagPath(dag_path), old_matrix))
+
+    @staticmethod
+    def _set_mesh_points(dag_path, points):
+        om.MFnMesh(dag_path).setPoints(points, om.MSpace.kObject)
+
+    @staticmethod
+    def _set_curve_points(dag_path, points):
+        curve_fn = om.MFnNurbsCurve(dag_path)
+        curve_fn.setCVPositions(points, om.MSpace.kObject)
+        curve_fn.updateCurve()
+
+    @staticmethod
+    def _set_transformation(dag_path, matrix):
+        om.MFnTransform(dag_path).setTransformation(matrix)
+
+    def redo(self):
+        for redo, undo in self.actions:
+            redo()
+
+    def undo(self):
+        for redo, undo in reversed(self.actions):
+            undo()
+
+    def commit(self):
+        if not self.actions:
+            return
+        ApiEditCommand.pending_edit = self
+        getattr(cmds, ApiEditCommand.COMMAND_NAME)()
+
+
+class AttributeToggle(object):
+    """
+    Sets an on/off attribute on many nodes in a single undoable MDGModifier.
+
+    Nodes without the attribute are searched for non-intermediate shapes that
+    have it, so a transform selection drives e.g. its meshes' backfaceCulling.
+    """
+
+    ON = "on"
+    OFF = "off"
+    INVERT = "invert"
+
+    @classmethod
+    def get_plugs(cls, nodes, attribute):
+        selection = om.MSelectionList()
+        for node in nodes:
+            try:
+                selection.add(node)
+            except RuntimeError:
+                continue
+
+        plugs = {}
+        for i in range(selection.length()):
+            dependency_node = selection.getDependNode(i)
+            node_fn = om.MFnDependencyNode(dependency_node)
+            if node_fn.hasAttribute(attribute):
+                plugs[om.MObjectHandle(dependency_node).hashCode()] = node_fn.findPlug(attribute, False)
+                continue
+            if not dependency_node.hasFn(om.MFn.kDagNode):
+                continue
+
+            dag_path = selection.getDagPath(i)
+            for shape_index in range(dag_path.numberOfShapesDirectlyBelow()):
+                shape_path = om.MDagPath(dag_path)
+                shape_path.extendToShape(shape_index)
+                shape_fn = om.MFnDagNode(shape_path)
+                if not shape_fn.isIntermediateObject and shape_fn.hasAttribute(attribute):
+                    plugs[om.MObjectHandle(shape_path.node()).hashCode()] = shape_fn.findPlug(attribute, False)
+        return list(plugs.values())
+
+    @classmethod
+    def apply(cls, nodes, attribute, mode=INVERT, on_value=1):
+        """
+        :param mode: ON or OFF sets every plug, INVERT flips each plug on its own
+        :return: the number of plugs changed
+        """
+        start_time = perf_clock()
+        plugs = cls.get_plugs(nodes, attribute)
+
+        modifier = om.MDGModifier()
+        changed = 0
+        for plug in plugs:
+            current = plug.asInt()
+            if mode == cls.ON:
+                value = on_value
+            elif mode == cls.OFF:
+                value = 0
+            else:
+                value = 0 if current else on_value
+            if value != current:
+                modifier.newPlugValueInt(plug, value)
+                changed += 1
+
+        if changed:
+            edit = ApiEdit("{0} {1}".format(attribute, mode))
+            edit.add(modifier.doIt, modifier.undoIt)
+            edit.commit()
+
+        om.MGlobal.displayInfo("Model Helper: {0} {1} on {2}/{3} nodes in {4:.1f} ms".format(
+            attribute, mode, changed, len(plugs), (perf_clock() - start_time) * 1000.0))
+        return changed
+
+
+class HistoryCleaner(object):
+    """
+    Construction history removal for many meshes at once.
+
+    The upstream graph of all the meshes is walked once: sources are cached per
+    node, so history shared between meshes is only queried once. Nodes that also
+    feed geometry outside the set are kept, along with everything upstream of them.
+    Only a mesh's inMesh counts as part of its history: the groupId nodes of per-face
+    materials, wired to the shape's instObjGroups and to shading groups, are kept as
+    Maya's Delete History does.
+
+    Deleting keeps each mesh's current geometry by writing its evaluated inMesh
+    back as a static value when the connection is removed. History nodes are then
+    deleted with MDagModifiers in batches, all committed as one undo step.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, meshes):
+        start_time = perf_clock()
+        self.meshes = meshes
+        self.mesh_keys = set(self.node_key(mesh) for mesh in meshes)
+        self.sources = {}
+        self.history = {}
+        self.mesh_history = {}
+        self.kept = set()
+        self.material_groups = set()
+        self.walk()
+        self.find_shared()
+        self.analysis_time = perf_clock() - start_time
+
+    @staticmethod
+    def node_key(node):
+        return om.MObjectHandle(node).hashCode()
+
+    @staticmethod
+    def node_name(node):
+        if node.hasFn(om.MFn.kDagNode):
+            return om.MFnDagNode(node).fullPathName()
+        return om.MFnDependencyNode(node).name()
+
+    @classmethod
+    def get_meshes(cls, nodes):
+        """
+        :return: (non-intermediate mesh shapes under nodes, nodes without any mesh)
+        """
+        selection = om.MSelectionList()
+        for node in nodes:
+            try:
+                selection.add(node)
+            except RuntimeError:
+                continue
+
+        meshes = {}
+        others = []
+        for i in range(selection.length()):
+            try:
+                dag_path = selection.getDagPath(i)
+            except TypeError:
+                continue
+            if dag_path.node().hasFn(om.MFn.kTransform):
+                shape_paths = []
+                for shape_index in range(dag_path.numberOfShapesDirectlyBelow()):
+                    shape_path = om.MDagPath(dag_path)
+                    shape_path.extendToShape(shape_index)
+                    shape_paths.append(shape_path)
+            else:
+                shape_paths = [dag_path]
+
+            found = False
+            for shape_path in shape_paths:
+                if shape_path.node().hasFn(om.MFn.kMesh) and not om.MFnDagNode(shape_path).isIntermediateObject:
+                    meshes[cls.node_key(shape_path.node())] = shape_path.node()
+                    found = True
+            if not found:
+                others.append(dag_path.fullPathName())
+        return list(meshes.values()), others
+
+    @classmethod
+    def get_scene_meshes(cls):
+        meshes = []
+        mesh_iter = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kMesh)
+        while not mesh_iter.isDone():
+            node = mesh_iter.currentItem()
+            if not om.MFnDagNode(node).isIntermediateObject:
+                meshes.append(node)
+            mesh_iter.next()
+        return meshes
+
+    @classmethod
+    def delete_selected(cls, nodes, keep_deformers=False):
+        if not nodes:
+            om.MGlobal.displayWarning("Model Helper: select the objects to delete history from.")
+            return
+        meshes, others = cls.get_meshes(nodes)
+        with ModelHelperTransaction("rbModelHelperDeleteHistory"):
+            cls(meshes).delete(keep_deformers=keep_deformers)
+            if others:
+                # Curves, surfaces and the like keep going through Maya's own command.
+                if keep_deformers:
+                    cmds.bakePartialHistory(others, prePostDeformers=True)
+                else:
+                    cmds.delete(others, constructionHistory=True)
+
+    def is_history_node(self, node):
+        if node.hasFn(om.MFn.kDagNode):
+            return node.hasFn(om.MFn.kShape) and om.MFnDagNode(node).isIntermediateObject
+        return not om.MFnDependencyNode(node).isDefaultNode
+
+    def get_sources(self, node, key):
+        sources = self.sources.get(key)
+        if sources is None:
+            sources = []
+            if key in self.mesh_keys:
+                plugs = [om.MFnDependencyNode(node).findPlug("inMesh", False)]
+            else:
+                plugs = om.MFnDependencyNode(node).getConnections()
+            for plug in plugs:
+                for source_plug in plug.connectedTo(True, False):
+                    source = source_plug.node()
+                    if self.is_history_node(source):
+                        sources.append(source)
+            self.sources[key] = sources
+        return sources
+
+    def walk(self):
+        for mesh in self.meshes:
+            mesh_key = self.node_key(mesh)
+            visited = set()
+            stack = list(self.get_sources(mesh, mesh_key))
+            while stack:
+                node = stack.pop()
+                key = self.node_key(node)
+                if key in visited or key in self.mesh_keys:
+                    continue
+                visited.add(key)
+                self.history[key] = node
+                stack.extend(self.get_sources(node, key))
+            self.mesh_history[mesh_key] = visited
+
+    def find_shared(self):
+        for key, node in self.history.items():
+            for plug in om.MFnDependencyNode(node).getConnections():
+                if not plug.isSource or om.MFnAttribute(plug.attribute()).name == "message":
+                    continue
+                for destination_plug in plug.connectedTo(False, True):
+                    destination = destination_plug.node()
+                    destination_key = self.node_key(destination)
+                    if destination_key in self.history:
+                        continue
+                    if destination_key in self.mesh_keys and om.MFnAttribute(destination_plug.attribute()).name == "inMesh":
+                        continue
+                    if destination.hasFn(om.MFn.kSet) and not destination.hasFn(om.MFn.kShadingEngine):
+                        continue
+                    if node.hasFn(om.MFn.kGroupId):
+                        self.material_groups.add(key)
+                    self.kept.add(key)
+                    break
+                if key in self.kept:
+                    break
+
+        stack = list(self.kept)
+        while stack:
+            for source in self.sources.get(stack.pop(), ()):
+                source_key = self.node_key(source)
+                if source_key in self.history and source_key not in self.kept:
+                    self.kept.add(source_key)
+                    stack.append(source_key)
+
+    def get_deletable(self):
+        return [node for key, node in self.history.items() if key not in self.kept]
+
+    def has_deformers(self, mesh):
+        return any(self.history[key].hasFn(om.MFn.kGeometryFilt) for key in self.mesh_history[self.node_key(mesh)])
+
+    def measure_evaluation(self):
+        """
+        Dirties the deletable history and times pulling every mesh's inMesh, which is
+        roughly what the history costs each time it has to re-evaluate. This re-evaluates
+        the live scene nodes, so the plain dry run does not call it.
+        """
+        deletable = self.get_deletable()
+        if not deletable:
+            return 0.0
+        cmds.dgdirty([self.node_name(node) for node in deletable])
+        start_time = perf_clock()
+        for mesh in self.meshes:
+            if self.mesh_history[self.node_key(mesh)]:
+                om.MFnDependencyNode(mesh).findPlug("inMesh", False).asMObject()
+        return perf_clock() - start_time
+
+    def report(self, timed=False):
+        """
+        :param timed: dirty the deletable history and time its re-evaluation, see measure_evaluation
+        """
+        deletable = self.get_deletable()
+        type_counts = {}
+        for node in deletable:
+            type_name = om.MFnDependencyNode(node).typeName
+            type_counts[type_name] = type_counts.get(type_name, 0) + 1
+
+        with_history = len([mesh for mesh in self.meshes if self.mesh_history[self.node_key(mesh)]])
+        om.MGlobal.displayInfo(
+            "Model Helper history dry run: {0} meshes, {1} with history. {2} history nodes would be deleted, "
+            "{3} kept because other nodes use them.".format(
+                len(self.meshes), with_history, len(deletable), len(self.kept)))
+        if self.material_groups:
+            om.MGlobal.displayInfo(
+                "    {0} of the kept nodes are groupId nodes of per-face materials.".format(len(self.material_groups)))
+        for type_name, count in sorted(type_counts.items(), key=lambda item: -item[1]):
+            om.MGlobal.displayInfo("    {0:<24} {1}".format(type_name, count))
+        if timed:
+            evaluation_time = self.measure_evaluation()
+            om.MGlobal.displayInfo(
+                "Model Helper history dry run: dirtied and re-evaluated that history in the scene to time it (nothing "
+                "was deleted): ~{0:.1f} ms, saved on every evaluation once it is deleted.".format(evaluation_time * 1000.0))
+        else:
+            om.MGlobal.displayInfo(
+                "Model Helper history dry run: no node was dirtied or re-evaluated. Use History Dry Run (Re-evaluate) "
+                "to time the history, it forces the scene to re-evaluate it.")
+        om.MGlobal.displayInfo("Model Helper history dry run: analysis took {0:.1f} ms.".format(self.analysis_time * 1000.0))
+
+    def delete(self, keep_deformers=False):
+        """
+        :param keep_deformers: meshes with deformers go through bakePartialHistory instead,
+            keeping the deformers and baking the rest of their history
+        """
+        start_time = perf_clock()
+        if keep_deformers:
+            deformed = [mesh for mesh in self.meshes if self.has_deformers(mesh)]
+            if deformed:
+                plain = [mesh for mesh in self.meshes if not self.has_deformers(mesh)]
+                return self.__class__(plain).delete_and_bake([self.node_name(mesh) for mesh in deformed], start_time)
+        return self.delete_and_bake([], start_time)
+
+    def delete_and_bake(self, bake_names, start_time):
+        meshes = [mesh for mesh in self.meshes if self.mesh_history[self.node_key(mesh)]]
+        deletable = self.get_deletable()
+        edit = ApiEdit("deleteHistory")
+
+        for batch_start in range(0, len(meshes), self.BATCH_SIZE):
+            modifier = om.MDagModifier()
+            for mesh in meshes[batch_start:batch_start + self.BATCH_SIZE]:
+                in_plug = om.MFnDependencyNode(mesh).findPlug("inMesh", False)
+                mesh_data = in_plug.asMObject()
+                for source_plug in in_plug.connectedTo(True, False):
+                    modifier.disconnect(source_plug, in_plug)
+                modifier.newPlugValue(in_plug, mesh_data)
+            edit.add(modifier.doIt, modifier.undoIt)
+
+        for batch_start in range(0, len(deletable), self.BATCH_SIZE):
+            modifier = om.MDagModifier()
+            for node in deletable[batch_start:batch_start + self.BATCH_SIZE]:
+                modifier.deleteNode(node)
+            edit.add(modifier.doIt, modifier.undoIt)
+
+        with ModelHelperTransaction("rbModelHelperDeleteHistory"):
+            edit.commit()
+            for batch_start in range(0, len(bake_names), self.BATCH_SIZE):
+                cmds.bakePartialHistory(bake_names[batch_start:batch_start + self.BATCH_SIZE], prePostDeformers=True)
+
+        om.MGlobal.displayInfo(
+            "Model Helper: deleted {0} history nodes from {1} meshes, baked {2} deformed meshes in {3:.1f} ms".format(
+                len(deletable), len(meshes), len(bake_names), (perf_clock() - start_time) * 1000.0))
+
+
+class ApiEditCommand(om.MPxCommand):
+    """
+    Undoable command applying the ApiEdit handed over by ApiEdit.commit.
+    """
+
+    COMMAND_NAME = "rbModelHelperEdit"
+
+    pending_edit = None
+
+    def __init__(self):
+        super(ApiEditCommand, self).__init__()
+        self.edit = None
+
+    @staticmethod
+    def creator():
+        return ApiEditCommand()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        self.edit = ApiEditCommand.pending_edit
+        ApiEditCommand.pending_edit = None
+        if self.edit is None:
+            raise RuntimeError("{0} is run by the Model Helper, not directly".format(self.COMMAND_NAME))
+        self.redoIt()
+
+    def redoIt(self):
+        self.edit.redo()
+
+    def undoIt(self):
+        self.edit.undo()
+
+
+class TransformEngine(object):
+    """
+    Bulk transform operations on the selection, done through maya.api.OpenMaya.
+
+    Plain transforms whose shapes are meshes or NURBS curves are handled in one
+    pass: points are read once per shape, multiplied by the baked matrix (with
+    NumPy when it is available) and everything is committed as one ApiEdit.
+    An instanced shape is baked once, and only when all of its parents are baked
+    with the same matrix. Anything else (joints, locked or connected channels,
+    shapes with construction history, other shape types, mirrored transforms)
+    falls back to the equivalent MEL per node, inside the same undo chunk.
+    """
+
+    CHANNELS = ("translate", "rotate", "scale")
+    BAKE_ZERO = "zeroPivot"
+    BAKE_FREEZE = "freezeTransform"
+    BAKE_PIVOT = "bakePivot"
+    PIVOT_BOUNDS = "bounds"
+    PIVOT_CENTROID = "centroid"
+    PIVOT_BOTTOM = "bottom"
+    PIVOT_MODES = (PIVOT_BOUNDS, PIVOT_CENTROID, PIVOT_BOTTOM)
+    PIVOT_MODE_OPTION_VAR = "RBModelHelperPivotMode"
+    # When the Freeze/Reset option boxes limit the channels, Maya's command runs instead.
+    FREEZE_OPTION_VARS = ("freezeTranslate", "freezeRotate", "freezeScale")
+    RESET_OPTION_VARS = ("resetTranslate", "resetRotate", "resetScale")
+
+    @classmethod
+    def get_transform_paths(cls, nodes):
+        """
+        :return: unique transform MDagPaths for nodes, parents before their children
+        """
+        selection = om.MSelectionList()
+        for node in nodes:
+            try:
+                selection.add(node)
+            except RuntimeError:
+                continue
+
+        dag_paths = {}
+        for i in range(selection.length()):
+            try:
+                dag_path = selection.getDagPath(i)
+            except TypeError:
+                continue
+            if not dag_path.node().hasFn(om.MFn.kTransform):
+                dag_path.pop()
+            dag_paths[dag_path.fullPathName()] = dag_path
+        return sorted(dag_paths.values(), key=lambda dag_path: dag_path.length())
+
+    @classmethod
+    def get_shape_paths(cls, dag_path):
+        shape_paths = []
+        for i in range(dag_path.numberOfShapesDirectlyBelow()):
+            shape_path = om.MDagPath(dag_path)
+            shape_path.extendToShape(i)
+            shape_paths.append(shape_path)
+        return shape_paths
+
+    @classmethod
+    def get_child_transform_paths(cls, dag_path):
+        child_paths = []
+        for i in range(dag_path.childCount()):
+            child = dag_path.child(i)
+            if child.hasFn(om.MFn.kTransform):
+                child_path = om.MDagPath(dag_path)
+                child_path.push(child)
+                child_paths.append(child_path)
+        return child_paths
+
+    @classmethod
+    def has_locked_channels(cls, dag_path):
+        """
+        True when translate, rotate or scale is locked or driven by a connection.
+        """
+        node_fn = om.MFnDependencyNode(dag_path.node())
+        for channel in cls.CHANNELS:
+            plug = node_fn.findPlug(channel, False)
+            if plug.isLocked or plug.isDestination:
+                return True
+            for i in range(plug.numChildren()):
+                if plug.child(i).isLocked or plug.child(i).isDestination:
+                    return True
+        return False
+
+    @classmethod
+    def options_limited(cls, option_vars):
+        return any(cmds.optionVar(exists=option_var) and not cmds.optionVar(q=option_var) for option_var in option_vars)
+
+    @classmethod
+    def can_bake(cls, dag_path, matrix):
+        """
+        True when the transform and its shapes can be baked through the API.
+        """
+        if dag_path.apiType() != om.MFn.kTransform or matrix.det3x3() < 0.0 or cls.has_locked_channels(dag_path):
+            return False
+        for child_path in cls.get_child_transform_paths(dag_path):
+            if child_path.apiType() != om.MFn.kTransform or cls.has_locked_channels(child_path):
+                return False
+        for shape_path in cls.get_shape_paths(dag_path):
+            if shape_path.hasFn(om.MFn.kMesh):
+                plug = om.MFnDependencyNode(shape_path.node()).findPlug("inMesh", False)
+            elif shape_path.hasFn(om.MFn.kNurbsCurve):
+                plug = om.MFnDependencyNode(shape_path.node()).findPlug("create", False)
+            else:
+                return False
+            if plug.isDestination:
+                return False
+        return True
+
+    @classmethod
+    def get_blocked_instances(cls, dag_paths):
+        """
+        :return: names of transforms holding an instanced shape that can not be baked once
+            for all of its parents, because a parent is not in dag_paths or has another matrix
+        """
+        names = set(dag_path.fullPathName() for dag_path in dag_paths)
+        blocked = set()
+        for dag_path in dag_paths:
+            matrix = om.MFnTransform(dag_path).transformation().asMatrix()
+            for shape_path in cls.get_shape_paths(dag_path):
+                if not shape_path.isInstanced():
+                    continue
+                for parent_path in om.MDagPath.getAllPathsTo(shape_path.node()):
+                    parent_path.pop()
+                    parent_name = parent_path.fullPathName()
+                    if parent_name not in names or \
+                            not om.MFnTransform(parent_path).transformation().asMatrix().isEquivalent(matrix):
+                        blocked.add(dag_path.fullPathName())
+                        break
+        return blocked
+
+    @staticmethod
+    def matrix_to_array(matrix):
+        return np.array([[matrix.getElement(row, column) for column in range(4)] for row in range(4)])
+
+    @classmethod
+    def transform_points(cls, points, matrix):
+        """
+        :return: MPointArray of points multiplied by matrix
+        """
+        if np is None:
+            return om.MPointArray([point * matrix for point in points])
+        return om.MPointArray(np.array(points).dot(cls.matrix_to_array(matrix)).tolist())
+
+    @classmethod
+    def bake_shapes(cls, edit, dag_path, matrix, baked_shapes):
+        for shape_path in cls.get_shape_paths(dag_path):
+            shape_key = om.MObjectHandle(shape_path.node()).hashCode()
+            if shape_key in baked_shapes:
+                continue
+            baked_shapes.add(shape_key)
+            if shape_path.hasFn(om.MFn.kMesh):
+                points = om.MFnMesh(shape_path).getPoints(om.MSpace.kObject)
+                edit.set_mesh_points(shape_path, cls.transform_points(points, matrix))
+            else:
+                points = om.MFnNurbsCurve(shape_path).cvPositions(om.MSpace.kObject)
+                edit.set_curve_points(shape_path, cls.transform_points(points, matrix))
+
+    @classmethod
+    def get_bake(cls, mode, transformation, matrix):
+        """
+        :return: (matrix baked into the shapes and child transforms, new transformation)
+        """
+        if mode == cls.BAKE_PIVOT:
+            to_pivot = om.MTransformationMatrix()
+            to_pivot.setTranslation(om.MVector(transformation.rotatePivot(om.MSpace.kTransform)), om.MSpace.kTransform)
+            return to_pivot.asMatrixInverse(), om.MTransformationMatrix(to_pivot.asMatrix() * matrix)
+
+        baked = om.MTransformationMatrix()
+        if mode == cls.BAKE_FREEZE:
+            baked.setRotatePivot(transformation.rotatePivot(om.MSpace.kTransform) * matrix, om.MSpace.kTransform, False)
+            baked.setScalePivot(transformation.scalePivot(om.MSpace.kTransform) * matrix, om.MSpace.kTransform, False)
+        return matrix, baked
+
+    @classmethod
+    def run_fallback(cls, mode, nodes):
+        if mode == cls.BAKE_PIVOT:
+            cmds.select(nodes, replace=True)
+            mel.eval("BakeCustomPivot;")
+            return
+        for node in nodes:
+            cmds.makeIdentity(node, apply=True, t=True, r=True, s=True)
+            if mode == cls.BAKE_ZERO:
+                cmds.xform(node, pivots=(0, 0, 0), objectSpace=True)
+
+    @classmethod
+    def bake(cls, nodes, mode):
+        """
+        Bakes part of each transform into its shapes. Children keep their world
+        position and the hierarchy is left alone.
+
+        :param mode: BAKE_ZERO leaves an identity transform with the pivots at the parent's
+            origin (Zero Pivot), BAKE_FREEZE keeps the pivots where they are (Freeze Transform),
+            BAKE_PIVOT moves the object's origin and axes to its pivot (Bake Pivot)
+        """
+        start_time = perf_clock()
+        edit = ApiEdit(mode)
+        local_matrices = {}
+        baked_shapes = set()
+        fallback_nodes = []
+
+        dag_paths = cls.get_transform_paths(nodes)
+        blocked = cls.get_blocked_instances(dag_paths)
+        for dag_path in dag_paths:
+            name = dag_path.fullPathName()
+            transformation = om.MFnTransform(dag_path).transformation()
+            matrix = local_matrices.get(name)
+            if matrix is None:
+                matrix = transformation.asMatrix()
+            bake_matrix, baked = cls.get_bake(mode, transformation, matrix)
+            if name in blocked or not cls.can_bake(dag_path, bake_matrix):
+                fallback_nodes.append(name)
+                continue
+
+            cls.bake_shapes(edit, dag_path, bake_matrix, baked_shapes)
+            edit.set_transformation(dag_path, baked)
+
+            for child_path in cls.get_child_transform_paths(dag_path):
+                child_name = child_path.fullPathName()
+                child_transformation = om.MFnTransform(child_path).transformation()
+                child_matrix = local_matrices.get(child_name)
+                if child_matrix is None:
+                    child_matrix = child_transformation.asMatrix()
+                local_matrices[child_name] = child_matrix * bake_matrix
+
+                child_baked = om.MTransformationMatrix(local_matrices[child_name])
+                child_baked.setRotatePivot(child_transformation.rotatePivot(om.MSpace.kTransform), om.MSpace.kTransform, True)
+                child_baked.setScalePivot(child_transformation.scalePivot(om.MSpace.kTransform), om.MSpace.kTransform, True)
+                edit.set_transformation(child_path, child_baked)
+
+        with ModelHelperTransaction("rbModelHelper" + mode[0].upper() + mode[1:]):
+            edit.commit()
+            if fallback_nodes:
+                cls.run_fallback(mode, fallback_nodes)
+
+        om.MGlobal.displayInfo("Model Helper {0}: {1} transforms, {2} shapes ({3} via API, {4} via MEL) in {5:.1f} ms".format(
+            mode, len(dag_paths), len(baked_shapes), len(dag_paths) - len(fallback_nodes), len(fallback_nodes),
+            (perf_clock() - start_time) * 1000.0))
+
+    @classmethod
+    def zero_pivot(cls, nodes):
+        cls.bake(nodes, cls.BAKE_ZERO)
+
+    @classmethod
+    def freeze(cls, nodes):
+        cls.bake(nodes, cls.BAKE_FREEZE)
+
+    @classmethod
+    def bake_pivot(cls, nodes):
+        cls.bake(nodes, cls.BAKE_PIVOT)
+
+    @classmethod
+    def get_descendant_shapes(cls, dag_path):
+        shape_paths = []
+        dag_iter = om.MItDag()
+        dag_iter.reset(dag_path, om.MItDag.kDepthFirst, om.MFn.kShape)
+        while not dag_iter.isDone():
+            shape_path = dag_iter.getPath()
+            if not om.MFnDagNode(shape_path).isIntermediateObject:
+                shape_paths.append(shape_path)
+            dag_iter.next()
+        return shape_paths
+
+    @classmethod
+    def get_pivot_mode(cls):
+        if cmds.optionVar(exists=cls.PIVOT_MODE_OPTION_VAR):
+            mode = cmds.optionVar(q=cls.PIVOT_MODE_OPTION_VAR)
+            if mode in cls.PIVOT_MODES:
+                return mode
+        return cls.PIVOT_BOUNDS
+
+    @classmethod
+    def center_pivots(cls, nodes, mode=None):
+        """
+        Moves the rotate and scale pivots of every transform without moving it. The
+        bounds of all shapes below each transform are computed together in world space.
+
+        :param mode: PIVOT_BOUNDS (bounding box center), PIVOT_CENTROID (average of the
+            mesh vertices and curve CVs) or PIVOT_BOTTOM (center of the bounding box bottom),
+            the RBModelHelperPivotMode optionVar by default
+        """
+        mode = mode or cls.get_pivot_mode()
+        if np is None:
+            om.MGlobal.displayWarning("Model Helper: NumPy is missing, using CenterPivot.")
+            cmds.select(nodes, replace=True)
+            mel.eval("CenterPivot;")
+            return
+
+        start_time = perf_clock()
+        dag_paths = cls.get_transform_paths(nodes)
+        owners = []
+        shape_matrices = []
+        corners = []
+        point_sums = np.zeros((len(dag_paths), 3))
+        point_counts = np.zeros(len(dag_paths))
+        for index, dag_path in enumerate(dag_paths):
+            for shape_path in cls.get_descendant_shapes(dag_path):
+                world_matrix = cls.matrix_to_array(shape_path.inclusiveMatrix())
+                bounding_box = om.MFnDagNode(shape_path).boundingBox
+                low = list(bounding_box.min)[:3]
+                high = list(bounding_box.max)[:3]
+                owners.append(index)
+                shape_matrices.append(world_matrix)
+                corners.append([[(low, high)[x][0], (low, high)[y][1], (low, high)[z][2], 1.0]
+                                for x in (0, 1) for y in (0, 1) for z in (0, 1)])
+
+                if mode == cls.PIVOT_CENTROID:
+                    if shape_path.hasFn(om.MFn.kMesh):
+                        points = om.MFnMesh(shape_path).getPoints(om.MSpace.kObject)
+                    elif shape_path.hasFn(om.MFn.kNurbsCurve):
+                        points = om.MFnNurbsCurve(shape_path).cvPositions(om.MSpace.kObject)
+                    else:
+                        continue
+                    if len(points):
+                        point_sums[index] += np.array(points).dot(world_matrix)[:, :3].sum(axis=0)
+                        point_counts[index] += len(points)
+
+        if not owners:
+            om.MGlobal.displayWarning("Model Helper: nothing to center the pivot on.")
+            return
+
+        owners = np.array(owners)
+        world_corners = np.matmul(np.array(corners), np.array(shape_matrices))[:, :, :3]
+        low = np.full((len(dag_paths), 3), np.inf)
+        high = np.full((len(dag_paths), 3), -np.inf)
+        np.minimum.at(low, owners, world_corners.min(axis=1))
+        np.maximum.at(high, owners, world_corners.max(axis=1))
+
+        pivots = (low + high) * 0.5
+        if mode == cls.PIVOT_BOTTOM:
+            pivots[:, 1] = low[:, 1]
+        elif mode == cls.PIVOT_CENTROID:
+            has_points = point_counts > 0
+            pivots[has_points] = point_sums[has_points] / point_counts[has_points][:, None]
+
+        edit = ApiEdit("centerPivot")
+        for index, dag_path in enumerate(dag_paths):
+            if not np.isfinite(low[index, 0]):
+                continue
+            world_pivot = np.append(pivots[index], 1.0)
+            object_pivot = om.MPoint(*world_pivot.dot(cls.matrix_to_array(dag_path.inclusiveMatrixInverse()))[:3])
+            transformation = om.MFnTransform(dag_path).transformation()
+            transformation.setRotatePivot(object_pivot, om.MSpace.kTransform, True)
+            transformation.setScalePivot(object_pivot, om.MSpace.kTransform, True)
+            edit.set_transformation(dag_path, transformation)
+        edit.commit()
+
+        om.MGlobal.displayInfo("Model Helper centerPivot ({0}): {1} transforms, {2} shapes in {3:.1f} ms".format(
+            mode, len(edit), len(owners), (perf_clock() - start_time) * 1000.0))
+
+    @classmethod
+    def reset(cls, nodes):
+        """
+        Sets translate, rotate and scale back to their defaults. Pivots stay in object space.
+        """
+        start_time = perf_clock()
+        edit = ApiEdit("resetTransform")
+        fallback_nodes = []
+
+        dag_paths = cls.get_transform_paths(nodes)
+        for dag_path in dag_paths:
+            if dag_path.apiType() != om.MFn.kTransform or cls.has_locked_channels(dag_path):
+                fallback_nodes.append(dag_path.fullPathName())
+                continue
+            transformation = om.MFnTransform(dag_path).transformation()
+            reset = om.MTransformationMatrix()
+            reset.setRotatePivot(transformation.rotatePivot(om.MSpace.kTransform), om.MSpace.kTransform, False)
+            reset.setScalePivot(transformation.scalePivot(om.MSpace.kTransform), om.MSpace.kTransform, False)
+            edit.set_transformation(dag_path, reset)
+
+        with ModelHelperTransaction("rbModelHelperResetTransform"):
+            edit.commit()
+            for node in fallback_nodes:
+                cmds.makeIdentity(node, apply=False, t=True, r=True, s=True)
+
+        om.MGlobal.displayInfo("Model Helper resetTransform: {0} transforms ({1} via API, {2} via makeIdentity) in {3:.1f} ms".format(
+            len(dag_paths), len(dag_paths) - len(fallback_nodes), len(fallback_nodes), (perf_clock() - start_time) * 1000.0))
+
+
+class MeshDeduplicator(object):
+    """
+    Turns identical mesh shapes into instances of one shape.
+
+    Shapes are fingerprinted by everything an instance shares: topology, local-space
+    points, every UV and colour set, normals with their lock state and edge/vertex
+    creases, with the float values quantized to the tolerance. Before a shape joins a
+    group its data is compared with the group's master, so a hash collision or a value
+    on either side of a rounding step never merges different shapes.
+
+    A duplicate's shape is deleted and the group's master shape is instanced under
+    its transform, which keeps the transform, and its shading group is assigned
+    to the new instance. Shapes with construction history, outgoing geometry
+    connections, per-face materials or more than one shape per transform are left alone.
+    """
+
+    TOLERANCE = 1e-4
+
+    def __init__(self, meshes, tolerance=TOLERANCE):
+        start_time = perf_clock()
+        self.tolerance = tolerance
+        self.mesh_count = len(meshes)
+        self.skipped = 0
+        self.groups = self.find_groups(meshes)
+        self.analysis_time = perf_clock() - start_time
+
+    def quantize(self, values, width):
+        """
+        :return: hash of values rounded to the tolerance, width components per item
+        """
+        if np is not None:
+            array = np.array(values, dtype=np.float64).reshape(-1, width) if len(values) else np.zeros((0, width))
+            return hash(np.round(array / self.tolerance).astype(np.int64).tobytes())
+        return hash(tuple(int(round(value / self.tolerance)) for item in values for value in (item if width > 1 else (item,))))
+
+    @staticmethod
+    def get_mesh_data(mesh_fn):
+        """
+        :return: [(label, values, exact)] for all the data an instance would share, exact
+            for indices, otherwise floats compared within the tolerance
+        """
+        counts, connects = mesh_fn.getVertices()
+        data = [
+            ("counts", list(counts), True),
+            ("connects", list(connects), True),
+            ("points", [value for point in mesh_fn.getPoints(om.MSpace.kObject) for value in (point.x, point.y, point.z)], False),
+        ]
+        for uv_set in mesh_fn.getUVSetNames():
+            uv_counts, uv_ids = mesh_fn.getAssignedUVs(uv_set)
+            us, vs = mesh_fn.getUVs(uv_set)
+            data += [("uv ids " + uv_set, list(uv_ids), True), ("uvs " + uv_set, list(us) + list(vs), False)]
+        for color_set in mesh_fn.getColorSetNames():
+            colors = mesh_fn.getFaceVertexColors(color_set)
+            data.append(("colors " + color_set, [value for color in colors for value in (color.r, color.g, color.b, color.a)], False))
+
+        normal_counts, normal_ids = mesh_fn.getNormalIds()
+        data += [
+            ("normal ids", list(normal_ids), True),
+            ("normals", [value for normal in mesh_fn.getNormals(om.MSpace.kObject) for value in (normal.x, normal.y, normal.z)], False),
+            ("locked normals", [normal_id for normal_id in range(mesh_fn.numNormals) if mesh_fn.isNormalLocked(normal_id)], True),
+        ]
+        for label, get_creases in (("edge creases", mesh_fn.getCreaseEdges), ("vertex creases", mesh_fn.getCreaseVertices)):
+            try:
+                ids, values = get_creases()
+            except RuntimeError:
+                ids, values = [], []
+            data += [(label + " ids", list(ids), True), (label, list(values), False)]
+        return data
+
+    def get_fingerprint(self, data):
+        return tuple((label, len(values), hash(tuple(values)) if exact else self.quantize(values, 1))
+                     for label, values, exact in data)
+
+    def matches(self, data, master_data):
+        """
+        True when data equals master_data, floats within the tolerance.
+        """
+        if len(data) != len(master_data):
+            return False
+        for (label, values, exact), (master_label, master_values, master_exact) in zip(data, master_data):
+            if label != master_label or len(values) != len(master_values):
+                return False
+            if exact:
+                if values != master_values:
+                    return False
+            elif np is not None:
+                if len(values) and not np.allclose(values, master_values, rtol=0.0, atol=self.tolerance):
+                    return False
+            elif any(abs(value - master_value) > self.tolerance for value, master_value in zip(values, master_values)):
+                return False
+        return True
+
+    @staticmethod
+    def get_shading_group(mesh_fn, dag_path):
+        """
+        :return: (eligible, shading group name or None), per-face assignments are not eligible
+        """
+        shaders, face_shaders = mesh_fn.getConnectedShaders(dag_path.instanceNumber())
+        if len(shaders) > 1:
+            return False, None
+        if len(shaders) == 1:
+            return True, om.MFnDependencyNode(shaders[0]).name()
+        return True, None
+
+    @staticmethod
+    def can_replace(dag_path):
+        """
+        True when the shape can be deleted and replaced by an instance.
+        """
+        if dag_path.isInstanced():
+            return False
+        transform_path = om.MDagPath(dag_path)
+        transform_path.pop()
+        if transform_path.numberOfShapesDirectlyBelow() != 1:
+            return False
+        node_fn = om.MFnDependencyNode(dag_path.node())
+        if node_fn.findPlug("inMesh", False).isDestination or node_fn.findPlug("outMesh", False).isSource:
+            return False
+        return node_fn.findPlug("worldMesh", False).numConnectedElements() == 0
+
+    def find_groups(self, meshes):
+        groups = {}
+        for mesh in meshes:
+            dag_path = om.MDagPath.getAPathTo(mesh)
+            data = self.get_mesh_data(om.MFnMesh(dag_path))
+            groups.setdefault(self.get_fingerprint(data), []).append((dag_path, data))
+
+        result = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            # Keep an already instanced shape as the master when there is one.
+            members.sort(key=lambda member: not member[0].isInstanced())
+            master, master_data = members[0]
+            duplicates = []
+            for dag_path, data in members[1:]:
+                mesh_fn = om.MFnMesh(dag_path)
+                eligible, shading_group = self.get_shading_group(mesh_fn, dag_path)
+                if eligible and self.can_replace(dag_path) and self.matches(data, master_data):
+                    duplicates.append((dag_path, shading_group))
+                else:
+                    self.skipped += 1
+            if duplicates:
+                result.append((master, duplicates))
+        return result
+
+    @staticmethod
+    def estimate_bytes(mesh_fn):
+        face_vertices = mesh_fn.numFaceVertices
+        # float3 points, int connects, UV ids and float3 normals per face vertex, float2 UVs
+        return mesh_fn.numVertices * 12 + face_vertices * 20 + mesh_fn.numUVs() * 8
+
+    def report(self, applied=False):
+        duplicates = [duplicate for master, group in self.groups for duplicate in group]
+        vertices = 0
+        faces = 0
+        memory = 0
+        for master, group in self.groups:
+            mesh_fn = om.MFnMesh(master)
+            vertices += mesh_fn.numVertices * len(group)
+            faces += mesh_fn.numPolygons * len(group)
+            memory += self.estimate_bytes(mesh_fn) * len(group)
+
+        om.MGlobal.displayInfo(
+            "Model Helper dedupe{0}: {1} meshes, {2} groups, {3} duplicates {4} instances, {5} skipped. "
+            "{6} vertices and {7} faces, ~{8:.2f} MB of mesh data {9}. Analysis took {10:.1f} ms.".format(
+                "" if applied else " dry run", self.mesh_count, len(self.groups), len(duplicates),
+                "turned into" if applied else "can become", self.skipped, vertices, faces,
+                memory / (1024.0 * 1024.0), "saved" if applied else "to save", self.analysis_time * 1000.0))
+
+    def apply(self):
+        start_time = perf_clock()
+        shapes = []
+        instances = []
+        for master, group in self.groups:
+            master_name = master.fullPathName()
+            master_short_name = master_name.rsplit("|", 1)[-1]
+            for dag_path, shading_group in group:
+                transform_path = om.MDagPath(dag_path)
+                transform_path.pop()
+                shapes.append(dag_path.fullPathName())
+                instances.append((master_name, transform_path.fullPathName(), master_short_name, shading_group))
+        if not shapes:
+            self.report(applied=True)
+            return
+
+        with ModelHelperTransaction("rbModelHelperDedupe"):
+            cmds.delete(shapes)
+            shading_groups = {}
+            for master_name, transform_name, master_short_name, shading_group in instances:
+                cmds.parent(master_name, transform_name, shape=True, addObject=True)
+                if shading_group:
+                    shading_groups.setdefault(shading_group, []).append(transform_name + "|" + master_short_name)
+            for shading_group, instance_names in shading_groups.items():
+                cmds.sets(instance_names, edit=True, forceElement=shading_group)
+
+        self.analysis_time += perf_clock() - start_time
+        self.report(applied=True)
+
+
+class ReplaceEngine(object):
+    """
+    Replaces many objects with instances or copies of one source object.
+
+    Target matrices, parents and names are read in one pass up front. The new
+    objects are created with MFnDagNode.duplicate, reparented with one MDagModifier,
+    given their matrices, assigned the source's shading groups, and the targets
+    are deleted with a second modifier. The whole run is one ApiEdit undo step.
+    """
+
+    INSTANCE_OPTION_VAR = "RBModelHelperReplaceInstance"
+    KEEP_PARENT_OPTION_VAR = "RBModelHelperReplaceKeepParent"
+    KEEP_NAMES_OPTION_VAR = "RBModelHelperReplaceKeepNames"
+    OPTIONS = (
+        ("Replace With Instances", INSTANCE_OPTION_VAR, True),
+        ("Keep Parenting", KEEP_PARENT_OPTION_VAR, True),
+        ("Keep Names", KEEP_NAMES_OPTION_VAR, False),
+    )
+
+    @staticmethod
+    def get_option(option_var, default):
+        if cmds.optionVar(exists=option_var):
+            return bool(cmds.optionVar(q=option_var))
+        return default
+
+    @classmethod
+    def replace_selected(cls):
+        """
+        Replaces the selected objects with the last selected one, using the optionVar settings.
+        """
+        selection = cmds.ls(selection=True, long=True, transforms=True)
+        if len(selection) < 2:
+            om.MGlobal.displayWarning("Model Helper replace: select the objects to replace, then the replacement last.")
+            return
+        engine = cls(selection[-1], selection[:-1],
+                     instance=cls.get_option(cls.INSTANCE_OPTION_VAR, True),
+                     keep_parent=cls.get_option(cls.KEEP_PARENT_OPTION_VAR, True),
+                     keep_names=cls.get_option(cls.KEEP_NAMES_OPTION_VAR, False))
+        engine.run()
+        if engine.created:
+            cmds.select([om.MDagPath.getAPathTo(node).fullPathName() for node in engine.created], replace=True)
+
+    def __init__(self, source, targets, instance=True, keep_parent=True, keep_names=False):
+        selection = om.MSelectionList()
+        selection.add(source)
+        self.source_path = selection.getDagPath(0)
+        self.instance = instance
+        self.keep_parent = keep_parent
+        self.keep_names = keep_names
+        self.created = []
+        self.delete_modifier = None
+        self.skipped = 0
+
+        source_name = self.source_path.fullPathName()
+        self.shading_groups = self.get_shading_groups(self.source_path)
+
+        self.targets = []
+        for target in targets:
+            selection = om.MSelectionList()
+            selection.add(target)
+            target_path = selection.getDagPath(0)
+            target_name = target_path.fullPathName()
+            # Deleting an ancestor of the source, or a target with children, would take other objects with it.
+            if target_name == source_name or source_name.startswith(target_name + "|") or \
+                    TransformEngine.get_child_transform_paths(target_path):
+                self.skipped += 1
+                continue
+
+            parent_path = om.MDagPath(target_path)
+            parent_path.pop()
+            if keep_parent and parent_path.length():
+                parent = parent_path.node()
+                transformation = om.MFnTransform(target_path).transformation()
+            else:
+                parent = om.MObject.kNullObj
+                transformation = om.MTransformationMatrix(target_path.inclusiveMatrix())
+            self.targets.append((target_path.node(), parent, transformation, target_name.rsplit("|", 1)[-1]))
+
+    @staticmethod
+    def get_shading_groups(source_path):
+        """
+        :return: (shape index, shading group) for the source's meshes with a single material
+        """
+        shading_groups = []
+        for shape_index in range(source_path.numberOfShapesDirectlyBelow()):
+            shape_path = om.MDagPath(source_path)
+            shape_path.extendToShape(shape_index)
+            if shape_path.hasFn(om.MFn.kMesh):
+                shaders, face_shaders = om.MFnMesh(shape_path).getConnectedShaders(shape_path.instanceNumber())
+                if len(shaders) == 1:
+                    shading_groups.append((shape_index, shaders[0]))
+                elif len(shaders) > 1:
+                    om.MGlobal.displayWarning("Model Helper: per-face materials on {0} are not copied".format(
+                        source_path.fullPathName()))
+        return shading_groups
+
+    @staticmethod
+    def create_duplicates(source_path, instance, placements, shading_groups):
+        """
+        Not undoable on its own, run it from an ApiEdit action.
+
+        :param placements: (parent MObject or MObject.kNullObj, MTransformationMatrix) per duplicate
+        :return: the new transform MObjects
+        """
+        source_fn = om.MFnDagNode(source_path)
+        created = [source_fn.duplicate(False, instance) for placement in placements]
+
+        reparent_modifier = om.MDagModifier()
+        for node, (parent, transformation) in zip(created, placements):
+            reparent_modifier.reparentNode(node, parent)
+        reparent_modifier.doIt()
+
+        members = {}
+        for node, (parent, transformation) in zip(created, placements):
+            dag_path = om.MDagPath.getAPathTo(node)
+            om.MFnTransform(dag_path).setTransformation(transformation)
+            for shape_index, shading_group in shading_groups:
+                shape_path = om.MDagPath(dag_path)
+                shape_path.extendToShape(shape_index)
+                members.setdefault(om.MObjectHandle(shading_group).hashCode(), (shading_group, om.MSelectionList()))[1].add(shape_path)
+        for shading_group, member_list in members.values():
+            om.MFnSet(shading_group).addMembers(member_list)
+        return created
+
+    @staticmethod
+    def delete_nodes(nodes):
+        modifier = om.MDagModifier()
+        for node in nodes:
+            if om.MObjectHandle(node).isAlive():
+                modifier.deleteNode(node)
+        modifier.doIt()
+
+    def redo(self):
+        placements = [(parent, transformation) for target, parent, transformation, name in self.targets]
+        self.created = self.create_duplicates(self.source_path, self.instance, placements, self.shading_groups)
+
+        self.delete_modifier = om.MDagModifier()
+        for target, parent, transformation, name in self.targets:
+            self.delete_modifier.deleteNode(target)
+        self.delete_modifier.doIt()
+
+        if self.keep_names:
+            for node, (target, parent, transformation, name) in zip(self.created, self.targets):
+                om.MFnDependencyNode(node).setName(name)
+
+    def undo(self):
+        self.delete_nodes(self.created)
+        self.delete_modifier.undoIt()
+
+    def run(self):
+        start_time = perf_clock()
+        if self.targets:
+            edit = ApiEdit("replace")
+            edit.add(self.redo, self.undo)
+            edit.commit()
+
+        elapsed = perf_clock() - start_time
+        om.MGlobal.displayInfo("Model Helper replace: {0} objects replaced with {1} in {2:.1f} ms ({3:.0f} objects/s), {4} skipped".format(
+            len(self.targets), "instances" if self.instance else "copies", elapsed * 1000.0,
+            len(self.targets) / elapsed if elapsed > 0.0 else 0.0, self.skipped))
+
+
+class MeshTopology(object):
+    """
+    Adjacency of one mesh as flat NumPy arrays, CSR style: the items of row i of a
+    table are items[offsets[i]:offsets[i + 1]].
+
+    Half edges are the face corners, half edge h runs from face_vertices[h] to
+    face_vertices[half_edge_next[h]] inside face half_edge_face[h]. Edges are numbered
+    by sorted vertex pair, get_maya_edges maps them to Maya's edge indices.
+
+    face_offsets, face_vertices       face -> vertices
+    vertex_offsets, vertex_neighbors  vertex -> vertices
+    edge_offsets, edge_faces          edge -> faces
+    edge_half_edges                   edge -> half edges, in the same rows as edge_faces
+    edge_vertices                     (edges, 2) vertex pairs
+    half_edge_prev, half_edge_twin    the previous half edge in the face, the opposite half edge
+                                      (-1 on borders and non-manifold edges)
+    border_vertices                   mask of vertices on a border edge
+    """
+
+    def __init__(self, mesh_fn):
+        self.vertex_count = mesh_fn.numVertices
+        face_sizes, face_vertices = mesh_fn.getVertices()
+        face_sizes = np.array(face_sizes, dtype=np.int64)
+        self.face_vertices = np.array(face_vertices, dtype=np.int64)
+        self.face_offsets = np.concatenate(([0], np.cumsum(face_sizes)))
+        self.maya_edges = None
+
+        half_edge_count = len(self.face_vertices)
+        self.half_edge_face = np.repeat(np.arange(len(face_sizes)), face_sizes)
+        self.half_edge_next = np.arange(1, half_edge_count + 1)
+        self.half_edge_next[self.face_offsets[1:] - 1] = self.face_offsets[:-1]
+        self.half_edge_prev = np.empty(half_edge_count, dtype=np.int64)
+        self.half_edge_prev[self.half_edge_next] = np.arange(half_edge_count)
+
+        starts = self.face_vertices
+        ends = self.face_vertices[self.half_edge_next]
+        edge_keys, self.half_edge_edge, face_counts = np.unique(
+            np.minimum(starts, ends) * self.vertex_count + np.maximum(starts, ends), return_inverse=True, return_counts=True)
+        self.half_edge_edge = self.half_edge_edge.ravel()
+        self.edge_vertices = np.column_stack((edge_keys // self.vertex_count, edge_keys % self.vertex_count))
+
+        self.edge_half_edges = np.argsort(self.half_edge_edge, kind="stable")
+        self.edge_offsets = np.concatenate(([0], np.cumsum(face_counts)))
+        self.edge_faces = self.half_edge_face[self.edge_half_edges]
+
+        self.half_edge_twin = np.full(half_edge_count, -1, dtype=np.int64)
+        manifold = face_counts == 2
+        first = self.edge_half_edges[self.edge_offsets[:-1][manifold]]
+        second = self.edge_half_edges[self.edge_offsets[:-1][manifold] + 1]
+        self.half_edge_twin[first] = second
+        self.half_edge_twin[second] = first
+
+        sources = np.concatenate((self.edge_vertices[:, 0], self.edge_vertices[:, 1]))
+        targets = np.concatenate((self.edge_vertices[:, 1], self.edge_vertices[:, 0]))
+        self.vertex_neighbors = targets[np.argsort(sources, kind="stable")]
+        self.vertex_offsets = np.concatenate(([0], np.cumsum(np.bincount(sources, minlength=self.vertex_count))))
+
+        self.border_vertices = np.zeros(self.vertex_count, dtype=bool)
+        self.border_vertices[self.edge_vertices[face_counts == 1].ravel()] = True
+
+    @property
+    def nbytes(self):
+        return sum(value.nbytes for value in self.__dict__.values() if isinstance(value, np.ndarray))
+
+    def get_vertex_pairs(self):
+        """
+        :return: (vertex, neighbour) arrays listing every edge in both directions
+        """
+        return np.repeat(np.arange(self.vertex_count), np.diff(self.vertex_offsets)), self.vertex_neighbors
+
+    def get_neighbors(self, vertices):
+        """
+        :return: (row, neighbour) arrays listing the neighbours of every vertex of vertices,
+            row being the position of the vertex in vertices
+        """
+        counts = self.vertex_offsets[vertices + 1] - self.vertex_offsets[vertices]
+        rows = np.repeat(np.arange(len(vertices)), counts)
+        starts = np.repeat(self.vertex_offsets[vertices] - np.cumsum(counts) + counts, counts)
+        return rows, self.vertex_neighbors[starts + np.arange(len(rows))]
+
+    def get_maya_edges(self, shape_path):
+        """
+        :return: Maya's edge index for each edge, read with MItMeshEdge the first time
+        """
+        if self.maya_edges is None:
+            maya_keys = np.empty(len(self.edge_vertices), dtype=np.int64)
+            edge_iter = om.MItMeshEdge(shape_path)
+            while not edge_iter.isDone():
+                start, end = edge_iter.vertexId(0), edge_iter.vertexId(1)
+                maya_keys[edge_iter.index()] = min(start, end) * self.vertex_count + max(start, end)
+                edge_iter.next()
+            edge_keys = self.edge_vertices[:, 0] * self.vertex_count + self.edge_vertices[:, 1]
+            self.maya_edges = np.argsort(maya_keys)[np.searchsorted(np.sort(maya_keys), edge_keys)]
+        return self.maya_edges
+
+    def matches(self, mesh_fn):
+        return mesh_fn.numVertices == self.vertex_count and mesh_fn.numFaceVertices == len(self.face_vertices) and \
+            mesh_fn.numPolygons == len(self.face_offsets) - 1
+
+
+class TopologyCache(object):
+    """
+    Keeps a MeshTopology per mesh shape between tool runs.
+
+    An entry is marked dirty when the shape's inMesh or outMesh is dirtied, when inMesh
+    is (dis)connected, or when the vertex/face counts no longer match. Watching outMesh
+    covers meshes without history, which are edited in place: flipping or spinning an
+    edge keeps every count. A dirty entry is rebuilt only if the face vertex list
+    actually changed, so point edits and deformation keep the cache.
+    Deleted shapes and scene changes drop their entries. The least recently used
+    entries are evicted above the RBModelHelperTopologyCacheMB optionVar (256 MB).
+    """
+
+    MEMORY_OPTION_VAR = "RBModelHelperTopologyCacheMB"
+    DEFAULT_MEMORY_MB = 256
+    DIRTY_PLUGS = ("inMesh", "outMesh")
+
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.scene_callbacks = []
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_shape_path(dag_path):
+        shape_path = om.MDagPath(dag_path)
+        if shape_path.apiType() == om.MFn.kTransform:
+            shape_path.extendToShape()
+        return shape_path
+
+    def get_memory_limit(self):
+        megabytes = self.DEFAULT_MEMORY_MB
+        if cmds.optionVar(exists=self.MEMORY_OPTION_VAR):
+            megabytes = cmds.optionVar(q=self.MEMORY_OPTION_VAR)
+        return megabytes * 1024 * 1024
+
+    @property
+    def nbytes(self):
+        return sum(entry["topology"].nbytes for entry in self.entries.values())
+
+    def get(self, shape_path):
+        """
+        :return: the MeshTopology of the mesh shape at shape_path
+        """
+        node = shape_path.node()
+        key = om.MObjectHandle(node).hashCode()
+        mesh_fn = om.MFnMesh(shape_path)
+        entry = self.entries.get(key)
+        if entry is not None and not entry["handle"].isValid():
+            self.remove(key)
+            entry = None
+
+        if entry is not None:
+            topology = entry["topology"]
+            if entry["dirty"] or not topology.matches(mesh_fn):
+                face_sizes, face_vertices = mesh_fn.getVertices()
+                if topology.matches(mesh_fn) and np.array_equal(np.array(face_vertices, dtype=np.int64), topology.face_vertices):
+                    self.revalidations += 1
+                else:
+                    entry["topology"] = MeshTopology(mesh_fn)
+                    self.misses += 1
+                entry["dirty"] = False
+            else:
+                self.hits += 1
+            self.entries[key] = self.entries.pop(key)
+            return entry["topology"]
+
+        self.misses += 1
+        if not self.scene_callbacks:
+            self.scene_callbacks = [om.MSceneMessage.addCallback(message, self.clear)
+                                    for message in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen)]
+        self.entries[key] = {
+            "handle": om.MObjectHandle(node),
+            "topology": MeshTopology(mesh_fn),
+            "dirty": False,
+            "callbacks": [
+                om.MNodeMessage.addNodeDirtyPlugCallback(node, self.on_plug_dirty, key),
+                om.MNodeMessage.addAttributeChangedCallback(node, self.on_attribute_changed, key),
+                om.MNodeMessage.addNodePreRemovalCallback(node, self.on_node_removed, key),
+            ],
+        }
+        self.evict()
+        return self.entries[key]["topology"]
+
+    def evict(self):
+        limit = self.get_memory_limit()
+        while len(self.entries) > 1 and self.nbytes > limit:
+            self.remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def mark_dirty(self, key):
+        if key in self.entries:
+            self.entries[key]["dirty"] = True
+
+    def on_plug_dirty(self, node, plug, key):
+        if plug.partialName(useLongNames=True) in self.DIRTY_PLUGS:
+            self.mark_dirty(key)
+
+    def on_attribute_changed(self, message, plug, other_plug, key):
+        if message & (om.MNodeMessage.kConnectionMade | om.MNodeMessage.kConnectionBroken) and \
+                plug.partialName(useLongNames=True) == "inMesh":
+            self.mark_dirty(key)
+
+    def on_node_removed(self, node, key):
+        self.remove(key)
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            om.MMessage.removeCallbacks(entry["callbacks"])
+
+    def clear(self, *args):
+        for key in list(self.entries):
+            self.remove(key)
+        if self.scene_callbacks:
+            om.MMessage.removeCallbacks(self.scene_callbacks)
+            self.scene_callbacks = []
+
+    def report(self):
+        lookups = self.hits + self.misses + self.revalidations
+        om.MGlobal.displayInfo(
+            "Model Helper topology cache: {0} meshes, {1:.1f} MB, {2} hits, {3} revalidated, {4} misses ({5:.0f}% hit rate), {6} evicted".format(
+                len(self.entries), self.nbytes / (1024.0 * 1024.0), self.hits, self.revalidations, self.misses,
+                100.0 * (self.hits + self.revalidations) / lookups if lookups else 0.0, self.evictions))
+
+
+class EdgeLoopWalker(object):
+    """
+    Grows selected edges into full edge loops or rings on the cached MeshTopology.
+
+    Each seed starts a walker in both directions and all walkers advance together,
+    one NumPy step for the whole batch, until they stop or reach an edge that is
+    already in the result, which also closes loops and merges walkers on the same
+    loop. Loops stop at poles (vertices without exactly four edges) and follow
+    borders across three-edge border vertices. Rings stop at faces that are not
+    quads and at borders.
+    """
+
+    LOOP = "loop"
+    RING = "ring"
+
+    def __init__(self, topology):
+        self.topology = topology
+        self.valence = np.diff(topology.vertex_offsets)
+        self.face_sizes = np.diff(topology.face_offsets)
+
+    def loop_step(self, half_edges):
+        topology = self.topology
+        next_half_edges = topology.half_edge_next[half_edges]
+        vertices = topology.face_vertices[next_half_edges]
+        twins = topology.half_edge_twin[next_half_edges]
+        keep = (twins >= 0) & (self.valence[vertices] == 4) & ~topology.border_vertices[vertices]
+        return np.where(keep, topology.half_edge_next[np.maximum(twins, 0)], -1)
+
+    def border_step(self, half_edges, forward=True):
+        topology = self.topology
+        turn = topology.half_edge_next if forward else topology.half_edge_prev
+        vertices = topology.face_vertices[topology.half_edge_next[half_edges] if forward else half_edges]
+        candidates = np.where(self.valence[vertices] == 3, turn[half_edges], -1)
+        for rotation in range(3):
+            twins = np.where(candidates >= 0, topology.half_edge_twin[candidates], -1)
+            inner = twins >= 0
+            if not inner.any():
+                break
+            candidates[inner] = turn[twins[inner]]
+        return candidates
+
+    def ring_step(self, half_edges):
+        quads = self.face_sizes[self.topology.half_edge_face[half_edges]] == 4
+        return np.where(quads, self.topology.half_edge_next[self.topology.half_edge_next[half_edges]], -1)
+
+    def walk(self, selected, half_edges, step, cross=False):
+        """
+        Advances all walkers until every one has stopped, marking their edges in selected.
+
+        :param cross: continue from the twin of each new half edge, for rings
+        """
+        while len(half_edges):
+            marked = step(half_edges)
+            marked = marked[marked >= 0]
+            edges, first = np.unique(self.topology.half_edge_edge[marked], return_index=True)
+            new = ~selected[edges]
+            selected[edges[new]] = True
+            half_edges = marked[first[new]]
+            if cross:
+                half_edges = self.topology.half_edge_twin[half_edges]
+                half_edges = half_edges[half_edges >= 0]
+
+    def expand(self, edges, mode):
+        """
+        :param edges: seed edge indices in MeshTopology numbering
+        :return: sorted edge indices of the loops or rings through the seeds
+        """
+        topology = self.topology
+        selected = np.zeros(len(topology.edge_vertices), dtype=bool)
+        selected[edges] = True
+        if mode == self.RING:
+            self.walk(selected, np.flatnonzero(selected[topology.half_edge_edge]), self.ring_step, cross=True)
+            return np.flatnonzero(selected)
+
+        edges = np.unique(edges)
+        face_counts = np.diff(topology.edge_offsets)[edges]
+        first = topology.edge_half_edges[topology.edge_offsets[edges]]
+        interior = first[face_counts == 2]
+        border = first[face_counts == 1]
+        self.walk(selected, np.concatenate((interior, topology.half_edge_twin[interior])), self.loop_step)
+        self.walk(selected, border, partial(self.border_step, forward=True))
+        self.walk(selected, border, partial(self.border_step, forward=False))
+        return np.flatnonzero(selected)
+
+    @classmethod
+    def expand_selection(cls, mode):
+        """
+        :return: [(mesh shape name, Maya edge indices)] for the selected edges grown into
+            loops or rings, None when the selection holds anything but mesh edges
+        """
+        start_time = perf_clock()
+        selection = om.MGlobal.getActiveSelectionList()
+        shapes = OrderedDict()
+        for index in range(selection.length()):
+            try:
+                dag_path, component = selection.getComponent(index)
+            except TypeError:
+                return None
+            if component.apiType() != om.MFn.kMeshEdgeComponent:
+                return None
+            shape_path = TopologyCache.get_shape_path(dag_path)
+            shape_path, seeds = shapes.setdefault(shape_path.fullPathName(), (shape_path, []))
+            seeds.extend(om.MFnSingleIndexedComponent(component).getElements())
+
+        groups = []
+        seed_count = 0
+        edge_count = 0
+        for name, (shape_path, seeds) in shapes.items():
+            topology = TopologyCache.shared().get(shape_path)
+            maya_edges = topology.get_maya_edges(shape_path)
+            edge_ids = np.empty_like(maya_edges)
+            edge_ids[maya_edges] = np.arange(len(maya_edges))
+            edges = np.sort(maya_edges[cls(topology).expand(edge_ids[np.array(seeds, dtype=np.int64)], mode)])
+            groups.append((name, edges))
+            seed_count += len(seeds)
+            edge_count += len(edges)
+
+        om.MGlobal.displayInfo("Model Helper edge {0}: {1} seeds -> {2} edges on {3} meshes in {4:.1f} ms".format(
+            mode, seed_count, edge_count, len(groups), (perf_clock() - start_time) * 1000.0))
+        return groups
+
+    @staticmethod
+    def get_component_names(shape_name, indices, component="e"):
+        """
+        :return: component names with consecutive indices merged into ranges, like mesh.e[4:9]
+        """
+        if not len(indices):
+            return []
+        breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+        starts = indices[np.concatenate(([0], breaks))]
+        ends = indices[np.concatenate((breaks - 1, [len(indices) - 1]))]
+        return ["{0}.{1}[{2}]".format(shape_name, component, start) if start == end else
+                "{0}.{1}[{2}:{3}]".format(shape_name, component, start, end) for start, end in zip(starts, ends)]
+
+
+class PointLocator(object):
+    """
+    Nearest point lookups within a tolerance. Uses SciPy's cKDTree when it is installed,
+    otherwise a hashed grid of cells twice the tolerance wide searched with NumPy. A point
+    within the tolerance of a query is then in the query's cell or in one of the 7 cells
+    on the sides of the query's half of its cell.
+    """
+
+    NEIGHBOR_OFFSETS = np.array(np.meshgrid((0, 1), (0, 1), (0, 1))).reshape(3, -1).T[1:] if np is not None else None
+
+    def __init__(self, points, tolerance):
+        self.points = points
+        self.tolerance = tolerance
+        self.tree = cKDTree(points) if cKDTree is not None else None
+        if self.tree is None:
+            keys = self.get_cell_keys(np.floor(points / (2.0 * tolerance)).astype(np.int64))
+            self.order = np.argsort(keys, kind="stable")
+            self.sorted_keys = keys[self.order]
+
+    @staticmethod
+    def get_cell_keys(cells):
+        return cells[:, 0] * 73856093 ^ cells[:, 1] * 19349663 ^ cells[:, 2] * 83492791
+
+    def query(self, queries):
+        """
+        :return: index of the nearest point within the tolerance for each query, -1 for none
+        """
+        if self.tree is not None:
+            distances, indices = self.tree.query(queries, distance_upper_bound=self.tolerance)
+            indices[~np.isfinite(distances)] = -1
+            return indices
+
+        nearest = np.full(len(queries), -1, dtype=np.int64)
+        nearest_distances = np.full(len(queries), np.inf)
+        scaled = queries / (2.0 * self.tolerance)
+        cells = np.floor(scaled).astype(np.int64)
+        sides = np.where(scaled - cells < 0.5, -1, 1)
+        pending = np.arange(len(queries))
+        # The query's own cell first, the neighbouring cells only for the queries it did not answer.
+        for offsets in (np.zeros((1, 3), dtype=np.int64), self.NEIGHBOR_OFFSETS):
+            for offset in offsets:
+                keys = self.get_cell_keys(cells[pending] + sides[pending] * offset)
+                by_key = np.argsort(keys, kind="stable")
+                searched = pending[by_key]
+                positions = np.searchsorted(self.sorted_keys, keys[by_key], side="left")
+                ends = np.searchsorted(self.sorted_keys, keys[by_key], side="right")
+                active = np.flatnonzero(positions < ends)
+                while len(active):
+                    candidates = self.order[positions[active]]
+                    queried = searched[active]
+                    distances = np.sqrt(((self.points[candidates] - queries[queried]) ** 2).sum(axis=1))
+                    better = (distances <= self.tolerance) & (distances < nearest_distances[queried])
+                    nearest[queried[better]] = candidates[better]
+                    nearest_distances[queried[better]] = distances[better]
+                    positions[active] += 1
+                    active = active[positions[active] < ends[active]]
+            pending = pending[nearest[pending] < 0]
+        return nearest
+
+
+class SymmetryMap(object):
+    """
+    Vertex mirror correspondence per mesh, built once and reused by Symmetrize and Flip.
+
+    The mirror plane follows Maya's symmetry settings (object or world space, X/Y/Z,
+    see the Symmetry toggle). Each vertex is matched to the vertex nearest its
+    reflection within the RBModelHelperSymmetryTolerance optionVar. Vertices left
+    unmatched, as on slightly asymmetric scans, are then matched through topology:
+    the mirror of a matched neighbour has the candidates as its neighbours, and the
+    one closest to the reflection wins. Only pairs that map back to each other are kept.
+    The topological matching grows one ring of vertices per pass, each pass being a
+    few array gathers over the MeshTopology rows.
+
+    Maps are cached per shape, space, axis and tolerance and stay valid as long as the shape's
+    MeshTopology does, so sculpting does not invalidate them and applying one is a
+    single array remap. World space maps are also tied to the shape's world matrix:
+    moving, rotating or scaling the object moves it against the mirror plane, so the
+    map is built again.
+
+    Applying reads the points once, scatters the ones that move into a NumPy copy
+    of them, builds the new MPointArray from that copy in one call and hands the
+    points read to ApiEdit as the undo state.
+    """
+
+    TOLERANCE_OPTION_VAR = "RBModelHelperSymmetryTolerance"
+    DEFAULT_TOLERANCE = 0.001
+    MAX_ENTRIES = 32
+    SYMMETRIZE = "symmetrize"
+    FLIP = "flip"
+
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.builds = 0
+        self.hits = 0
+
+    @classmethod
+    def get_tolerance(cls):
+        if cmds.optionVar(exists=cls.TOLERANCE_OPTION_VAR):
+            return cmds.optionVar(q=cls.TOLERANCE_OPTION_VAR)
+        return cls.DEFAULT_TOLERANCE
+
+    @staticmethod
+    def get_space():
+        """
+        :return: ("world" or "object", axis index) from Maya's symmetry settings
+        """
+        about = cmds.symmetricModelling(q=True, about=True)
+        axis = cmds.symmetricModelling(q=True, axis=True)
+        return "world" if about == "world" else "object", "xyz".index(axis) if axis in ("x", "y", "z") else 0
+
+    @staticmethod
+    def reflect(points, axis):
+        reflected = points.copy()
+        reflected[:, axis] *= -1.0
+        return reflected
+
+    @classmethod
+    def build(cls, topology, points, axis, tolerance):
+        """
+        :param points: (n, 3) positions in symmetry space
+        :return: mirror vertex index per vertex, -1 where there is none
+        """
+        reflected = cls.reflect(points, axis)
+        mirror = PointLocator(points, tolerance).query(reflected)
+        mapped = mirror >= 0
+        mirror[mapped & (mirror[np.maximum(mirror, 0)] != np.arange(len(mirror)))] = -1
+
+        unmatched = mirror < 0
+        front = np.flatnonzero(unmatched)
+        while len(front):
+            # one pass grows the matched area by a ring, as array gathers over the CSR rows,
+            # and the next pass only looks at the unmatched vertices next to the new pairs
+            vertices = front
+            rows, neighbors = topology.get_neighbors(vertices)
+            keep = ~unmatched[neighbors]
+            vertices, partners = vertices[rows[keep]], mirror[neighbors[keep]]
+            rows, candidates = topology.get_neighbors(partners)
+            keep = unmatched[candidates]
+            vertices, candidates = vertices[rows[keep]], candidates[keep]
+            if not len(vertices):
+                break
+            waiting = np.unique(vertices)
+            distances = ((reflected[candidates] - points[vertices]) ** 2).sum(axis=1)
+
+            closest = cls.get_closest(vertices, distances)
+            vertices, candidates, distances = vertices[closest], candidates[closest], distances[closest]
+            closest = cls.get_closest(candidates, distances)
+            first = np.minimum(vertices[closest], candidates[closest])
+            second = np.maximum(vertices[closest], candidates[closest])
+            distances = distances[closest]
+            unique = np.unique(first * len(mirror) + second, return_index=True)[1]
+            first, second, distances = first[unique], second[unique], distances[unique]
+
+            # a vertex picked by two pairs waits for the next pass
+            counts = np.bincount(np.concatenate((first, second[first != second])), minlength=len(mirror))
+            accepted = (counts[first] == 1) & (counts[second] == 1)
+            if not accepted.any():
+                accepted = np.arange(len(first)) == distances.argmin()
+            first, second = first[accepted], second[accepted]
+            mirror[first] = second
+            mirror[second] = first
+            unmatched[first] = False
+            unmatched[second] = False
+            neighbors = topology.get_neighbors(np.concatenate((first, second)))[1]
+            front = np.union1d(waiting[unmatched[waiting]], neighbors[unmatched[neighbors]])
+        return mirror
+
+    @staticmethod
+    def get_closest(groups, distances):
+        """
+        :return: index of the smallest distance of each group
+        """
+        order = np.lexsort((distances, groups))
+        groups = groups[order]
+        return order[np.concatenate(([True], groups[1:] != groups[:-1]))]
+
+    def get(self, shape_path, points, space, axis, matrix=None):
+        """
+        :param matrix: the shape's world matrix array the points were moved by, for world space
+        :return: the cached mirror map of the shape, built from points on the first use
+        """
+        topology = TopologyCache.shared().get(shape_path)
+        tolerance = self.get_tolerance()
+        key = (om.MObjectHandle(shape_path.node()).hashCode(), space, axis, tolerance)
+        entry = self.entries.pop(key, None)
+        if entry is not None and entry[0] is topology and \
+                (matrix is None if entry[1] is None else matrix is not None and np.array_equal(entry[1], matrix)):
+            self.hits += 1
+        else:
+            entry = (topology, matrix, self.build(topology, points, axis, tolerance))
+            self.builds += 1
+        self.entries[key] = entry
+        while len(self.entries) > self.MAX_ENTRIES:
+            self.entries.pop(next(iter(self.entries)))
+        return entry[2]
+
+    @classmethod
+    def apply_selected(cls, mode, direction=1):
+        """
+        :param mode: SYMMETRIZE copies the side where the axis has the sign of direction
+            onto the other side, FLIP mirrors the whole mesh onto itself
+        """
+        if np is None:
+            om.MGlobal.displayWarning("Model Helper: NumPy is missing, using Maya's {0}.".format(mode))
+            mel.eval("Symmetrize;" if mode == cls.SYMMETRIZE else "FlipMesh;")
+            return
+
+        start_time = perf_clock()
+        space, axis = cls.get_space()
+        edit = ApiEdit(mode)
+        mesh_count = 0
+        vertex_count = 0
+        unmatched_count = 0
+        for node in HistoryCleaner.get_meshes(cmds.ls(selection=True, long=True, objectsOnly=True) or [])[0]:
+            shape_path = om.MDagPath.getAPathTo(node)
+            mesh_points = om.MFnMesh(shape_path).getPoints(om.MSpace.kObject)
+            object_points = np.array(mesh_points)
+            matrix = TransformEngine.matrix_to_array(shape_path.inclusiveMatrix()) if space == "world" else None
+            points = object_points.dot(matrix) if matrix is not None else object_points
+
+            mirror = cls.shared().get(shape_path, points[:, :3], space, axis, matrix)
+            mapped = mirror >= 0
+            if mode == cls.FLIP:
+                targets = mapped
+            else:
+                targets = mapped & (direction * points[:, axis] < 0)
+            result = points.copy()
+            result[targets] = cls.reflect(points[mirror[targets]], axis)
+            if mode == cls.SYMMETRIZE:
+                result[mirror == np.arange(len(mirror)), axis] = 0.0
+            mesh_count += 1
+            vertex_count += len(points)
+            unmatched_count += np.count_nonzero(~mapped)
+
+            # only the points that move go back through the inverse matrix, scattered into
+            # a copy of the object space array read above
+            changed = np.flatnonzero((result != points).any(axis=1))
+            if not len(changed):
+                continue
+            values = result[changed]
+            if matrix is not None:
+                values = values.dot(np.linalg.inv(matrix))
+            new_points = object_points.copy()
+            new_points[changed] = values
+            edit.set_mesh_points(shape_path, om.MPointArray(new_points), mesh_points)
+
+        if not mesh_count:
+            om.MGlobal.displayWarning("Model Helper: select the meshes to {0}.".format(mode))
+            return
+        if len(edit):
+            with ModelHelperTransaction("rbModelHelper" + mode.capitalize()):
+                edit.commit()
+
+        om.MGlobal.displayInfo("Model Helper {0} ({1} {2}): {3} vertices on {4} meshes, {5} without a mirror, in {6:.1f} ms".format(
+            mode, space, "xyz"[axis], vertex_count, mesh_count, unmatched_count, (perf_clock() - start_time) * 1000.0))
+
+    @classmethod
+    def warm_selected(cls, *args):
+        """
+        Builds the maps of the selected meshes ahead of the first Symmetrize or Flip.
+        """
+        if np is None:
+            return
+        space, axis = cls.get_space()
+        for node in HistoryCleaner.get_meshes(cmds.ls(selection=True, long=True, objectsOnly=True) or [])[0]:
+            shape_path = om.MDagPath.getAPathTo(node)
+            points = np.array(om.MFnMesh(shape_path).getPoints(om.MSpace.kObject))
+            matrix = TransformEngine.matrix_to_array(shape_path.inclusiveMatrix()) if space == "world" else None
+            if matrix is not None:
+                points = points.dot(matrix)
+            cls.shared().get(shape_path, points[:, :3], space, axis, matrix)
+
+
+class CircularizeEngine(object):
+    """
+    Turns every selected closed edge loop, or the perimeter of every selected face
+    region, into an even circle.
+
+    Loops are grouped by vertex count and each group is fitted in one batch: a plane
+    through the loop from an SVD of its points, then a least-squares (Kasa) circle in
+    that plane. The vertices are spaced evenly around the circle, starting from the
+    first vertex's angle plus the twist, and each mesh is written back with one
+    setPoints. The radius is the fitted one unless the RBModelHelperCircularizeRadius
+    optionVar is above 0.
+    """
+
+    OPTIONS = (
+        ("radius", "RBModelHelperCircularizeRadius", 0.0),
+        ("twist", "RBModelHelperCircularizeTwist", 0.0),
+    )
 
-        
-    def perform_lockNormals(self):
-        mel.eval("LockNormals;")
-        
-    def widgets_lockNormals(self):
-        self.lockNormals_button = QtWidgets.QPushButton("Lock Normals")
-        self.lockNormals_button.setIcon(QtGui.QIcon(":polyNormalLock.png"))
-        self.lockNormals_button.setIconSize(QtCore.QSize(25, 20))
-        self.lockNormals_button.clicked.connect(self.perform_lockNormals)
-        
-    def perform_unlockNormals(self):
-        mel.eval("UnlockNormals;")
-        
-    def widgets_unlockNormals(self):
-        self.unlockNormals_button = QtWidgets.QPushButton("Unlock Normals")
-        self.unlockNormals_button.setIcon(QtGui.QIcon(":polyNormalUnlock.png"))
-        self.unlockNormals_button.setIconSize(QtCore.QSize(25, 20))
-        self.unlockNormals_button.clicked.connect(self.perform_unlockNormals)
-        
-    def perform_unlockNormals(self):
-        mel.eval("UnlockNormals;")
-        
-    def widgets_unlockNormals(self):
-        self.unlockNormals_button = QtWidgets.QPushButton("Unlock Normals")
-        self.unlockNormals_button.setIcon(QtGui.QIcon(":polyNormalUnlock.png"))
-        self.unlockNormals_button.setIconSize(QtCore.QSize(25, 20))
-        self.unlockNormals_button.clicked.connect(self.perform_unlockNormals)
-    
-    def perform_toggleReflectionSetMode(self):
-        currentMode = cmds.symmetricModelling(query=True,symmetry=False)
-        newMode = "none" 
-        if currentMode == 0:
-            self.toggleReflectionSetModeOn_button.setHidden(False)
-            self.toggleReflectionSetModeOff_button.setHidden(True)
-            cmds.symmetricModelling(symmetry=True)
-            cmds.symmetricModelling(about='world')
-            cmds.symmetricModelling(axis='x')
-        else:
-            self.toggleReflectionSetModeOn_button.setHidden(True)
-            self.toggleReflectionSetModeOff_button.setHidden(False)
-            cmds.symmetricModelling(symmetry=False)
-            
-    def widgets_toggleReflectionSetModeOff(self):
-        self.toggleReflectionSetModeOff_button = QtWidgets.QPushButton("Symmetry")
-        self.toggleReflectionSetModeOff_button.setIconSize(QtCore.QSize(40, 30))
-        self.toggleReflectionSetModeOff_button.clicked.connect(self.perform_toggleReflectionSetMode)
-        
-    def widgets_toggleReflectionSetModeOn(self):
-        self.toggleReflectionSetModeOn_button = QtWidgets.QPushButton("Symmetry")
-        self.toggleReflectionSetModeOn_button.setHidden(True)
-        self.toggleReflectionSetModeOn_button.setStyleSheet("background-color: #368BC1;color: #000000;")
+    @classmethod
+    def get_options(cls):
+        options = {}
+        for key, option_var, default in cls.OPTIONS:
+            options[key] = cmds.optionVar(q=option_var) if cmds.optionVar(exists=option_var) else default
+        return options
 
-        self.toggleReflectionSetModeOn_button.setIconSize(QtCore.QSize(40, 30))
-        self.toggleReflectionSetModeOn_button.clicked.connect(self.perform_toggleReflectionSetMode)
-        
-    def set_camBasedSel(self):
+    @classmethod
+    def set_options(cls, **options):
+        for key, option_var, default in cls.OPTIONS:
+            if key in options:
+                cmds.optionVar(floatValue=(option_var, options[key]))
+
+    @staticmethod
+    def get_loops(topology, edges):
+        """
+        :return: vertex index lists of the closed loops formed by edges, in loop order.
+            Open chains and loops touching another loop are skipped.
+        """
+        neighbors = {}
+        for start, end in topology.edge_vertices[np.unique(edges)].tolist():
+            neighbors.setdefault(start, []).append(end)
+            neighbors.setdefault(end, []).append(start)
+
+        loops = []
+        visited = set()
+        for start in neighbors:
+            if start in visited or len(neighbors[start]) != 2:
+                continue
+            loop = [start]
+            visited.add(start)
+            previous, current = start, neighbors[start][0]
+            while current != start and current not in visited and len(neighbors[current]) == 2:
+                visited.add(current)
+                loop.append(current)
+                first, second = neighbors[current]
+                previous, current = current, second if first == previous else first
+            if current == start and len(loop) >= 3:
+                loops.append(loop)
+        return loops
+
+    @staticmethod
+    def fit_loops(points, loops, radius=0.0, twist=0.0):
+        """
+        :param points: (n, 3) mesh points
+        :return: (vertex indices, new positions) for all loops that could be fitted
+        """
+        groups = {}
+        for loop in loops:
+            groups.setdefault(len(loop), []).append(loop)
+
+        all_indices = []
+        all_positions = []
+        for size, group in groups.items():
+            indices = np.array(group, dtype=np.int64)
+            loop_points = points[indices]
+            centers = loop_points.mean(axis=1)
+            centered = loop_points - centers[:, None]
+            axes = np.linalg.svd(centered, full_matrices=False)[2]
+            u_axes, v_axes = axes[:, 0], axes[:, 1]
+            x = np.einsum("lnk,lk->ln", centered, u_axes)
+            y = np.einsum("lnk,lk->ln", centered, v_axes)
+
+            # Kasa fit: 2ax + 2by + c = x^2 + y^2, with r^2 = c + a^2 + b^2.
+            design = np.stack((2.0 * x, 2.0 * y, np.ones_like(x)), axis=2)
+            normal_matrix = np.einsum("lni,lnj->lij", design, design)
+            right_side = np.einsum("lni,ln->li", design, x * x + y * y)
+            a, b, c = np.matmul(np.linalg.pinv(normal_matrix), right_side[:, :, None])[:, :, 0].T
+            with np.errstate(invalid="ignore"):
+                radii = np.full(len(group), radius) if radius > 0.0 else np.sqrt(c + a * a + b * b)
+
+            orientation = np.sign((x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y).sum(axis=1))
+            orientation[orientation == 0] = 1.0
+            angles = np.arctan2(y[:, 0] - b, x[:, 0] - a)[:, None] + np.radians(twist) + \
+                orientation[:, None] * 2.0 * np.pi * np.arange(size) / size
+            circle_x = a[:, None] + radii[:, None] * np.cos(angles)
+            circle_y = b[:, None] + radii[:, None] * np.sin(angles)
+            positions = centers[:, None] + circle_x[:, :, None] * u_axes[:, None] + circle_y[:, :, None] * v_axes[:, None]
+
+            fitted = np.isfinite(positions).all(axis=(1, 2))
+            all_indices.append(indices[fitted].ravel())
+            all_positions.append(positions[fitted].reshape(-1, 3))
+
+        if not all_indices:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, 3))
+        return np.concatenate(all_indices), np.concatenate(all_positions)
 
-        currentMode=cmds.selectPref(query=True,useDepth=True)
+    @classmethod
+    def get_selected_components(cls):
+        """
+        :return: [(mesh shape MDagPath, Maya edge indices, face indices)], None when the
+            selection holds anything but mesh edges and faces
+        """
+        selection = om.MGlobal.getActiveSelectionList()
+        shapes = OrderedDict()
+        for index in range(selection.length()):
+            try:
+                dag_path, component = selection.getComponent(index)
+            except TypeError:
+                return None
+            if component.apiType() not in (om.MFn.kMeshEdgeComponent, om.MFn.kMeshPolygonComponent):
+                return None
+            shape_path = TopologyCache.get_shape_path(dag_path)
+            shape_path, edges, faces = shapes.setdefault(shape_path.fullPathName(), (shape_path, [], []))
+            elements = om.MFnSingleIndexedComponent(component).getElements()
+            (edges if component.apiType() == om.MFn.kMeshEdgeComponent else faces).extend(elements)
+        return list(shapes.values())
 
-        if currentMode == False:
-            self.toggleCamBasedSelOff_button.setHidden(True)
-            self.toggleCamBasedSelOn_button.setHidden(False)
-            cmds.selectPref(useDepth=True)
-        else:
-            self.toggleCamBasedSelOff_button.setHidden(False)
-            self.toggleCamBasedSelOn_button.setHidden(True)
-            cmds.selectPref(useDepth=False)
-            
-    def widgets_toggleCamBasedSelOff(self):
-        self.toggleCamBasedSelOff_button = QtWidgets.QPushButton("Cam Base Selection Off")
-        self.toggleCamBasedSelOff_button.setIconSize(QtCore.QSize(40, 30))
-        self.toggleCamBasedSelOff_button.clicked.connect(self.set_camBasedSel)
-        
-    def widgets_toggleCamBasedSelOn(self):
-        self.toggleCamBasedSelOn_button = QtWidgets.QPushButton("Cam Base Selection On")
-        self.toggleCamBasedSelOn_button.setStyleSheet("background-color: #368BC1;color: #000000;")
-        self.toggleCamBasedSelOn_button.setHidden(True)
-        self.toggleCamBasedSelOn_button.setIconSize(QtCore.QSize(40, 30))
-        self.toggleCamBasedSelOn_button.clicked.connect(self.set_camBasedSel)
-        
-    def set_backfaces(self):
-        selection = cmds.ls(selection=True)
-        if not selection:
+    @classmethod
+    def circularize_selected(cls):
+        components = cls.get_selected_components() if np is not None else None
+        if components is None:
+            mel.eval("PolyCircularize;")
             return
 
-        for obj in selection:
-            current_state = cmds.getAttr(obj + ".backfaceCulling")
-            cmds.setAttr(obj + ".backfaceCulling", not current_state)
-            
-    def widgets_toggleBackfaces(self):
-        self.toggleBackfaces_button = QtWidgets.QPushButton("Backface")
-        self.toggleBackfaces_button.setIconSize(QtCore.QSize(40, 30))
-        self.toggleBackfaces_button.clicked.connect(self.set_backfaces)
-        
-    def set_faceTriangles(self):
-        selection = cmds.ls(selection=True)
-        if not selection:
+        start_time = perf_clock()
+        options = cls.get_options()
+        edit = ApiEdit("circularize")
+        loop_count = 0
+        for shape_path, maya_edges, faces in components:
+            topology = TopologyCache.shared().get(shape_path)
+            edges = np.zeros(0, dtype=np.int64)
+            if maya_edges:
+                edge_map = topology.get_maya_edges(shape_path)
+                edge_ids = np.empty_like(edge_map)
+                edge_ids[edge_map] = np.arange(len(edge_map))
+                edges = edge_ids[np.array(maya_edges, dtype=np.int64)]
+            if faces:
+                selected_faces = np.zeros(len(topology.face_offsets) - 1, dtype=np.int64)
+                selected_faces[faces] = 1
+                face_counts = np.add.reduceat(selected_faces[topology.edge_faces], topology.edge_offsets[:-1])
+                edges = np.concatenate((edges, np.flatnonzero(face_counts == 1)))
+
+            loops = cls.get_loops(topology, edges)
+            points = np.array(om.MFnMesh(shape_path).getPoints(om.MSpace.kObject))
+            indices, positions = cls.fit_loops(points[:, :3], loops, options["radius"], options["twist"])
+            if not len(indices):
+                continue
+            points[indices, :3] = positions
+            edit.set_mesh_points(shape_path, om.MPointArray(points.tolist()))
+            loop_count += len(loops)
+
+        if not len(edit):
+            om.MGlobal.displayWarning("Model Helper: select closed edge loops or faces to circularize.")
             return
+        with ModelHelperTransaction("rbModelHelperCircularize"):
+            edit.commit()
 
-        for obj in selection:
-            current_state = cmds.getAttr(obj + ".template")
-            cmds.setAttr(obj + ".template", not current_state)
-            
-    def widgets_toggleFaceTriangles(self):
-        self.toggleFaceTriangles_button = QtWidgets.QPushButton("Freeze")
-        self.toggleFaceTriangles_button.setIconSize(QtCore.QSize(40, 30))
-        self.toggleFaceTriangles_button.clicked.connect(self.set_faceTriangles)
-        
-    def set_faceNormals(self):
-        mel.eval("ToggleIsolateSelect;")
-        
-    def widgets_toggleFaceNormals(self):
-        self.toggleFaceNormals_button = QtWidgets.QPushButton("Isolate")
-        self.toggleFaceNormals_button.setIconSize(QtCore.QSize(40, 30))
-        self.toggleFaceNormals_button.clicked.connect(self.set_faceNormals)
-                
-    def set_faceInvisible(self):
-        mel.eval('dR_DoCmd("objectXrayTGL");')
-            
-    def widgets_toggleFaceInvisible(self):
-        self.toggleFaceInvisible_button = QtWidgets.QPushButton("X-Ray")
-        self.toggleFaceInvisible_button.setIconSize(QtCore.QSize(40, 30))
-        self.toggleFaceInvisible_button.clicked.connect(self.set_faceInvisible)
-                        
-    def set_marquee(self):
-        cmds.selectPref(paintSelect=False)
+        om.MGlobal.displayInfo("Model Helper circularize: {0} loops on {1} meshes in {2:.1f} ms".format(
+            loop_count, len(edit), (perf_clock() - start_time) * 1000.0))
 
-    def widgets_marquee(self):
-        self.marquee_button = QtWidgets.QPushButton("Marquee")
-        self.marquee_button.setIconSize(QtCore.QSize(40, 30))
-        self.marquee_button.clicked.connect(self.set_marquee)
-        
-    def set_drag(self):
-        cmds.selectPref(paintSelect=True)
 
-    def widgets_drag(self):
-        self.drag_button = QtWidgets.QPushButton("Drag")
-        self.drag_button.setIconSize(QtCore.QSize(40, 30))
-        self.drag_button.clicked.connect(self.set_drag)
-        
-    def set_preserveUVs(self):
-        
-        currentMode=cmds.selectPref(query=True,useDepth=True)
-        
-        if currentMode == True:
-            #self.preserveUVsOff_button.setHidden(False)
-            #self.preserveUVsOn_button.setHidden(True)
-            mel.eval("setTRSPreserveUVs(!`optionVar -q trsManipsPreserveUvs`)")
-        else:
-            #self.preserveUVsOff_button.setHidden(True)
-            #self.preserveUVsOn_button.setHidden(False)
-            mel.eval("setTRSPreserveUVs(!`optionVar -q trsManipsPreserveUvs`)")
-            
+class RelaxEngine(object):
+    """
+    Laplacian and Taubin smoothing of mesh vertices, the NumPy replacement for AverageVertex.
+
+    Every step moves each vertex toward the average of its neighbours,
+    P += strength * weight * (average - P). Taubin follows each step with an inflating
+    one (factor mu < 0, from TAUBIN_PASS_BAND) so the mesh keeps its volume. The
+    neighbour sums are an np.bincount over the TopologyCache adjacency, the sparse
+    adjacency product without needing SciPy. Points are read once and written back
+    with one setPoints.
+
+    The weight is 1 for the selected vertices (selected edges and faces count through
+    their vertices, a selected object through all of them), the soft selection falloff
+    when Soft Select is on, and 0 elsewhere and on pinned borders.
+    """
 
-    def widgets_preserveUVsOff(self):
-        self.preserveUVsOff_button = QtWidgets.QPushButton("Preserve UVs")
-        self.preserveUVsOff_button.setIconSize(QtCore.QSize(40, 30))
-        self.preserveUVsOff_button.clicked.connect(self.set_preserveUVs)
-        
-    def widgets_preserveUVsOn(self):
-        self.preserveUVsOn_button = QtWidgets.QPushButton("Preserve UVs")
-        self.preserveUVsOn_button.setStyleSheet("background-color: #368BC1;color: #000000;")
-        self.preserveUVsOn_button.setHidden(True)
-        self.preserveUVsOn_button.setIconSize(QtCore.QSize(40, 30))
-        self.preserveUVsOn_button.clicked.connect(self.set_preserveUVs)
-        
-    def set_preserveChildren(self):
-        mel.eval("setTRSPreserveChildPosition(!`optionVar -q trsManipsPreserveChildPosition`)")
+    LAPLACIAN = "laplacian"
+    TAUBIN = "taubin"
+    METHODS = (TAUBIN, LAPLACIAN)
+    TAUBIN_PASS_BAND = 0.1
+    OPTIONS = (
+        ("method", "RBModelHelperRelaxMethod", TAUBIN),
+        ("iterations", "RBModelHelperRelaxIterations", 10),
+        ("strength", "RBModelHelperRelaxStrength", 0.5),
+        ("pin_borders", "RBModelHelperRelaxPinBorders", 1),
+    )
 
-    def widgets_preserveChildrenOff(self):
-        self.preserveChildrenOff_button = QtWidgets.QPushButton("Preserve Children")
-        self.preserveChildrenOff_button.setIconSize(QtCore.QSize(40, 30))
-        self.preserveChildrenOff_button.clicked.connect(self.set_preserveChildren)
-        
-    def widgets_preserveChildrenOn(self):
-        self.preserveChildrenOn_button = QtWidgets.QPushButton("Preserve Children")
-        self.preserveChildrenOn_button.setStyleSheet("background-color: #368BC1;color: #000000;")
-        self.preserveChildrenOn_button.setHidden(True)
-        self.preserveChildrenOn_button.setIconSize(QtCore.QSize(40, 30))
-        self.preserveChildrenOn_button.clicked.connect(self.set_preserveChildren)
-        
-    def set_tweakMode(self):
-        mel.eval("setTRSPreserveChildPosition(!`optionVar -q TRSPreserveChildPosition`)")
+    @classmethod
+    def get_options(cls):
+        options = {}
+        for key, option_var, default in cls.OPTIONS:
+            options[key] = cmds.optionVar(q=option_var) if cmds.optionVar(exists=option_var) else default
+        return options
 
-    def widgets_tweakMode(self):
-        self.tweakMode_button = QtWidgets.QPushButton("Tweak")
-        self.tweakMode_button.setIconSize(QtCore.QSize(40, 30))
-        self.tweakMode_button.clicked.connect(self.set_tweakMode)
-            
-    def set_edgeConstraint(self):
-        
-        currentMode=cmds.optionVar(q="trsManipsXformConstraint")
-        
-        if currentMode == 'edge':
-            cmds.dR_slideOff()
-        else:
-            cmds.dR_slideEdge()
-            
-    def widgets_edgeConstraintOff(self):
-        self.edgeConstraintOff_button = QtWidgets.QPushButton("Edge Constraint")
-        self.edgeConstraintOff_button.setIconSize(QtCore.QSize(40, 30))
-        self.edgeConstraintOff_button.clicked.connect(self.set_edgeConstraint)
-        
-    def widgets_edgeConstraintOn(self):
-        self.edgeConstraintOn_button = QtWidgets.QPushButton("Edge Constraint")
-        self.edgeConstraintOn_button.setStyleSheet("background-color: #368BC1;color: #000000;")
-        self.edgeConstraintOn_button.setHidden(True)
-        self.edgeConstraintOn_button.setIconSize(QtCore.QSize(40, 30))
-        self.edgeConstraintOn_button.clicked.connect(self.set_edgeConstraint)
-        
-    def set_surfaceConstraint(self):
-        
-        currentMode=cmds.optionVar(q="trsManipsXformConstraint")
-        
-        if currentMode == 'surface':
-            cmds.dR_slideOff()
-        else:
-            cmds.dR_slideSurface()
-            
-    def widgets_surfaceConstraintOff(self):
-        self.surfaceConstraintOff_button = QtWidgets.QPushButton("Surface Constraint")
-        self.surfaceConstraintOff_button.setIconSize(QtCore.QSize(40, 30))
-        self.surfaceConstraintOff_button.clicked.connect(self.set_surfaceConstraint)
-        
-    def widgets_surfaceConstraintOn(self):
-        self.surfaceConstraintOn_button = QtWidgets.QPushButton("Surface Constraint")
-        self.surfaceConstraintOn_button.setStyleSheet("background-color: #368BC1;color: #000000;")
-        self.surfaceConstraintOn_button.setHidden(True)
-        self.surfaceConstraintOn_button.setIconSize(QtCore.QSize(40, 30))
-        self.surfaceConstraintOn_button.clicked.connect(self.set_surfaceConstraint)
-            
+    @classmethod
+    def set_options(cls, **options):
+        for key, option_var, default in cls.OPTIONS:
+            if key not in options:
+                continue
+            if isinstance(default, str):
+                cmds.optionVar(stringValue=(option_var, options[key]))
+            elif isinstance(default, float):
+                cmds.optionVar(floatValue=(option_var, options[key]))
+            else:
+                cmds.optionVar(intValue=(option_var, int(options[key])))
 
-    def widgets_sculpting(self):    
-        self.lift_button = QtWidgets.QPushButton("")
-        self.lift_button.setIcon(QtGui.QIcon(":Sculpt.png"))
-        self.lift_button.setIconSize(QtCore.QSize(25, 25))
-        
-        self.sculptSmooth_button = QtWidgets.QPushButton("")
-        self.sculptSmooth_button.setIcon(QtGui.QIcon(":Smooth.png"))
-        self.sculptSmooth_button.setIconSize(QtCore.QSize(25, 25))
-        
-        self.sculptRelax_button = QtWidgets.QPushButton("")
-        self.sculptRelax_button.setIcon(QtGui.QIcon(":Relax.png"))
-        self.sculptRelax_button.setIconSize(QtCore.QSize(25, 25))
-        
-        self.sculptGrab_button = QtWidgets.QPushButton("")
-        self.sculptGrab_button.setIcon(QtGui.QIcon(":Grab.png"))
-        self.sculptGrab_button.setIconSize(QtCore.QSize(25, 25))
-        
-        self.sculptPinch_button = QtWidgets.QPushButton("")
-        self.sculptPinch_button.setIcon(QtGui.QIcon(":Pinch.png"))
-        self.sculptPinch_button.setIconSize(QtCore.QSize(25, 25))
-        
-        self.sculptFlatten_button = QtWidgets.QPushButton("")
-        self.sculptFlatten_button.setIcon(QtGui.QIcon(":Flatten.png"))
-        self.sculptFlatten_button.setIconSize(QtCore.QSize(25, 25))
-                   
-        self.sculptFoamy_button = QtWidgets.QPushButton("")
-        self.sculptFoamy_button.setIcon(QtGui.QIcon(":Foamy.png"))
-        self.sculptFoamy_button.setIconSize(QtCore.QSize(25, 25))      
-        
-        self.sculptSpray_button = QtWidgets.QPushButton("")
-        self.sculptSpray_button.setIcon(QtGui.QIcon(":Spray.png"))
-        self.sculptSpray_button.setIconSize(QtCore.QSize(25, 25))    
-        
-        self.sculptRepeat_button = QtWidgets.QPushButton("")
-        self.sculptRepeat_button.setIcon(QtGui.QIcon(":Spray.png"))
-        self.sculptRepeat_button.setIconSize(QtCore.QSize(25, 25))   
-        
-        self.sculptImprint_button = QtWidgets.QPushButton("")
-        self.sculptImprint_button.setIcon(QtGui.QIcon(":Imprint.png"))
-        self.sculptImprint_button.setIconSize(QtCore.QSize(25, 25))     
-        
-        self.sculptWax_button = QtWidgets.QPushButton("")
-        self.sculptWax_button.setIcon(QtGui.QIcon(":Wax.png"))
-        self.sculptWax_button.setIconSize(QtCore.QSize(25, 25))      
-        
-        self.sculptScrape_button = QtWidgets.QPushButton("")
-        self.sculptScrape_button.setIcon(QtGui.QIcon(":Scrape.png"))
-        self.sculptScrape_button.setIconSize(QtCore.QSize(25, 25))  
-        
-        self.sculptFill_button = QtWidgets.QPushButton("")
-        self.sculptFill_button.setIcon(QtGui.QIcon(":Fill.png"))
-        self.sculptFill_button.setIconSize(QtCore.QSize(25, 25)) 
-        
-        self.sculptKnife_button = QtWidgets.QPushButton("")
-        self.sculptKnife_button.setIcon(QtGui.QIcon(":Knife.png"))
-        self.sculptKnife_button.setIconSize(QtCore.QSize(25, 25)) 
-        
-        self.sculptSmear_button = QtWidgets.QPushButton("")
-        self.sculptSmear_button.setIcon(QtGui.QIcon(":Smear.png"))
-        self.sculptSmear_button.setIconSize(QtCore.QSize(25, 25)) 
-        
-        self.sculptBulge_button = QtWidgets.QPushButton("")
-        self.sculptBulge_button.setIcon(QtGui.QIcon(":Bulge.png"))
-        self.sculptBulge_button.setIconSize(QtCore.QSize(25, 25)) 
-        
-        self.sculptAmplify_button = QtWidgets.QPushButton("")
-        self.sculptAmplify_button.setIcon(QtGui.QIcon(":Amplify.png"))
-        self.sculptAmplify_button.setIconSize(QtCore.QSize(25, 25)) 
-        
-        self.sculptFreeze_button = QtWidgets.QPushButton("")
-        self.sculptFreeze_button.setIcon(QtGui.QIcon(":Freeze.png"))
-        self.sculptFreeze_button.setIconSize(QtCore.QSize(25, 25)) 
-        
-        self.sculptFreezeSelect_button = QtWidgets.QPushButton("")
-        self.sculptFreezeSelect_button.setIcon(QtGui.QIcon(":freezeSelected.png"))
-        self.sculptFreezeSelect_button.setIconSize(QtCore.QSize(25, 25)) 
-        
-        self.sculptObjects_button = QtWidgets.QPushButton("")
-        self.sculptObjects_button.setIcon(QtGui.QIcon(":Objects.png"))
-        self.sculptObjects_button.setIconSize(QtCore.QSize(25, 25)) 
+    @classmethod
+    def relax_points(cls, points, sources, targets, weights, iterations, strength, method):
+        """
+        :param points: (n, 3) array, relaxed in place
+        """
+        degree = np.bincount(sources, minlength=len(points)).astype(float)
+        weights = weights * (degree > 0)
+        degree[degree == 0] = 1.0
+        factors = [strength]
+        if method == cls.TAUBIN:
+            factors.append(1.0 / (cls.TAUBIN_PASS_BAND - 1.0 / strength))
+
+        average = np.empty_like(points)
+        for iteration in range(iterations):
+            for factor in factors:
+                for axis in range(3):
+                    average[:, axis] = np.bincount(sources, weights=points[targets, axis], minlength=len(points))
+                average /= degree[:, None]
+                points += (factor * weights)[:, None] * (average - points)
+        return points
 
-    def widgets_collapsables(self): 
-        
-        self.view_tools = CollapsibleWidget("Views")
-        self.view_tools.set_expanded(True)
-        self.history_tools = CollapsibleWidget("Delete History")
-        self.history_tools.set_expanded(True)
-        self.modify_tools = CollapsibleWidget("Modify")
-        self.modify_tools.set_expanded(False)
-        self.duplicate_tools = CollapsibleWidget("Duplicate")
-        self.duplicate_tools.set_expanded(False)
-        
-        self.polygon_primatives = CollapsibleWidget("Polygon Primatives")
-        self.polygon_primatives.set_expanded(True)
-        self.polygon_primativesSec = CollapsibleWidget("")
-        self.polygon_primativesSec.set_expanded(False)
-        self.polygon_primativesSec.set_Margins(4,0,0,0)
-        self.polygon_primativesSec.set_header_background_color(QtGui.QColor(125,125, 125, 0))
- 
-        self.sculpting_menu = CollapsibleWidget("Sculpting")
-        self.sculpting_menu.set_expanded(True)
-        
-        self.secSculpting_menu = CollapsibleWidget("")
-        self.secSculpting_menu.set_expanded(False)
-        self.secSculpting_menu.set_Margins(4,0,0,0)
-        self.secSculpting_menu.set_header_background_color(QtGui.QColor(125,125, 125,0)) 
-        
-        self.boolean_menu = CollapsibleWidget("Boolean")
-        self.boolean_menu.set_expanded(False)  
-        
-        self.display_menu = CollapsibleWidget("Display")
-        self.display_menu.set_expanded(False)          
-        
-        self.combine_menu = CollapsibleWidget("Combine")
-        self.combine_menu.set_expanded(True)
-        
-        self.remesh_menu = CollapsibleWidget("Remesh")
-        self.remesh_menu .set_expanded(True)
-        
-        self.edgeTools_menu = CollapsibleWidget("Edge Tools")
-        self.edgeTools_menu .set_expanded(True)
-        
-        self.symmetry_menu = CollapsibleWidget("Symmetry")
-        self.edgeTools_menu .set_expanded(True)
-        
-        # Edit Mesh Tools          
-        self.editMesh_menu = CollapsibleWidget("Edit Mesh Tools  ")
-        self.editMesh_menu.set_expanded(True)  
-        self.editMesh_menuSec = CollapsibleWidget("")
-        self.editMesh_menuSec.set_expanded(True)  
-        self.editMesh_menuSec.set_expanded(False)
-        self.editMesh_menuSec.set_Margins(4,0,0,0)
-        self.editMesh_menuSec.set_header_background_color(QtGui.QColor(125,125, 125, 0))                
-
-        #Mesh Tools
-        self.meshTools_menu = CollapsibleWidget("Mesh Tools")
-        self.meshTools_menu.set_expanded(True)
+    @classmethod
+    def get_selected_weights(cls):
+        """
+        :return: [(mesh shape MDagPath, vertex indices, weights)] for the selected meshes, the
+            indices unique and the weights arrays of the same length
+        """
+        selection = om.MSelectionList()
+        for name in cmds.polyListComponentConversion(cmds.ls(selection=True, long=True) or [], toVertex=True) or []:
+            selection.add(name)
+        selections = [(selection, False)]
+        if cmds.softSelect(q=True, softSelectEnabled=True):
+            try:
+                selections.append((om.MGlobal.getRichSelection().getSelection(), True))
+            except RuntimeError:
+                pass
 
-    def create_layout(self):
-        
-        history_layout1 = QtWidgets.QHBoxLayout()
-        history_layout1.addWidget(self.deleteHistory_button)
-        history_layout1.addWidget(self.deleteNonDefHistory_button)
-        
-        modify_layout0 = QtWidgets.QHBoxLayout()
-        modify_layout0.addWidget(self.centerPivot_button)
-        modify_layout0.addWidget(self.zeroPivot_button)
+        meshes = []
+        mesh_components = {}
+        for selection, soft in selections:
+            for index in range(selection.length()):
+                try:
+                    dag_path, component = selection.getComponent(index)
+                except TypeError:
+                    continue
+                if not dag_path.hasFn(om.MFn.kMesh) or component.apiType() != om.MFn.kMeshVertComponent:
+                    continue
+                shape_path = TopologyCache.get_shape_path(dag_path)
+                name = shape_path.fullPathName()
+                if name not in mesh_components:
+                    mesh_components[name] = []
+                    meshes.append((shape_path, mesh_components[name]))
+
+                component_fn = om.MFnSingleIndexedComponent(component)
+                vertices = np.asarray(component_fn.getElements(), dtype=np.int64)
+                if soft and component_fn.hasWeights:
+                    # only soft selections carry weights, and MFnComponent reads them one at a time
+                    weights = np.array([component_fn.weight(i).influence for i in range(len(vertices))])
+                else:
+                    weights = np.ones(len(vertices))
+                mesh_components[name].append((vertices, weights))
+
+        selected = []
+        for shape_path, components in meshes:
+            vertices, inverse = np.unique(np.concatenate([vertices for vertices, weights in components]), return_inverse=True)
+            weights = np.zeros(len(vertices))
+            np.maximum.at(weights, inverse.ravel(), np.concatenate([weights for vertices, weights in components]))
+            selected.append((shape_path, vertices, weights))
+        return selected
 
-        
-        modify_layout1 = QtWidgets.QHBoxLayout()
-        modify_layout1.addWidget(self.bakePivot_button)
-        modify_layout1.addWidget(self.freezeTransform_button)
-        modify_layout1.addWidget(self.resetTransform_button)
-
-        duplicate_layout1 = QtWidgets.QHBoxLayout()
-        duplicate_layout1.addWidget(self.duplicate_button)
-        duplicate_layout1.addWidget(self.instance_button)
-        duplicate_layout1.addWidget(self.replace_button)
-        
-        selection_layout1 = QtWidgets.QHBoxLayout()
-        selection_layout1.addWidget(self.toggleReflectionSetModeOff_button)
-        selection_layout1.addWidget(self.toggleReflectionSetModeOn_button)
-        selection_layout1.addWidget(self.toggleCamBasedSelOff_button)
-        selection_layout1.addWidget(self.toggleCamBasedSelOn_button)
-        
-        selection_layout1b = QtWidgets.QHBoxLayout()
-        selection_layout1b.addWidget(self.toggleFaceNormals_button)
-        selection_layout1b.addWidget(self.toggleFaceTriangles_button)
-        selection_layout1b.addWidget(self.toggleBackfaces_button)
-        selection_layout1b.addWidget(self.toggleFaceInvisible_button)
+    @classmethod
+    def relax_selected(cls, **overrides):
+        options = cls.get_options()
+        options.update(overrides)
+        if np is None:
+            om.MGlobal.displayWarning("Model Helper: NumPy is missing, using AverageVertex.")
+            mel.eval("AverageVertex;")
+            return
 
-        
-        selection_layout2 = QtWidgets.QHBoxLayout()
-        selection_layout2.addWidget(self.marquee_button)
-        selection_layout2.addWidget(self.drag_button)
-        selection_layout2.addWidget(self.tweakMode_button)
-        
-        selection_layout3 = QtWidgets.QHBoxLayout()
-        selection_layout3.addWidget(self.preserveUVsOff_button)
-        selection_layout3.addWidget(self.preserveUVsOn_button)
-        selection_layout3.addWidget(self.preserveChildrenOff_button)
-        selection_layout3.addWidget(self.preserveChildrenOn_button)
-        
-        selection_layout4 = QtWidgets.QHBoxLayout()
-        selection_layout4.addWidget(self.edgeConstraintOff_button)
-        selection_layout4.addWidget(self.edgeConstraintOn_button)
-        selection_layout4.addWidget(self.surfaceConstraintOff_button)
-        selection_layout4.addWidget(self.surfaceConstraintOn_button)
-
-        prim_layout1 = QtWidgets.QHBoxLayout()
-        prim_layout1.addWidget(self.sphere_button)
-        prim_layout1.addWidget(self.cube_button)
-        prim_layout1.addWidget(self.cylinder_button)
-        prim_layout1.addWidget(self.cone_button)
-        prim_layout1.addWidget(self.torus_button)
-        prim_layout1.addWidget(self.plane_button)
-        prim_layout1.addWidget(self.disc_button)
-        prim_layout1.addWidget(self.platonic_button)
-        
-        prim_layout2 = QtWidgets.QHBoxLayout()
-        prim_layout2.addWidget(self.pyramid_button)
-        prim_layout2.addWidget(self.prism_button)
-        prim_layout2.addWidget(self.pipe_button)
-        prim_layout2.addWidget(self.helix_button)
-        prim_layout2.addWidget(self.gear_button)
-        prim_layout2.addWidget(self.soccerBall_button)
-        prim_layout2.addWidget(self.superEllipse_button)
-        prim_layout2.addWidget(self.sculptObjects_button)
-        #prim_layout2.addWidget(self.helix_button)
-        
-        prim_layout3 = QtWidgets.QHBoxLayout()
-        #prim_layout3.addWidget(self.pipe_button)
-        #prim_layout3.addWidget(self.helix_button)
+        start_time = perf_clock()
+        iterations = max(0, int(options["iterations"]))
+        strength = min(max(float(options["strength"]), 0.01), 1.0)
+        edit = ApiEdit("relax")
+        vertex_count = 0
+        for shape_path, vertices, vertex_weights in cls.get_selected_weights():
+            mesh_fn = om.MFnMesh(shape_path)
+            points = np.array(mesh_fn.getPoints(om.MSpace.kObject))[:, :3]
+            topology = TopologyCache.shared().get(shape_path)
+            weights = np.zeros(len(points))
+            weights[vertices] = vertex_weights
+            if options["pin_borders"]:
+                weights[topology.border_vertices] = 0.0
+
+            sources, targets = topology.get_vertex_pairs()
+            cls.relax_points(points, sources, targets, weights, iterations, strength, options["method"])
+            edit.set_mesh_points(shape_path, om.MPointArray(np.column_stack((points, np.ones(len(points)))).tolist()))
+            vertex_count += np.count_nonzero(weights)
+
+        if not len(edit):
+            om.MGlobal.displayWarning("Model Helper: select meshes or mesh components to relax.")
+            return
+        with ModelHelperTransaction("rbModelHelperRelax"):
+            edit.commit()
 
+        om.MGlobal.displayInfo("Model Helper relax ({0}, {1} iterations): {2} vertices on {3} meshes in {4:.1f} ms".format(
+            options["method"], iterations, vertex_count, len(edit), (perf_clock() - start_time) * 1000.0))
 
-        prim_layout3.addWidget(self.superEllipse_button)
-        prim_layout3.addWidget(self.sphericalHarm_button)
-        prim_layout3.addWidget(self.ultraShape_button)
-        prim_layout3.addWidget(self.sculptObjects_button)
-        
-        sculpt_layout1 = QtWidgets.QHBoxLayout()
-        sculpt_layout1.addWidget(self.lift_button)
-        #sculpt_layout1.addWidget(self.sculptSmooth_button)
-        sculpt_layout1.addWidget(self.sculptRelax_button)
-        sculpt_layout1.addWidget(self.sculptGrab_button)
-        sculpt_layout1.addWidget(self.sculptPinch_button)
-        sculpt_layout1.addWidget(self.sculptFlatten_button)
-        sculpt_layout1.addWidget(self.sculptFoamy_button)
-        sculpt_layout1.setAlignment(QtCore.Qt.AlignTop)
-        sculpt_layout1.addWidget(self.sculptSpray_button)
-        sculpt_layout1.addWidget(self.sculptRepeat_button)
-        sculpt_layout1.addWidget(self.sculptImprint_button)
-
-        sculpt_layout2 = QtWidgets.QHBoxLayout()
-
-        #sculpt_layout2.addWidget(self.sculptFoamy_button)
-        #sculpt_layout2.addWidget(self.sculptSpray_button)
-        #sculpt_layout2.addWidget(self.sculptRepeat_button)
-        #sculpt_layout2.addWidget(self.sculptImprint_button)
-        sculpt_layout2.addWidget(self.sculptWax_button)
-        sculpt_layout2.addWidget(self.sculptScrape_button)
-        sculpt_layout2.addWidget(self.sculptFill_button)
-        
-        sculpt_layout2.setAlignment(QtCore.Qt.AlignTop)
-        
-        sculpt_layout3 = QtWidgets.QHBoxLayout()
-        sculpt_layout2.addWidget(self.sculptKnife_button)
-        sculpt_layout2.addWidget(self.sculptSmear_button)
-        sculpt_layout2.addWidget(self.sculptBulge_button)
-        sculpt_layout2.addWidget(self.sculptAmplify_button)
-        sculpt_layout2.addWidget(self.sculptFreeze_button)
-        sculpt_layout2.addWidget(self.sculptFreezeSelect_button)
-        sculpt_layout3.setAlignment(QtCore.Qt.AlignTop)
-        
-        boolean_layout1 = QtWidgets.QHBoxLayout()
-        boolean_layout1.addWidget(self.union_button)
-        boolean_layout1.addWidget(self.difference_button)
-        boolean_layout1.addWidget(self.intersection_button)
-        boolean_layout1.setAlignment(QtCore.Qt.AlignTop)
 
-        
-        mesh_layout2 = QtWidgets.QHBoxLayout()
-        mesh_layout2.addWidget(self.combine_button)
-        mesh_layout2.addWidget(self.separate_button)
-        mesh_layout2.setAlignment(QtCore.Qt.AlignTop)
-        
-        mesh_layout3 = QtWidgets.QHBoxLayout()
-        mesh_layout3.addWidget(self.reduce_button)
-        mesh_layout3.addWidget(self.remesh_button)
-        mesh_layout3.addWidget(self.retopo_button)
-        mesh_layout3.setAlignment(QtCore.Qt.AlignTop)
-        
-        mesh_layout4 = QtWidgets.QHBoxLayout()
-        mesh_layout4.setAlignment(QtCore.Qt.AlignTop)
-        
-        mesh_layout5 = QtWidgets.QHBoxLayout()
-        mesh_layout5.addWidget(self.averageVert_button)
-        mesh_layout5.addWidget(self.divide_button)
-        mesh_layout5.addWidget(self.smooth_button)
-        mesh_layout5.setAlignment(QtCore.Qt.AlignTop)
-        
-        mesh_layout6 = QtWidgets.QHBoxLayout()
-        mesh_layout6.addWidget(self.conform_button)
-        mesh_layout6.addWidget(self.triangulate_button)
-        mesh_layout6.addWidget(self.quadrangulate_button)
-        #mesh_layout6.addWidget(self.mirror_button)
+class PatternDuplicator(object):
+    """
+    Linear, radial, grid and along-curve arrays of one object.
 
-        
-        editMesh_layout1 = QtWidgets.QHBoxLayout()
-        #editMesh_layout1.addWidget(self.divide_button)
-        #editMesh_layout1.addWidget(self.bevel_button)
-        
-        editMesh_layout1.addWidget(self.connect_button)
-        editMesh_layout1.addWidget(self.bridge_button)
-        editMesh_layout1.setAlignment(QtCore.Qt.AlignTop)
-        
-        
-        editMesh_layout2 = QtWidgets.QHBoxLayout()
-        editMesh_layout2.addWidget(self.appendFacet_button)
-        editMesh_layout2.addWidget(self.transform_button)
-        editMesh_layout2.addWidget(self.circularize_button)
-        editMesh_layout2.addWidget(self.collapseEdge_button)
-        editMesh_layout2.setAlignment(QtCore.Qt.AlignTop)
-        
-        editMesh_layout3 = QtWidgets.QHBoxLayout()
-        #editMesh_layout3.addWidget(self.connect_button)
-        editMesh_layout3.addWidget(self.bevel_button)
-        editMesh_layout3.addWidget(self.extrude_button)
-        editMesh_layout3.setAlignment(QtCore.Qt.AlignTop)
-
-        editMesh_layout4 = QtWidgets.QHBoxLayout()
-        editMesh_layout4.addWidget(self.merge_button)
-        editMesh_layout4.addWidget(self.targetWeld_button)
-        editMesh_layout4.setAlignment(QtCore.Qt.AlignTop)
-        
-        editMesh_layout4b = QtWidgets.QHBoxLayout()
-        editMesh_layout4b.addWidget(self.ringAndSplit_button)
-        editMesh_layout4b.addWidget(self.ringAndDelete_button)
-        editMesh_layout4b.addWidget(self.loopAndDelete_button)
-        editMesh_layout4b.addWidget(self.loopAndDuplicate_button)
-        
-        editMesh_layout4b.setAlignment(QtCore.Qt.AlignTop)
-        
-    
-        editMesh_layout5 = QtWidgets.QHBoxLayout()
-        #editMesh_layout5.addWidget(self.flip_button)
-        editMesh_layout5.addWidget(self.symmetrize_button)
-        editMesh_layout5.addWidget(self.mirror_button)
-        editMesh_layout5.setAlignment(QtCore.Qt.AlignTop)
-        
-        editMesh_layout6 = QtWidgets.QHBoxLayout()
-        editMesh_layout6.addWidget(self.detach_button)
-        editMesh_layout6.addWidget(self.extract_button)
-        editMesh_layout6.addWidget(self.duplicateFacet_button)
-        #editMesh_layout6.addWidget(self.reorder_button)
-        editMesh_layout6.setAlignment(QtCore.Qt.AlignTop)
-        
-        editMesh_layout7 = QtWidgets.QHBoxLayout()
-        editMesh_layout7.addWidget(self.crease_button)
-        #editMesh_layout7.addWidget(self.delEdge_button)
-        editMesh_layout7.addWidget(self.edgeFlow_button)
-        editMesh_layout7.setAlignment(QtCore.Qt.AlignTop)
-        
-        editMesh_layout8 = QtWidgets.QHBoxLayout()
-        editMesh_layout8.addWidget(self.spinEdgeBackward_button)
-        editMesh_layout8.addWidget(self.spinEdgeForward_button)
-        editMesh_layout8.addWidget(self.invisibleFace_button)
-        editMesh_layout8.addWidget(self.createPoly_button)
-        editMesh_layout8.setAlignment(QtCore.Qt.AlignTop)
-        
-        editMesh_layout9 = QtWidgets.QHBoxLayout()
-        editMesh_layout9.addWidget(self.chamfer_button)
-        editMesh_layout9.addWidget(self.poke_button)
-        editMesh_layout9.addWidget(self.wedge_button)
-        editMesh_layout9.setAlignment(QtCore.Qt.AlignTop)
-        
-        editMesh_layout10 = QtWidgets.QHBoxLayout()
-        editMesh_layout10.addWidget(self.reorder_button)
-        editMesh_layout10.addWidget(self.flipEdge_button)
-        editMesh_layout10.addWidget(self.projectCurve_button)
-        editMesh_layout10.addWidget(self.curveSplit_button)
-        editMesh_layout10.setAlignment(QtCore.Qt.AlignTop)
-        
-        meshTools_layout1 = QtWidgets.QHBoxLayout()
-        #meshTools_layout1.addWidget(self.appendFacet_button)
-        
-        
-        meshTools_layout1.addWidget(self.slideEdge_button)
-        meshTools_layout1.addWidget(self.insertEdge_button)
-        #meshTools_layout1.addWidget(self.crease_button)
-        meshTools_layout1.setAlignment(QtCore.Qt.AlignTop)
-        
-        meshTools_layout2 = QtWidgets.QHBoxLayout()
-        #meshTools_layout2.addWidget(self.createPoly_button)
-        #meshTools_layout2.addWidget(self.insertEdge_button)
-        #meshTools_layout2.addWidget(self.insertEdge_button)
-        meshTools_layout2.addWidget(self.offsetEdge_button)
-        meshTools_layout2.addWidget(self.fillHole_button)
-        meshTools_layout2.addWidget(self.makeHole_button)
-        meshTools_layout2.setAlignment(QtCore.Qt.AlignTop)
-        
-        meshTools_layout3 = QtWidgets.QHBoxLayout()
-        #meshTools_layout3.addWidget(self.multiCut_button)
+    All copy matrices are computed at once with NumPy. The copies are then made as
+    instances or copies in one ApiEdit step through ReplaceEngine.create_duplicates.
+    The preview is a single templated mesh holding one bounding box per copy, so even
+    10k copies cost one MFnMesh.create.
 
-        meshTools_layout3.setAlignment(QtCore.Qt.AlignTop)
-        
-        meshTools_layout4 = QtWidgets.QHBoxLayout()
-        meshTools_layout4.addWidget(self.multiCut_button)
-        meshTools_layout4.addWidget(self.quadDraw_button)
-        meshTools_layout4.setAlignment(QtCore.Qt.AlignTop)
-        
-        meshTools_layout5 = QtWidgets.QHBoxLayout()
-        meshTools_layout5.addWidget(self.slideEdge_button)
-        #meshTools_layout5.addWidget(self.targetWeld_button)
-        meshTools_layout5.setAlignment(QtCore.Qt.AlignTop)
-        
-        #self.setCentralWidget(scrollable_widget)
-        main_layout = QtWidgets.QVBoxLayout(self)
-        main_layout.setSpacing(0)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        #main_layout.se
-        
-        display_layout1= QtWidgets.QHBoxLayout()
-        display_layout1.addWidget(self.average_button)
-        display_layout1.addWidget(self.reverse_button)
-        display_layout1.addWidget(self.setToFace_button)
-        
-        
-        display_layout2= QtWidgets.QHBoxLayout()
-        display_layout2.addWidget(self.conform_button)
-        display_layout2.addWidget(self.lockNormals_button)
-        display_layout2.addWidget(self.unlockNormals_button)
-        
-        axis_layout1= QtWidgets.QHBoxLayout()
-        axis_layout1.addWidget(self.axisObject_button)
-        axis_layout1.addWidget(self.axisWorld_button)
-        axis_layout1.addWidget(self.axisComponent_button)
-        axis_layout1.addWidget(self.axisParent_button)
-        
-        
-        line1 = QtWidgets.QFrame()
-        line1.setFrameShape(QtWidgets.QFrame.HLine)
-        line1.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line_layout1= QtWidgets.QHBoxLayout()
-        line_layout1.addWidget(line1)  
-        line2 = QtWidgets.QFrame()
-        line2.setFrameShape(QtWidgets.QFrame.HLine)
-        line2.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line_layout2 = QtWidgets.QHBoxLayout()
-        line_layout2.addWidget(line2)
-        line3 = QtWidgets.QFrame()
-        line3.setFrameShape(QtWidgets.QFrame.HLine)
-        line3.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line3_layout = QtWidgets.QHBoxLayout()
-        line3_layout.addWidget(line3)
-        line4 = QtWidgets.QFrame()
-        line4.setFrameShape(QtWidgets.QFrame.HLine)
-        line4.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line4_layout = QtWidgets.QHBoxLayout()
-        line4_layout.addWidget(line4)
-        line5 = QtWidgets.QFrame()
-        line5.setFrameShape(QtWidgets.QFrame.HLine)
-        line5.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line5_layout = QtWidgets.QHBoxLayout()
-        line5_layout.addWidget(line5)
-        line6 = QtWidgets.QFrame()
-        line6.setFrameShape(QtWidgets.QFrame.HLine)
-        line6.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line6_layout = QtWidgets.QHBoxLayout()
-        line6_layout.addWidget(line6)
-        line7 = QtWidgets.QFrame()
-        line7.setFrameShape(QtWidgets.QFrame.HLine)
-        line7.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line7_layout = QtWidgets.QHBoxLayout()
-        line7_layout.addWidget(line7)
-        line8 = QtWidgets.QFrame()
-        line8.setFrameShape(QtWidgets.QFrame.HLine)
-        line8.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line8_layout = QtWidgets.QHBoxLayout()
-        line8_layout.addWidget(line8)
-        line9 = QtWidgets.QFrame()
-        line9.setFrameShape(QtWidgets.QFrame.HLine)
-        line9.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line9_layout = QtWidgets.QHBoxLayout()
-        line9_layout.addWidget(line9)
-        line10 = QtWidgets.QFrame()
-        line10.setFrameShape(QtWidgets.QFrame.HLine)
-        line10.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line10_layout = QtWidgets.QHBoxLayout()
-        line10_layout.addWidget(line10)
-        line11 = QtWidgets.QFrame()
-        line11.setFrameShape(QtWidgets.QFrame.HLine)
-        line11.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line11_layout = QtWidgets.QHBoxLayout()
-        line11_layout.addWidget(line11)
-        line12 = QtWidgets.QFrame()
-        line12.setFrameShape(QtWidgets.QFrame.HLine)
-        line12.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line12_layout = QtWidgets.QHBoxLayout()
-        line12_layout.addWidget(line12)
-        line13 = QtWidgets.QFrame()
-        line13.setFrameShape(QtWidgets.QFrame.HLine)
-        line13.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line13_layout = QtWidgets.QHBoxLayout()
-        line13_layout.addWidget(line13)
-        line14 = QtWidgets.QFrame()
-        line14.setFrameShape(QtWidgets.QFrame.HLine)
-        line14.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line14_layout = QtWidgets.QHBoxLayout()
-        line14_layout.addWidget(line14)
-        line15 = QtWidgets.QFrame()
-        line15.setFrameShape(QtWidgets.QFrame.HLine)
-        line15.setFrameShadow(QtWidgets.QFrame.Sunken)
-        line15_layout = QtWidgets.QHBoxLayout()
-        line15_layout.addWidget(line15)
-
-
-
-        scrollable_widget = ScrollableWidget()
-        main_layout.addWidget(scrollable_widget)
-
-        scrollable_widget.add_layout(line_layout2 )  
-
-        #scrollable_widget.add_widget(self.history_tools)
-        #self.history_tools.add_layout(history_layout1)     
-        #scrollable_widget.add_widget(self.modify_tools)
-        #self.modify_tools.add_layout(modify_layout0)
-        #self.modify_tools.add_layout(modify_layout1)
-        #scrollable_widget.add_widget(self.duplicate_tools)
-        #scrollable_widget.add_layout(selection_layout2 )
-        scrollable_widget.add_layout(selection_layout1 )
-        scrollable_widget.add_layout(selection_layout3 )
-        scrollable_widget.add_layout(selection_layout4 )
-        scrollable_widget.add_layout(line14_layout )
-        scrollable_widget.add_layout(selection_layout1b )
-        scrollable_widget.add_layout(line13_layout )
-        scrollable_widget.add_layout(history_layout1) 
-        scrollable_widget.add_layout(line15_layout )
-        scrollable_widget.add_layout(axis_layout1)
-        scrollable_widget.add_layout(line12_layout )
-        scrollable_widget.add_layout(modify_layout0)
-        scrollable_widget.add_layout(modify_layout1)
-        scrollable_widget.add_layout(line_layout1 )
-        scrollable_widget.add_layout(duplicate_layout1)
-
-        scrollable_widget.add_layout(line3_layout )  
-        #scrollable_widget.add_widget(self.polygon_primatives)
-        scrollable_widget.add_layout(prim_layout1)
-        scrollable_widget.add_layout(prim_layout2)
-        #scrollable_widget.add_layout(prim_layout3)
-        scrollable_widget.add_layout(line4_layout )  
-    
-        
-        #scrollable_widget.add_widget(self.sculpting_menu)
-        scrollable_widget.add_layout(sculpt_layout1)
-        scrollable_widget.add_layout(sculpt_layout2)
-        scrollable_widget.add_layout(sculpt_layout3)
-        scrollable_widget.add_layout(line5_layout ) 
-        #self.sculpting_menu.add_widget(self.secSculpting_menu)
-        
-        #scrollable_widget.add_widget(self.remesh_menu)
-        scrollable_widget.add_layout(mesh_layout3)
-        scrollable_widget.add_layout(mesh_layout4)
-        scrollable_widget.add_layout(mesh_layout5)
-        scrollable_widget.add_layout(line6_layout ) 
-        #scrollable_widget.add_widget(self.combine_menu)
-        
-        scrollable_widget.add_layout(mesh_layout2)
-        scrollable_widget.add_layout(editMesh_layout6)
-        scrollable_widget.add_layout(line7_layout ) 
-        
+    :param settings: dict with mode (LINEAR, RADIAL, GRID or CURVE), count (new copies),
+        offset (x, y, z), grid (x, y, z counts, the original included), spacing (x, y, z), axis (0, 1 or 2),
+        angle (degrees) and align (bool)
+    """
 
-        #self.remesh_menu.add_layout(mesh_layout6)
-        #scrollable_widget.add_widget(self.editMesh_menu)
-        
-        scrollable_widget.add_layout(meshTools_layout4)
-        scrollable_widget.add_layout(editMesh_layout1)
-        scrollable_widget.add_layout(editMesh_layout4b)
-        scrollable_widget.add_layout(line8_layout ) 
-        scrollable_widget.add_layout(editMesh_layout3)
-        scrollable_widget.add_layout(editMesh_layout4)
-        scrollable_widget.add_layout(line9_layout ) 
-        scrollable_widget.add_layout(editMesh_layout5)
-        scrollable_widget.add_layout(editMesh_layout7)
-        #scrollable_widget.add_layout(meshTools_layout1) 
-        scrollable_widget.add_layout(line10_layout ) 
-        #self.editMesh_menu.add_widget(self.editMesh_menuSec)
-
-        #scrollable_widget.add_widget(self.meshTools_menu)
-  
-        #self.meshTools_menu.add_layout(meshTools_layout4)  
-        #self.meshTools_menu.add_layout(meshTools_layout5)  
-        #scrollable_widget.add_widget(self.edgeTools_menu)
-        #scrollable_widget.add_widget(self.symmetry_menu)
-        #scrollable_widget.add_widget(self.boolean_menu)
-        scrollable_widget.add_layout(boolean_layout1)
-        scrollable_widget.add_layout(line11_layout ) 
-        #scrollable_widget.add_widget(self.display_menu)
-        scrollable_widget.add_layout(display_layout1)
-        scrollable_widget.add_layout(display_layout2)
-        scroll_layout = QtWidgets.QVBoxLayout(self)
-        scrollable_widget.add_layout(scroll_layout)
-        scroll_layout.addStretch()
-        
-        #scrollable_widget.add_layout(empty_layout)
-        
-        #main_layout.add_layout(empty_layout )
-        main_layout.setAlignment(QtCore.Qt.AlignTop)
+    LINEAR = "Linear"
+    RADIAL = "Radial"
+    GRID = "Grid"
+    CURVE = "Curve"
+    MODES = (LINEAR, RADIAL, GRID, CURVE)
+    PREVIEW_NAME = "rbModelHelperPatternPreview"
+    BOX_FACES = ((0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3))
+
+    def __init__(self, source, helper, settings):
+        selection = om.MSelectionList()
+        selection.add(source)
+        if helper:
+            selection.add(helper)
+        self.source_path = selection.getDagPath(0)
+        self.helper_path = selection.getDagPath(1) if helper else None
+        self.settings = settings
+        self.world_matrices = self.get_world_matrices()
+
+    @staticmethod
+    def translations(offsets):
+        matrices = np.tile(np.identity(4), (len(offsets), 1, 1))
+        matrices[:, 3, :3] = offsets
+        return matrices
+
+    @staticmethod
+    def rotations(axes, angles):
+        """
+        :return: row-vector rotation matrices turning by angles (radians) around unit axes
+        """
+        count = len(angles)
+        axes = np.broadcast_to(axes, (count, 3))
+        skew = np.zeros((count, 3, 3))
+        skew[:, 0, 1] = -axes[:, 2]
+        skew[:, 0, 2] = axes[:, 1]
+        skew[:, 1, 0] = axes[:, 2]
+        skew[:, 1, 2] = -axes[:, 0]
+        skew[:, 2, 0] = -axes[:, 1]
+        skew[:, 2, 1] = axes[:, 0]
+        sin = np.sin(angles)[:, None, None]
+        cos = np.cos(angles)[:, None, None]
+        rotation = np.identity(3) + sin * skew + (1.0 - cos) * np.matmul(skew, skew)
+        matrices = np.tile(np.identity(4), (count, 1, 1))
+        matrices[:, :3, :3] = np.transpose(rotation, (0, 2, 1))
+        return matrices
+
+    def get_curve_path(self):
+        if self.helper_path is not None:
+            for shape_path in [self.helper_path] + TransformEngine.get_shape_paths(self.helper_path):
+                if shape_path.hasFn(om.MFn.kNurbsCurve):
+                    return shape_path
+        raise RuntimeError("select the object to array, then the curve to follow")
+
+    def get_pivot(self, dag_path):
+        return np.array(list(om.MFnTransform(dag_path).rotatePivot(om.MSpace.kWorld))[:3])
+
+    def get_pattern(self):
+        """
+        :return: (N, 4, 4) world space matrices applied after the source's world matrix
+        """
+        settings = self.settings
+        mode = settings["mode"]
+        count = max(1, settings["count"])
+        offset = np.array(settings["offset"], dtype=np.float64)
+
+        if mode == self.LINEAR:
+            return self.translations(np.arange(1, count + 1)[:, None] * offset)
+
+        if mode == self.GRID:
+            grid = [np.arange(max(1, axis_count)) for axis_count in settings["grid"]]
+            cells = np.stack(np.meshgrid(*grid, indexing="ij"), axis=-1).reshape(-1, 3)[1:]
+            return self.translations(cells * np.array(settings["spacing"], dtype=np.float64))
+
+        if mode == self.RADIAL:
+            center = self.get_pivot(self.helper_path) if self.helper_path else np.zeros(3)
+            # A full turn leaves room for the original, a partial one ends on the last copy.
+            full_turn = abs(settings["angle"]) >= 360.0
+            step = np.radians(settings["angle"]) / (count + 1 if full_turn else count)
+            rotation = self.rotations(np.identity(3)[settings["axis"]], np.arange(1, count + 1) * step)
+            return np.matmul(np.matmul(self.translations(-center[None]), rotation), self.translations(center[None]))
+
+        curve_fn = om.MFnNurbsCurve(self.get_curve_path())
+        length = curve_fn.length()
+        closed = curve_fn.form == om.MFnNurbsCurve.kPeriodic
+        fractions = np.arange(count) / float(count if closed else max(1, count - 1))
+        points = []
+        tangents = []
+        for fraction in fractions:
+            param = curve_fn.findParamFromLength(length * fraction)
+            points.append(list(curve_fn.getPointAtParam(param, om.MSpace.kWorld))[:3])
+            tangents.append(list(curve_fn.tangent(param, om.MSpace.kWorld))[:3])
+        points = np.array(points)
+        pivot = self.get_pivot(self.source_path)
+        if not settings["align"]:
+            return self.translations(points - pivot)
+
+        tangents = np.array(tangents)
+        tangents /= np.maximum(np.linalg.norm(tangents, axis=1), 1e-12)[:, None]
+        reference = np.array([1.0, 0.0, 0.0])
+        axes = np.cross(reference, tangents)
+        sines = np.linalg.norm(axes, axis=1)
+        # Tangents parallel to X turn around Y, which also covers the opposite direction.
+        axes = np.where(sines[:, None] > 1e-9, axes / np.maximum(sines, 1e-12)[:, None], np.array([0.0, 1.0, 0.0]))
+        angles = np.arctan2(sines, tangents.dot(reference))
+        return np.matmul(np.matmul(self.translations(-pivot[None]), self.rotations(axes, angles)), self.translations(points))
+
+    def get_world_matrices(self):
+        source_matrix = TransformEngine.matrix_to_array(self.source_path.inclusiveMatrix())
+        return np.matmul(source_matrix[None], self.get_pattern())
+
+    def get_bounding_box(self):
+        bounding_box = om.MBoundingBox()
+        for shape_path in TransformEngine.get_shape_paths(self.source_path):
+            bounding_box.expand(om.MFnDagNode(shape_path).boundingBox)
+        if bounding_box.width == 0.0 and bounding_box.height == 0.0 and bounding_box.depth == 0.0:
+            bounding_box = om.MBoundingBox(om.MPoint(-0.5, -0.5, -0.5), om.MPoint(0.5, 0.5, 0.5))
+        return bounding_box
+
+    def create_preview(self):
+        """
+        :return: the preview transform, one templated box mesh for all copies. It is not undoable.
+        """
+        bounding_box = self.get_bounding_box()
+        low = list(bounding_box.min)[:3]
+        high = list(bounding_box.max)[:3]
+        corners = np.array([[(low, high)[x][0], (low, high)[y][1], (low, high)[z][2], 1.0]
+                            for x in (0, 1) for y in (0, 1) for z in (0, 1)])
+
+        count = len(self.world_matrices)
+        points = np.matmul(corners[None], self.world_matrices).reshape(-1, 4)
+        connects = (np.array(self.BOX_FACES)[None] + 8 * np.arange(count)[:, None, None]).ravel()
+        preview = om.MFnMesh().create(om.MPointArray(points.tolist()), om.MIntArray([4] * (6 * count)),
+                                      om.MIntArray(connects.tolist()))
+        preview_fn = om.MFnDagNode(preview)
+        preview_fn.setName(self.PREVIEW_NAME)
+        preview_fn.findPlug("template", False).setBool(True)
+        return preview
+
+    def get_placements(self):
+        parent_path = om.MDagPath(self.source_path)
+        parent_path.pop()
+        parent = parent_path.node() if parent_path.length() else om.MObject.kNullObj
+        parent_inverse = TransformEngine.matrix_to_array(self.source_path.exclusiveMatrixInverse())
+
+        transformation = om.MFnTransform(self.source_path).transformation()
+        rotate_pivot = transformation.rotatePivot(om.MSpace.kTransform)
+        scale_pivot = transformation.scalePivot(om.MSpace.kTransform)
+
+        placements = []
+        for local_matrix in np.matmul(self.world_matrices, parent_inverse[None]):
+            copy_transformation = om.MTransformationMatrix(om.MMatrix(local_matrix.ravel().tolist()))
+            copy_transformation.setRotatePivot(rotate_pivot, om.MSpace.kTransform, True)
+            copy_transformation.setScalePivot(scale_pivot, om.MSpace.kTransform, True)
+            placements.append((parent, copy_transformation))
+        return placements
+
+    def apply(self, instance):
+        """
+        :return: the new transform names
+        """
+        start_time = perf_clock()
+        placements = self.get_placements()
+        shading_groups = ReplaceEngine.get_shading_groups(self.source_path)
+        created = []
+
+        def redo():
+            created[:] = ReplaceEngine.create_duplicates(self.source_path, instance, placements, shading_groups)
+
+        def undo():
+            ReplaceEngine.delete_nodes(created)
+
+        edit = ApiEdit("patternDuplicate")
+        edit.add(redo, undo)
+        edit.commit()
+
+        elapsed = perf_clock() - start_time
+        om.MGlobal.displayInfo("Model Helper pattern: {0} {1} in {2:.1f} ms ({3:.0f} objects/s)".format(
+            len(created), "instances" if instance else "copies", elapsed * 1000.0,
+            len(created) / elapsed if elapsed > 0.0 else 0.0))
+        return [om.MDagPath.getAPathTo(node).fullPathName() for node in created]
+
+
+class PatternDuplicatorDialog(QtWidgets.QDialog):
+    """
+    Settings for PatternDuplicator, with a live preview of the copies. Select the
+    object to array first, then the radial center or the curve to follow.
+    """
 
+    PREVIEW_DELAY_MS = 30
+
+    def __init__(self, parent=None):
+        super(PatternDuplicatorDialog, self).__init__(parent)
+        self.setWindowTitle("Pattern Duplicate")
+        self.preview = None
+
+        self.mode_combo = QtWidgets.QComboBox()
+        self.mode_combo.addItems(PatternDuplicator.MODES)
+        self.count_spin = self.create_spin_box(QtWidgets.QSpinBox, 1, 100000, 5)
+        self.offset_spins = [self.create_spin_box(QtWidgets.QDoubleSpinBox, -100000.0, 100000.0, value)
+                             for value in (2.0, 0.0, 0.0)]
+        self.grid_spins = [self.create_spin_box(QtWidgets.QSpinBox, 1, 1000, value) for value in (5, 1, 5)]
+        self.spacing_spins = [self.create_spin_box(QtWidgets.QDoubleSpinBox, -100000.0, 100000.0, 2.0) for axis in range(3)]
+        self.axis_combo = QtWidgets.QComboBox()
+        self.axis_combo.addItems(("X", "Y", "Z"))
+        self.axis_combo.setCurrentIndex(1)
+        self.angle_spin = self.create_spin_box(QtWidgets.QDoubleSpinBox, -3600.0, 3600.0, 360.0)
+        self.align_check = QtWidgets.QCheckBox("Align to Curve")
+        self.instance_check = QtWidgets.QCheckBox("Instances")
+        self.instance_check.setChecked(True)
+        self.preview_check = QtWidgets.QCheckBox("Preview")
+        self.preview_check.setChecked(True)
+
+        form_layout = QtWidgets.QFormLayout()
+        form_layout.addRow("Mode", self.mode_combo)
+        form_layout.addRow("Count", self.count_spin)
+        form_layout.addRow("Offset", self.create_row(self.offset_spins))
+        form_layout.addRow("Grid", self.create_row(self.grid_spins))
+        form_layout.addRow("Spacing", self.create_row(self.spacing_spins))
+        form_layout.addRow("Axis", self.axis_combo)
+        form_layout.addRow("Angle", self.angle_spin)
+        form_layout.addRow("", self.align_check)
+        form_layout.addRow("", self.create_row([self.instance_check, self.preview_check]))
+
+        apply_button = QtWidgets.QPushButton("Apply")
+        apply_button.clicked.connect(self.apply)
+        close_button = QtWidgets.QPushButton("Close")
+        close_button.clicked.connect(self.close)
 
-    def create_connections(self):
-        self.deleteHistory_button.clicked.connect(self.delete_history)
-        self.deleteNonDefHistory_button.clicked.connect(self.delete_nonDifHistory)
-        
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addLayout(form_layout)
+        main_layout.addLayout(self.create_row([apply_button, close_button]))
+
+        self.preview_timer = QtCore.QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(self.PREVIEW_DELAY_MS)
+        self.preview_timer.timeout.connect(self.update_preview)
+
+        self.mode_combo.currentIndexChanged.connect(self.update_mode)
+        self.axis_combo.currentIndexChanged.connect(self.schedule_preview)
+        self.align_check.toggled.connect(self.schedule_preview)
+        self.preview_check.toggled.connect(self.schedule_preview)
+        for spin_box in [self.count_spin, self.angle_spin] + self.offset_spins + self.grid_spins + self.spacing_spins:
+            spin_box.valueChanged.connect(self.schedule_preview)
+        self.update_mode()
+
+    def create_spin_box(self, spin_box_class, minimum, maximum, value):
+        spin_box = spin_box_class()
+        spin_box.setRange(minimum, maximum)
+        spin_box.setValue(value)
+        return spin_box
+
+    def create_row(self, widgets):
+        layout = QtWidgets.QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        for widget in widgets:
+            layout.addWidget(widget)
+        return layout
+
+    def update_mode(self, *args):
+        mode = self.mode_combo.currentText()
+        self.count_spin.setEnabled(mode != PatternDuplicator.GRID)
+        for spin_box in self.offset_spins:
+            spin_box.setEnabled(mode == PatternDuplicator.LINEAR)
+        for spin_box in self.grid_spins + self.spacing_spins:
+            spin_box.setEnabled(mode == PatternDuplicator.GRID)
+        self.axis_combo.setEnabled(mode == PatternDuplicator.RADIAL)
+        self.angle_spin.setEnabled(mode == PatternDuplicator.RADIAL)
+        self.align_check.setEnabled(mode == PatternDuplicator.CURVE)
+        self.schedule_preview()
+
+    def get_settings(self):
+        return {
+            "mode": self.mode_combo.currentText(),
+            "count": self.count_spin.value(),
+            "offset": [spin_box.value() for spin_box in self.offset_spins],
+            "grid": [spin_box.value() for spin_box in self.grid_spins],
+            "spacing": [spin_box.value() for spin_box in self.spacing_spins],
+            "axis": self.axis_combo.currentIndex(),
+            "angle": self.angle_spin.value(),
+            "align": self.align_check.isChecked(),
+        }
+
+    def create_duplicator(self):
+        """
+        :return: a PatternDuplicator for the current selection, or None
+        """
+        if np is None:
+            om.MGlobal.displayWarning("Model Helper pattern: NumPy is needed for pattern duplication.")
+            return None
+        selection = cmds.ls(selection=True, long=True, transforms=True)
+        if not selection:
+            return None
+        try:
+            return PatternDuplicator(selection[0], selection[1] if len(selection) > 1 else None, self.get_settings())
+        except RuntimeError as error:
+            om.MGlobal.displayWarning("Model Helper pattern: {0}".format(error))
+            return None
+
+    def schedule_preview(self, *args):
+        self.preview_timer.start()
+
+    def clear_preview(self):
+        if self.preview is not None:
+            ReplaceEngine.delete_nodes([self.preview])
+            self.preview = None
+
+    def update_preview(self):
+        self.clear_preview()
+        if not self.preview_check.isChecked() or not self.isVisible():
+            return
+        duplicator = self.create_duplicator()
+        if duplicator is not None and len(duplicator.world_matrices):
+            self.preview = duplicator.create_preview()
+
+    def apply(self, *args):
+        self.preview_timer.stop()
+        self.clear_preview()
+        duplicator = self.create_duplicator()
+        if duplicator is None:
+            om.MGlobal.displayWarning("Model Helper pattern: select the object to array.")
+            return
+        created = duplicator.apply(self.instance_check.isChecked())
+        if created:
+            cmds.select(created, replace=True)
 
-        
-        self.lift_button.clicked.connect(self.set_meshSculptTool)
-        self.sculptSmooth_button.clicked.connect(self.set_meshSmoothTool)
-        self.sculptRelax_button.clicked.connect(self.set_meshRelaxTool)
-        self.sculptGrab_button.clicked.connect(self.set_meshGrabTool)
-        self.sculptPinch_button.clicked.connect(self.set_meshPinchTool)
-        self.sculptFlatten_button.clicked.connect(self.set_meshFlattenTool)
-        self.sculptFoamy_button.clicked.connect(self.set_meshFoamyTool)
-        self.sculptSpray_button.clicked.connect(self.set_meshSprayTool)
-        self.sculptRepeat_button.clicked.connect(self.set_meshRepeatTool)
-        self.sculptImprint_button.clicked.connect(self.set_meshImprintTool)
-        self.sculptWax_button.clicked.connect(self.set_meshWaxTool)
-        self.sculptScrape_button.clicked.connect(self.set_meshScrapeTool)
-        self.sculptFill_button.clicked.connect(self.set_meshFillTool)
-        self.sculptKnife_button.clicked.connect(self.set_meshKnifeTool)
-        self.sculptSmear_button.clicked.connect(self.set_meshSmearTool)
-        self.sculptBulge_button.clicked.connect(self.set_meshBulgeTool)
-        self.sculptAmplify_button.clicked.connect(self.set_meshAmplifyTool)
-        self.sculptFreeze_button.clicked.connect(self.set_meshFreezeTool)
-        self.sculptFreezeSelect_button.clicked.connect(self.set_meshFrozenTool)
-        self.sculptObjects_button .clicked.connect(self.set_meshObjectTool)
-    
-   
-    def delete_history(self):    
+    def showEvent(self, e):
+        super(PatternDuplicatorDialog, self).showEvent(e)
+        self.schedule_preview()
 
-        cmds.delete(constructionHistory = True)    
-        
-    def delete_nonDifHistory(self):   
-        cmds.bakePartialHistory()
-        
-    def perform_booleanUnion(self):
-        cmds.PolygonBooleanUnion()
-        
-    def perform_booleanDifference(self):
-        cmds.PolygonBooleanDifference()
-        
-    def perform_booleanDifference(self):
-        cmds.PolygonBooleanDifference()
-        
-    def perform_booleanIntersection(self):
-        cmds.PolygonBooleanIntersection()
-        
-    def perform_combine(self):
-        cmds.polyUnite()
-        
-    def perform_separate(self):
-        cmds.polySeparate()
-        
+    def hideEvent(self, e):
+        self.preview_timer.stop()
+        self.clear_preview()
+        super(PatternDuplicatorDialog, self).hideEvent(e)
 
-        
-    def perform_fillHole(self):
-        cmds.polyCloseBorder()
-        
-    def perform_reduce(self):
-        cmds.polyReduce(ver=1,trm=0,shp=0, keepBorder=1, keepMapBorder=1,keepColorBorder=1,keepHardEdge=1, keepCreaseEdge=1, keepBorderWeight= 0.5,keepMapBorderWeight=0.5,keepColorBorderWeight=0.5,keepFaceGroupBorderWeight=0.5,keepHardEdgeWeight=0.5,keepCreaseEdgeWeight=0.5,useVirtualSymmetry=0,symmetryTolerance=0.01,sx=0,sy=1,sz=0,sw=0,preserveTopology=1,keepQuadsWeight=1,cachingReduce=1,ch=1,p=50,vct=0,tct=0,replaceOriginal=1)
- 
-    def perform_retopo(self):
-        cmds.polyRetopo(constructionHistory=1,replaceOriginal=1, preserveHardEdges=1, topologyRegularity=0.5, faceUniformity=0,anisotropy=1,targetFaceCount=1000,targetFaceCountTolerance=10)
-    
-    def perform_smooth(self):
-        cmds.polySmooth()
-        
-    def perform_triangulate(self):
-        cmds.polyTriangulate()
-        
-    def perform_quadrangulate(self):
-        cmds.polyQuad()
-        
 
-    def set_meshSculptTool(self):
-        cmds.SetMeshSculptTool()
-        
-    def set_meshSmoothTool(self):
-        cmds.SetMeshSmoothTool()
-        
-    def set_meshRelaxTool(self):
-        cmds.SetMeshRelaxTool()
-        
-    def set_meshGrabTool(self):
-        cmds.SetMeshGrabTool()
-        
-    def set_meshPinchTool(self):
-        cmds.SetMeshPinchTool()
-        
-    def set_meshFlattenTool(self):
-        cmds.SetMeshFlattenTool()
-        
-    def set_meshFoamyTool(self):
-        cmds.SetMeshFoamyTool()
-        
-    def set_meshSprayTool(self):
-        cmds.SetMeshSprayTool()
-        
-    def set_meshRepeatTool(self):
-        cmds.SetMeshRepeatTool()
-        
-    def set_meshImprintTool(self):
-        cmds.SetMeshImprintTool()
-        
-    def set_meshWaxTool(self):
-        cmds.SetMeshWaxTool()
-        
-    def set_meshScrapeTool(self):
-        cmds.SetMeshScrapeTool()
-        
-    def set_meshFillTool(self):
-        cmds.SetMeshFillTool()
-        
-    def set_meshKnifeTool(self):
-        cmds.SetMeshKnifeTool()
-        
-    def set_meshSmearTool(self):
-        cmds.SetMeshSmearTool()
-        
-    def set_meshBulgeTool(self):
-        cmds.SetMeshBulgeTool()
-        
-    def set_meshAmplifyTool(self):
-        cmds.SetMeshAmplifyTool()
-        
-    def set_meshFreezeTool(self):
-        cmds.SetMeshFreezeTool()
-        
-    def set_meshFrozenTool(self):
-        cmds.SetMeshFrozenTool()
-        
-    def set_meshObjectTool(self):
-        cmds.OpenContentBrowser()
-        
+class RelaxOptionsDialog(QtWidgets.QDialog):
+    """
+    Edits the RelaxEngine optionVars used by the Average button.
+    """
+
+    def __init__(self, parent=None):
+        super(RelaxOptionsDialog, self).__init__(parent)
+        self.setWindowTitle("Average Vertices Options")
+
+        self.method_combo = QtWidgets.QComboBox()
+        self.method_combo.addItems([method.capitalize() for method in RelaxEngine.METHODS])
+        self.iterations_spin = QtWidgets.QSpinBox()
+        self.iterations_spin.setRange(1, 1000)
+        self.strength_spin = QtWidgets.QDoubleSpinBox()
+        self.strength_spin.setRange(0.01, 1.0)
+        self.strength_spin.setSingleStep(0.05)
+        self.pin_borders_check = QtWidgets.QCheckBox("Pin Borders")
+
+        form_layout = QtWidgets.QFormLayout()
+        form_layout.addRow("Method", self.method_combo)
+        form_layout.addRow("Iterations", self.iterations_spin)
+        form_layout.addRow("Strength", self.strength_spin)
+        form_layout.addRow("", self.pin_borders_check)
+
+        apply_button = QtWidgets.QPushButton("Average")
+        apply_button.clicked.connect(self.apply)
+        save_button = QtWidgets.QPushButton("Save")
+        save_button.clicked.connect(self.save)
+        close_button = QtWidgets.QPushButton("Close")
+        close_button.clicked.connect(self.close)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        for button in (apply_button, save_button, close_button):
+            button_layout.addWidget(button)
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addLayout(form_layout)
+        main_layout.addLayout(button_layout)
+
+    def load(self):
+        options = RelaxEngine.get_options()
+        if options["method"] in RelaxEngine.METHODS:
+            self.method_combo.setCurrentIndex(RelaxEngine.METHODS.index(options["method"]))
+        self.iterations_spin.setValue(options["iterations"])
+        self.strength_spin.setValue(options["strength"])
+        self.pin_borders_check.setChecked(bool(options["pin_borders"]))
+
+    def save(self, *args):
+        RelaxEngine.set_options(
+            method=RelaxEngine.METHODS[self.method_combo.currentIndex()],
+            iterations=self.iterations_spin.value(),
+            strength=self.strength_spin.value(),
+            pin_borders=self.pin_borders_check.isChecked())
+
+    def apply(self, *args):
+        self.save()
+        self.parent().run_tool("averageVert")
 
-        
     def showEvent(self, e):
-        if self.workspace_control_instance.is_floating():
-            self.workspace_control_instance.set_label("Floating Window")
-        else:
-            self.workspace_control_instance.set_label("Modeling Helper")
-            
-class UIEventFilter(QtCore.QObject):
-    
+        self.load()
+        super(RelaxOptionsDialog, self).showEvent(e)
 
 
-    def eventFilter(self, watched, event):
-        
-        preserveUvSetting = cmds.optionVar(q="trsManipsPreserveUvs")
-        if preserveUvSetting==0:
-            try:
-                modelUI.preserveUVsOff_button.setHidden(False)
-            except:
-                pass
-            try:
-                modelUI.preserveUVsOn_button.setHidden(True)
-            except:
-                pass
-        else:
-            try:
-                modelUI.preserveUVsOff_button.setHidden(True)
-            except:
-                pass
-            try:
-                modelUI.preserveUVsOn_button.setHidden(False)
-            except:
-                pass
-            
-        preserveChildSetting = cmds.optionVar(q="trsManipsPreserveChildPosition")
-        if preserveChildSetting==0:
+class CircularizeOptionsDialog(QtWidgets.QDialog):
+    """
+    Edits the CircularizeEngine optionVars used by the Circularize button.
+    """
 
-            modelUI.preserveChildrenOff_button.setHidden(False)
-            modelUI.preserveChildrenOn_button.setHidden(True)
-        else:
-            modelUI.preserveChildrenOff_button.setHidden(True)
-            modelUI.preserveChildrenOn_button.setHidden(False)
+    def __init__(self, parent=None):
+        super(CircularizeOptionsDialog, self).__init__(parent)
+        self.setWindowTitle("Circularize Options")
+
+        self.radius_spin = QtWidgets.QDoubleSpinBox()
+        self.radius_spin.setRange(0.0, 100000.0)
+        self.radius_spin.setDecimals(3)
+        self.radius_spin.setSpecialValueText("Fitted")
+        self.twist_spin = QtWidgets.QDoubleSpinBox()
+        self.twist_spin.setRange(-360.0, 360.0)
+
+        form_layout = QtWidgets.QFormLayout()
+        form_layout.addRow("Radius", self.radius_spin)
+        form_layout.addRow("Twist", self.twist_spin)
+
+        apply_button = QtWidgets.QPushButton("Circularize")
+        apply_button.clicked.connect(self.apply)
+        save_button = QtWidgets.QPushButton("Save")
+        save_button.clicked.connect(self.save)
+        close_button = QtWidgets.QPushButton("Close")
+        close_button.clicked.connect(self.close)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        for button in (apply_button, save_button, close_button):
+            button_layout.addWidget(button)
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addLayout(form_layout)
+        main_layout.addLayout(button_layout)
 
-        tranfromConstraintSetting = cmds.optionVar(q="trsManipsXformConstraint")
-        if tranfromConstraintSetting=="edge":
+    def load(self):
+        options = CircularizeEngine.get_options()
+        self.radius_spin.setValue(options["radius"])
+        self.twist_spin.setValue(options["twist"])
 
-            modelUI.edgeConstraintOff_button.setHidden(True)
-            sample_ui.edgeConstraintOn_button.setHidden(False)
-        else:
-            modelUI.edgeConstraintOff_button.setHidden(False)
-            modelUI.edgeConstraintOn_button.setHidden(True)    
-        if tranfromConstraintSetting=="surface":
+    def save(self, *args):
+        CircularizeEngine.set_options(radius=self.radius_spin.value(), twist=self.twist_spin.value())
 
-            modelUI.surfaceConstraintOff_button.setHidden(True)
-            modelUI.surfaceConstraintOn_button.setHidden(False)
-        else:
-            modelUI.surfaceConstraintOff_button.setHidden(False)
-            modelUI.surfaceConstraintOn_button.setHidden(True)          
-            
+    def apply(self, *args):
+        self.save()
+        self.parent().run_tool("circularize")
 
-        camBasedSetting= cmds.selectPref(q=True, useDepth=True)
-        if camBasedSetting==True:
+    def showEvent(self, e):
+        self.load()
+        super(CircularizeOptionsDialog, self).showEvent(e)
 
-            modelUI.toggleCamBasedSelOff_button.setHidden(True)
-            modelUI.toggleCamBasedSelOn_button.setHidden(False)
-        else:
-            modelUI.toggleCamBasedSelOff_button.setHidden(False)
-            modelUI.toggleCamBasedSelOn_button.setHidden(True)
-            
-        symSetting= cmds.symmetricModelling(query=True,symmetry=False)
-        
-        if symSetting==0:
 
-            modelUI.toggleReflectionSetModeOff_button.setHidden(False)
-            modelUI.toggleReflectionSetModeOn_button.setHidden(True)
-        else:
-            modelUI.toggleReflectionSetModeOff_button.setHidden(True)
-            modelUI.toggleReflectionSetModeOn_button.setHidden(False)
-            
+startup_profiler.record("import", _import_start, perf_clock())
 
 #thething= modelHelperCallback()
 #thething.set_camBasedSel()
@@ -3267,6 +4853,4 @@ if __name__ == "__main__":
 
  
     sample_ui = SampleUI()
-    filter2 = UIEventFilter()
-    win.installEventFilter(filter2)
 '''
\ No newline at end of file
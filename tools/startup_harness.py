@@ -0,0 +1,251 @@
+"""
+Runs the Model Helper plugin startup against stub maya/PySide2/shiboken2 modules
+and reports the phase timings collected by StartupProfiler.
+
+Qt and Maya calls are no-ops here, so the numbers measure the Python side of
+startup (module import, registry and section building, bookkeeping). That is
+enough to catch regressions on a machine without Maya.
+
+    python tools/startup_harness.py --repeat 10
+    python tools/startup_harness.py --save-baseline baseline.json
+    python tools/startup_harness.py --baseline baseline.json --tolerance 20
+    python tools/startup_harness.py --load-mode idle
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import types
+
+PLUGIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plugins", "model_helper.py")
+
+STUB_MODULES = (
+    "maya",
+    "maya.cmds",
+    "maya.mel",
+    "maya.OpenMayaUI",
+    "maya.api",
+    "maya.api.OpenMaya",
+    "maya.api.OpenMayaUI",
+    "PySide2",
+    "PySide2.QtCore",
+    "PySide2.QtGui",
+    "PySide2.QtWidgets",
+    "shiboken2",
+)
+
+
+class StubMeta(type):
+
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Stub()
+
+
+class Stub(StubMeta("StubBase", (object,), {})):
+    """
+    Stands in for any Maya or Qt object: every attribute, call, index or number
+    conversion succeeds, it is falsy and it can be subclassed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Stub()
+
+    def __call__(self, *args, **kwargs):
+        return Stub()
+
+    def __getitem__(self, key):
+        return Stub()
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+    def __int__(self):
+        return 0
+
+    __long__ = __int__
+
+    def __float__(self):
+        return 0.0
+
+    def __index__(self):
+        return 0
+
+    def _number(self, *args):
+        return 0
+
+    __add__ = __radd__ = __sub__ = __rsub__ = _number
+    __mul__ = __rmul__ = __truediv__ = __rtruediv__ = __floordiv__ = __rfloordiv__ = _number
+    __div__ = __rdiv__ = _number
+
+    def __or__(self, other):
+        return self
+
+    __ror__ = __and__ = __rand__ = __or__
+
+
+class QtStub(Stub):
+    """
+    Base for stub Qt classes. Unlike return values, widget instances are truthy.
+    """
+
+    def __bool__(self):
+        return True
+
+    __nonzero__ = __bool__
+
+
+class StubModule(types.ModuleType):
+    """
+    Maya modules hand out callables returning falsy stubs, Qt modules hand out classes.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if self.__name__.startswith("maya"):
+            stub = Stub()
+        else:
+            stub = StubMeta(name, (QtStub,), {})
+        setattr(self, name, stub)
+        return stub
+
+
+class MGlobal(object):
+    messages = []
+
+    @classmethod
+    def displayInfo(cls, message):
+        cls.messages.append(message)
+
+    @classmethod
+    def displayWarning(cls, message):
+        cls.messages.append("Warning: " + message)
+
+    @classmethod
+    def displayError(cls, message):
+        cls.messages.append("Error: " + message)
+
+
+def install_stubs():
+    for name in STUB_MODULES:
+        module = StubModule(name)
+        sys.modules[name] = module
+        if "." in name:
+            parent_name, child_name = name.rsplit(".", 1)
+            setattr(sys.modules[parent_name], child_name, module)
+    sys.modules["maya.api.OpenMaya"].MGlobal = MGlobal
+
+
+def run_startup(run_index, report_path):
+    os.environ["RB_MODEL_HELPER_PROFILE"] = report_path
+    MGlobal.messages = []
+
+    spec = importlib.util.spec_from_file_location("rb_model_helper_harness_{0}".format(run_index), PLUGIN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    module.initializePlugin(Stub())
+
+    with open(report_path) as report_file:
+        return json.load(report_file)
+
+
+def merge_runs(reports):
+    """
+    :return: the fastest time seen for each phase path over all runs
+    """
+    merged = {}
+    order = []
+    for report in reports:
+        for phase in report["phases"]:
+            path = phase["path"]
+            if path not in merged:
+                merged[path] = dict(phase)
+                order.append(path)
+            else:
+                merged[path]["ms"] = min(merged[path]["ms"], phase["ms"])
+
+    phases = [merged[path] for path in order]
+    return {
+        "runs": len(reports),
+        "total_ms": min(report["total_ms"] for report in reports),
+        "phases": phases,
+    }
+
+
+def print_report(report, baseline=None):
+    baseline_phases = {}
+    if baseline:
+        baseline_phases = dict((phase["path"], phase["ms"]) for phase in baseline["phases"])
+
+    for phase in report["phases"]:
+        line = "{0:<60} {1:9.3f} ms".format("  " * phase["depth"] + phase["name"], phase["ms"])
+        if phase["path"] in baseline_phases:
+            line += "  ({0:+.3f} ms)".format(phase["ms"] - baseline_phases[phase["path"]])
+        print(line)
+
+    line = "{0:<60} {1:9.3f} ms".format("total", report["total_ms"])
+    if baseline:
+        line += "  ({0:+.3f} ms)".format(report["total_ms"] - baseline["total_ms"])
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="startup runs, the fastest time per phase is kept")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=25.0,
+                        help="allowed total slowdown against the baseline, in percent")
+    parser.add_argument("--save-baseline", help="write the merged report to this path")
+    parser.add_argument("--load-mode", choices=("eager", "onDemand", "idle"), default="eager",
+                        help="plugin load mode, see get_load_mode in the plugin")
+    args = parser.parse_args(argv)
+
+    os.environ["RB_MODEL_HELPER_LOAD_MODE"] = args.load_mode
+
+    install_stubs()
+
+    report_dir = tempfile.mkdtemp(prefix="rb_model_helper_")
+    reports = []
+    for run_index in range(max(1, args.repeat)):
+        reports.append(run_startup(run_index, os.path.join(report_dir, "startup_{0}.json".format(run_index))))
+    report = merge_runs(reports)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    print_report(report, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+
+    if baseline:
+        limit = baseline["total_ms"] * (1.0 + args.tolerance / 100.0)
+        if report["total_ms"] > limit:
+            print("Startup regression: {0:.3f} ms > {1:.3f} ms".format(report["total_ms"], limit))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())